@@ -64,7 +64,7 @@ def _mode4(cfg: dict) -> None:
     write_json(radar_dir / "universe.json", {"entities": universe})
 
     items_path = pull_radar_feeds(cfg, radar_dir)
-    ranked = rank_radar(items_path)
+    ranked = rank_radar(items_path, cfg)
 
     date_tag = datetime.now().strftime("%Y%m%d")
     ranking_path = radar_dir / f"top_radar_{date_tag}.json"
@@ -12,6 +12,7 @@ from modules.briefing.helpers import briefing_text, latest, read_jsonl, signal_t
 from modules.briefing.regime import compute_market_regime
 from modules.briefing.volume_lights import compute_volume_lights_for_holdings, load_volume_baseline
 from modules.common.config import load_config
+from modules.common.latest_quotes import load_marketdata_view, lookup_latest
 from modules.common.utils import now_iso_tz, read_json, write_json
 
 def _briefing_cfg(cfg: dict) -> dict:
@@ -26,15 +27,16 @@ def _briefing_cfg(cfg: dict) -> dict:
     }
 
 def _latest_quotes(root: Path) -> dict:
-    path = latest(root / "data" / "marketdata", "quotes_*.jsonl")
-    quotes: dict[str, dict] = {}
-    if not path:
-        return quotes
-    for row in read_jsonl(path):
-        isin = str(row.get("isin") or "")
-        if not isin or row.get("status") != "ok":
-            continue
-        quotes[isin] = row
+    return load_marketdata_view(root / "data" / "marketdata")
+
+
+def _quotes_by_isin(view: dict, positions: list[dict]) -> dict:
+    quotes = {}
+    for pos in positions:
+        isin = str(pos.get("isin") or "")
+        row = lookup_latest(view, isin)
+        if row is not None:
+            quotes[isin] = row
     return quotes
 
 def load_portfolio_snapshot(cfg: dict) -> dict:
@@ -51,7 +53,7 @@ def load_portfolio_snapshot(cfg: dict) -> dict:
     for pos in data.get("positions", []):
         isin = pos.get("isin")
         avg_price = to_float(pos.get("avg_price") or pos.get("price_eur"))
-        row = quote_by_isin.get(str(isin))
+        row = lookup_latest(quote_by_isin, isin)
         last_price = to_float((row or {}).get("close")) or to_float(pos.get("last_price") or pos.get("price_eur"))
         pnl_pct = to_float(pos.get("pnl_pct"))
         if pnl_pct is None and avg_price and last_price and avg_price != 0:
@@ -212,7 +214,7 @@ def run() -> None:
     prev_file = find_previous_briefing(root / "data" / "briefings", mcfg["delta_lookback_days"])
     briefing["delta"] = compute_delta(load_previous_briefing(prev_file), briefing)
 
-    quotes = _latest_quotes(root)
+    quotes = _quotes_by_isin(_latest_quotes(root), briefing.get("positions", []))
     baseline = load_volume_baseline(root / "data" / "marketdata" / "volume_baseline.json")
     lights = compute_volume_lights_for_holdings(briefing.get("positions", []), quotes, baseline, mcfg["volume_lights"])
     briefing["volume_lights"] = {"holdings": lights}
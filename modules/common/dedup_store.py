@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from modules.common.utils import ensure_dir, read_json
+
+DEFAULT_RETENTION_DAYS = 30
+# Compact once the journal carries more dead lines (expired or repeated) than live keys, but not for tiny files.
+COMPACT_MIN_DEAD = 256
+
+
+class DedupStore:
+    """Seen-keys store with a retention window, kept as an append-only JSONL journal.
+
+    Each line is `{"k": key, "t": epoch_seconds}` of the first insertion. Loading reads only the journal,
+    which compaction keeps to roughly the keys of the window, so cost no longer grows with all-time history.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        legacy_path: str | Path | None = None,
+        now: float | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.retention_sec = max(int(retention_days), 1) * 86400
+        self.now = float(now if now is not None else time.time())
+        self._seen: dict[str, int] = {}
+        self._pending: list[tuple[str, int]] = []
+        self._dead = 0
+        self._migrate = False
+        self._load()
+
+    def _load(self) -> None:
+        cutoff = self.now - self.retention_sec
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        row = json.loads(line)
+                        key, ts = str(row["k"]), int(row["t"])
+                    except (ValueError, KeyError, TypeError):
+                        self._dead += 1
+                        continue
+                    if ts < cutoff or key in self._seen:
+                        self._dead += 1
+                        continue
+                    self._seen[key] = ts
+        if self.legacy_path and self.legacy_path.exists():
+            # The old unbounded set has no timestamps; its keys start their window now.
+            try:
+                keys = read_json(self.legacy_path)
+            except Exception:
+                keys = []
+            for key in keys if isinstance(keys, list) else []:
+                self.add(str(key))
+            self._migrate = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, key: str) -> bool:
+        """Record `key`; returns False when it was already seen inside the window."""
+        if key in self._seen:
+            return False
+        stamp = int(self.now)
+        self._seen[key] = stamp
+        self._pending.append((key, stamp))
+        return True
+
+    def flush(self) -> None:
+        ensure_dir(self.path.parent)
+        if self._migrate or self._dead >= max(COMPACT_MIN_DEAD, len(self._seen)):
+            self.compact()
+            return
+        if self._pending:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps({"k": key, "t": ts}, separators=(",", ":")) + "\n" for key, ts in self._pending)
+        self._pending = []
+
+    def compact(self) -> None:
+        """Rewrite the journal with live keys only and retire the legacy set file."""
+        ensure_dir(self.path.parent)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.writelines(json.dumps({"k": key, "t": ts}, separators=(",", ":")) + "\n" for key, ts in self._seen.items())
+        tmp.replace(self.path)
+        self._pending = []
+        self._dead = 0
+        if self._migrate and self.legacy_path and self.legacy_path.exists():
+            self.legacy_path.unlink()
+        self._migrate = False
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Callable
+
+CLUSTER_FIELDS = ("sector", "theme")
+CONCENTRATION_HIGH_PCT = 40.0
+CONCENTRATION_MEDIUM_PCT = 25.0
+
+
+def concentration_risk(cluster_weight: float) -> str:
+    if cluster_weight >= CONCENTRATION_HIGH_PCT:
+        return "high"
+    if cluster_weight >= CONCENTRATION_MEDIUM_PCT:
+        return "medium"
+    return "low"
+
+
+def _market_value(row: dict) -> float:
+    return float(row.get("market_value_eur", 0) or 0)
+
+
+def build_holdings_index(holdings: list[dict], exposure: Callable[[dict], float] | None = None) -> dict:
+    """Index holdings once per run: lookup by ISIN/symbol, cluster weight totals and exposure sums."""
+    exposure_fn = exposure or _market_value
+    by_key: dict[str, dict] = {}
+    cluster_weights: dict[str, dict[str, float]] = {field: {} for field in CLUSTER_FIELDS}
+    total_weight = 0.0
+    total_exposure = 0.0
+    for row in holdings or []:
+        for key in (str(row.get("isin") or ""), str(row.get("symbol") or "")):
+            if key:
+                by_key.setdefault(key, row)
+        weight = float(row.get("weight_pct", 0) or 0)
+        total_weight += weight
+        total_exposure += exposure_fn(row)
+        for field in CLUSTER_FIELDS:
+            value = row.get(field)
+            if value:
+                cluster_weights[field][value] = cluster_weights[field].get(value, 0.0) + weight
+    return {
+        "rows": list(holdings or []),
+        "by_key": by_key,
+        "cluster_weights": cluster_weights,
+        "cluster_risk": {
+            field: {value: concentration_risk(weight) for value, weight in values.items()}
+            for field, values in cluster_weights.items()
+        },
+        "count": len(holdings or []),
+        "total_weight_pct": total_weight,
+        "total_exposure_eur": total_exposure,
+    }
+
+
+def find_holding(index: dict, identifier: object) -> dict | None:
+    key = str(identifier or "")
+    return index["by_key"].get(key) if key else None
+
+
+def cluster_weight(index: dict, field: str, value: object) -> float:
+    if not value:
+        return 0.0
+    return float(index["cluster_weights"].get(field, {}).get(value, 0.0))
+
+
+def weights_desc(index: dict) -> list[dict]:
+    return sorted(index["rows"], key=lambda row: float(row.get("weight_pct") or 0), reverse=True)
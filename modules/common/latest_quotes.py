@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from modules.common.utils import ensure_dir, read_json
+
+VIEW_NAME = "latest_quotes.json"
+MARKETDATA_PATTERN = "quotes_*.jsonl"
+V2_PATTERN = "candidates_*.json"
+DAY_RE = re.compile(r"(\d{8})")
+
+
+def view_path(source_dir: str | Path) -> Path:
+    return Path(source_dir) / VIEW_NAME
+
+
+def _key(value: object) -> str:
+    return str(value or "").strip().upper()
+
+
+def _empty_view(source_file: str | None = None) -> dict:
+    return {"source_file": source_file, "updated_at": None, "updated_ts": 0.0, "symbols": {}, "isins": {}}
+
+
+def _newest(source_dir: Path, pattern: str) -> Path | None:
+    files = sorted(source_dir.glob(pattern))
+    return files[-1] if files else None
+
+
+def _atomic_write_json(path: Path, payload: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def _read_view(source_dir: Path) -> dict:
+    path = view_path(source_dir)
+    if not path.exists():
+        return _empty_view()
+    try:
+        payload = read_json(path)
+    except Exception:
+        return _empty_view()
+    if not isinstance(payload, dict):
+        return _empty_view()
+    view = _empty_view(payload.get("source_file"))
+    view["updated_at"] = payload.get("updated_at")
+    view["updated_ts"] = float(payload.get("updated_ts", 0) or 0)
+    view["symbols"] = payload.get("symbols") if isinstance(payload.get("symbols"), dict) else {}
+    view["isins"] = payload.get("isins") if isinstance(payload.get("isins"), dict) else {}
+    return view
+
+
+def _apply(view: dict, rows: list[dict]) -> None:
+    for row in rows:
+        symbol = _key(row.get("symbol"))
+        isin = _key(row.get("isin"))
+        key = symbol or isin
+        if not key:
+            continue
+        view["symbols"][key] = row
+        if isin:
+            view["isins"][isin] = key
+
+
+def _marketdata_rows(rows: list[dict]) -> list[dict]:
+    return [row for row in rows if isinstance(row, dict) and row.get("status") == "ok"]
+
+
+def _v2_rows(candidates: list[dict]) -> list[dict]:
+    out: list[dict] = []
+    for row in candidates:
+        if not isinstance(row, dict):
+            continue
+        quote = row.get("quote") if isinstance(row.get("quote"), dict) else {}
+        if quote.get("price") in (None, "") and quote.get("last_price") in (None, ""):
+            continue
+        out.append(
+            {
+                "symbol": row.get("symbol"),
+                "isin": row.get("isin"),
+                "name": row.get("name"),
+                "currency": row.get("currency"),
+                "timestamp": row.get("timestamp"),
+                "quote": quote,
+            }
+        )
+    return out
+
+
+def _read_marketdata_file(path: Path) -> list[dict]:
+    rows: list[dict] = []
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return _marketdata_rows(rows)
+
+
+def _read_v2_file(path: Path) -> list[dict]:
+    payload = read_json(path)
+    rows = payload.get("candidates", []) if isinstance(payload, dict) else payload
+    return _v2_rows(rows if isinstance(rows, list) else [])
+
+
+def _file_day(name: str | None) -> str | None:
+    match = DAY_RE.search(str(name or ""))
+    return match.group(1) if match else None
+
+
+def update_latest_view(source_dir: str | Path, rows: list[dict], source_file: str | Path) -> dict:
+    """Fold freshly written rows into the view that sits next to their source file.
+
+    The view covers one day, like the newest file it replaces: a source file from a new day starts it empty,
+    so symbols missing from today's quotes do not keep answering with older prices.
+    """
+    directory = Path(source_dir)
+    name = Path(source_file).name
+    view = _read_view(directory)
+    if _file_day(view.get("source_file")) != _file_day(name):
+        view = _empty_view()
+    view["source_file"] = name
+    view["updated_at"] = datetime.now().isoformat()
+    view["updated_ts"] = time.time()
+    _apply(view, rows)
+    _atomic_write_json(view_path(directory), view)
+    return view
+
+
+def _load_view(source_dir: str | Path, pattern: str, reader: Callable[[Path], list[dict]]) -> dict:
+    directory = Path(source_dir)
+    view = _read_view(directory)
+    newest = _newest(directory, pattern)
+    if newest is None or view.get("source_file") == newest.name or newest.stat().st_mtime <= view["updated_ts"]:
+        return view
+    # The newest file was written without updating the view (older writer or lost race): rebuild once.
+    try:
+        rows = reader(newest)
+    except Exception:
+        return view
+    rebuilt = _empty_view(newest.name)
+    rebuilt["updated_at"] = datetime.now().isoformat()
+    rebuilt["updated_ts"] = time.time()
+    _apply(rebuilt, rows)
+    _atomic_write_json(view_path(directory), rebuilt)
+    return rebuilt
+
+
+def update_marketdata_view(quotes_dir: str | Path, rows: list[dict], quotes_path: str | Path) -> dict:
+    return update_latest_view(quotes_dir, _marketdata_rows(rows), quotes_path)
+
+
+def update_v2_view(v2_dir: str | Path, candidates: list[dict], candidates_path: str | Path) -> dict:
+    return update_latest_view(v2_dir, _v2_rows(candidates), candidates_path)
+
+
+def load_marketdata_view(quotes_dir: str | Path) -> dict:
+    return _load_view(quotes_dir, MARKETDATA_PATTERN, _read_marketdata_file)
+
+
+def load_v2_view(v2_dir: str | Path) -> dict:
+    return _load_view(v2_dir, V2_PATTERN, _read_v2_file)
+
+
+def lookup_latest(view: dict, key: object) -> dict | None:
+    needle = _key(key)
+    if not needle:
+        return None
+    symbols = view.get("symbols", {})
+    row = symbols.get(needle)
+    if row is None:
+        row = symbols.get(view.get("isins", {}).get(needle, ""))
+    return row if isinstance(row, dict) else None
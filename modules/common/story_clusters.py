@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+from modules.common.utils import ensure_dir, read_json
+
+NUM_PERM = 96
+BANDS = 32
+# 32 bands of 3 rows: pairs at Jaccard 0.5 become candidates ~99% of the time, unrelated headlines (~0.1) ~3%.
+ROWS = NUM_PERM // BANDS
+SHINGLE_CHARS = 5
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_WINDOW_HOURS = 48
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are persisted and must stay comparable across runs and processes.
+_rng = random.Random(20240601)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^0-9a-zäöüß]+", " ", str(text or "").lower()).strip()
+
+
+def shingles(text: str) -> set[int]:
+    norm = _normalize(text)
+    if not norm:
+        return set()
+    grams = {norm[idx : idx + SHINGLE_CHARS] for idx in range(max(len(norm) - SHINGLE_CHARS + 1, 1))}
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big") for gram in grams}
+
+
+def minhash(text: str) -> list[int] | None:
+    values = shingles(text)
+    if not values:
+        return None
+    return [min((a * value + b) % _PRIME for value in values) for a, b in _PERMS]
+
+
+def similarity(left: list[int], right: list[int]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+def _band_keys(signature: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+    return [(band, tuple(signature[band * ROWS : (band + 1) * ROWS])) for band in range(BANDS)]
+
+
+class StoryClusters:
+    """Incremental near-duplicate clustering of headlines via MinHash signatures and LSH banding.
+
+    A cluster is keyed by the ID of its first (canonical) item and counts members and sources; clusters
+    not seen for `window_hours` are dropped, so the persisted file stays bounded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        threshold: float = DEFAULT_THRESHOLD,
+        window_hours: int = DEFAULT_WINDOW_HOURS,
+        now: float | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.threshold = float(threshold)
+        self.now = float(now if now is not None else time.time())
+        self.clusters: dict[str, dict] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+        cutoff = self.now - max(int(window_hours), 1) * 3600
+        if self.path.exists():
+            try:
+                payload = read_json(self.path)
+            except Exception:
+                payload = {}
+            for cluster_id, cluster in (payload.get("clusters") or {}).items() if isinstance(payload, dict) else []:
+                if float(cluster.get("last_seen", 0) or 0) >= cutoff and len(cluster.get("signature") or []) == NUM_PERM:
+                    self._index(cluster_id, cluster)
+
+    def _index(self, cluster_id: str, cluster: dict) -> None:
+        self.clusters[cluster_id] = cluster
+        for key in _band_keys(cluster["signature"]):
+            self._buckets.setdefault(key, []).append(cluster_id)
+
+    def assign(self, item_id: str, text: str, source: str = "") -> dict:
+        """Attach an item to the most similar cluster among its LSH candidates, or open a new one."""
+        signature = minhash(text)
+        if signature is None:
+            return {"cluster_id": item_id, "canonical": True, "size": 1}
+        candidates = {cluster_id for key in _band_keys(signature) for cluster_id in self._buckets.get(key, [])}
+        best, best_score = None, self.threshold
+        for cluster_id in candidates:
+            score = similarity(signature, self.clusters[cluster_id]["signature"])
+            if score >= best_score:
+                best, best_score = cluster_id, score
+        if best is None:
+            self._index(
+                item_id,
+                {"title": str(text)[:200], "signature": signature, "members": 1, "sources": [source] if source else [], "first_seen": int(self.now), "last_seen": int(self.now)},
+            )
+            return {"cluster_id": item_id, "canonical": True, "size": 1}
+        cluster = self.clusters[best]
+        cluster["members"] = int(cluster.get("members", 1) or 1) + 1
+        cluster["last_seen"] = int(self.now)
+        if source and source not in cluster.setdefault("sources", []):
+            cluster["sources"].append(source)
+        return {"cluster_id": best, "canonical": False, "size": cluster["members"]}
+
+    def save(self) -> None:
+        ensure_dir(self.path.parent)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"clusters": self.clusters}, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def load_cluster_sizes(path: str | Path) -> dict[str, int]:
+    file_path = Path(path)
+    if not file_path.exists():
+        return {}
+    try:
+        payload = read_json(file_path)
+    except Exception:
+        return {}
+    clusters = payload.get("clusters") if isinstance(payload, dict) else None
+    return {cluster_id: int(cluster.get("members", 1) or 1) for cluster_id, cluster in (clusters or {}).items()}
+
+
+def collapse_clusters(items: list[dict], sizes: dict[str, int]) -> list[dict]:
+    """Keep the first item per story cluster and annotate it with `cluster_size` for corroboration scoring."""
+    counts: dict[str, int] = {}
+    for item in items:
+        cluster_id = str(item.get("cluster_id") or item.get("id") or "")
+        counts[cluster_id] = counts.get(cluster_id, 0) + 1
+    seen: set[str] = set()
+    collapsed = []
+    for item in items:
+        cluster_id = str(item.get("cluster_id") or item.get("id") or "")
+        if cluster_id and cluster_id in seen:
+            continue
+        if cluster_id:
+            seen.add(cluster_id)
+        size = max(int(sizes.get(cluster_id, 1) or 1), counts[cluster_id]) if cluster_id else 1
+        collapsed.append({**item, "cluster_size": size})
+    return collapsed
@@ -11,6 +11,7 @@ from modules.marketdata_watcher.volume_baseline import (
     save_volume_baseline,
     update_volume_baseline,
 )
+from modules.common.latest_quotes import update_marketdata_view
 from modules.common.utils import append_jsonl, ensure_dir, now_iso_tz, read_json
 
 
@@ -63,6 +64,7 @@ def run_quotes(watchlist_path: str | Path, isin_to_symbol_path: str | Path, out_
     baseline = load_volume_baseline(baseline_path)
 
     count = 0
+    written: list[dict] = []
     for item in watchlist.get("items", []):
         isin = item.get("isin")
         symbol = mapping.get(isin)
@@ -89,7 +91,9 @@ def run_quotes(watchlist_path: str | Path, isin_to_symbol_path: str | Path, out_
         if quote.get("status") == "ok":
             update_volume_baseline(baseline, str(isin), quote.get("volume"))
         append_jsonl(quotes_path, quote)
+        written.append(quote)
         count += 1
 
     save_volume_baseline(baseline_path, baseline)
+    update_marketdata_view(out_path, written, quotes_path)
     return {"quotes_path": str(quotes_path), "count": count}
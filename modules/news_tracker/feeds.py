@@ -3,7 +3,14 @@ from __future__ import annotations
 import hashlib
 from pathlib import Path
 
-from modules.common.utils import append_jsonl, ensure_dir, now_iso_tz, read_json, write_json
+from modules.common.dedup_store import DEFAULT_RETENTION_DAYS, DedupStore
+from modules.common.story_clusters import DEFAULT_THRESHOLD, DEFAULT_WINDOW_HOURS, StoryClusters
+from modules.common.utils import append_jsonl, ensure_dir, now_iso_tz
+from modules.news_tracker.fetch import fetch_log_row
+from modules.news_tracker.high_water import entries_since_mark, load_marks, mark_for, mark_key, save_marks
+from modules.news_tracker.ingest import ingest_feeds, published_fields, store_dir_for
+from modules.news_tracker.item_index import append_item, load_ts_index, save_ts_index
+from modules.news_tracker.matcher import KeywordAutomaton
 
 
 def _detect_lang(source: str, title: str, summary: str, entry_lang: str | None) -> str:
@@ -28,44 +35,68 @@ def _item_hash(title: str, link: str) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
-def pull_feeds(feed_sources: list, entities: dict, out_dir: str | Path) -> dict:
-    import feedparser
-
+def pull_feeds(
+    feed_sources: list,
+    entities: dict,
+    out_dir: str | Path,
+    fetch_cfg: dict | None = None,
+    dedup_retention_days: int = DEFAULT_RETENTION_DAYS,
+    cluster_cfg: dict | None = None,
+    store_dir: str | Path | None = None,
+) -> dict:
     out_path = Path(out_dir)
     ensure_dir(out_path)
 
-    dedup_path = out_path / "dedup_set.json"
-    dedup_set = set(read_json(dedup_path)) if dedup_path.exists() else set()
+    dedup = DedupStore(out_path / "dedup_journal.jsonl", dedup_retention_days, legacy_path=out_path / "dedup_set.json")
+    clustering = cluster_cfg or {}
+    clusters = StoryClusters(
+        out_path / "story_clusters.json",
+        threshold=float(clustering.get("threshold", DEFAULT_THRESHOLD) or DEFAULT_THRESHOLD),
+        window_hours=int(clustering.get("window_hours", DEFAULT_WINDOW_HOURS) or DEFAULT_WINDOW_HOURS),
+    )
 
     date_tag = now_iso_tz().split("T", 1)[0].replace("-", "")
     items_path = out_path / f"items_{date_tag}.jsonl"
     if not items_path.exists():
         items_path.write_text("", encoding="utf-8")
+    ts_index = load_ts_index(items_path)
+
+    matcher = KeywordAutomaton(entities.get("entities", []))
+
+    sources = [
+        {"name": source["name"], "url": source["url"]} if isinstance(source, dict) else {"name": str(source), "url": str(source)}
+        for source in feed_sources
+    ]
+    fetched = ingest_feeds(sources, store_dir if store_dir is not None else store_dir_for(out_path), fetch_cfg)
+    fetch_log_path = out_path / f"feed_fetch_{date_tag}.jsonl"
 
-    terms = []
-    for entity in entities.get("entities", []):
-        terms.extend([kw.lower() for kw in entity.get("keywords", []) if kw])
+    marks = load_marks(out_path)
+    full_scan = {str(value) for value in (fetch_cfg or {}).get("reordering_sources", [])}
 
     items = []
-    for source in feed_sources:
-        source_name = source["name"] if isinstance(source, dict) else str(source)
-        source_url = source["url"] if isinstance(source, dict) else str(source)
-
-        parsed = feedparser.parse(source_url)
-        for entry in parsed.entries:
-            title = (entry.get("title") or "").strip()
-            summary = (entry.get("summary") or "").strip()
-            link = (entry.get("link") or "").strip()
-
-            merged = f"{title} {summary}".lower()
-            if terms and not any(term in merged for term in terms):
+    for result in fetched:
+        source_name = result["source"]
+        source_url = result["url"]
+        key = mark_key(source_name, source_url)
+        fresh, _stopped = entries_since_mark(result["entries"], marks.get(key), full_scan=bool(full_scan & {source_name, source_url}))
+        if result["entries"]:
+            marks[key] = mark_for(result["entries"])
+        append_jsonl(
+            fetch_log_path,
+            fetch_log_row(result, entries=len(result["entries"]) if result["parsed"] else None, scanned=len(fresh)),
+        )
+        for entry in fresh:
+            title, summary, link = entry["title"], entry["summary"], entry["link"]
+
+            entity_ids = matcher.match(f"{title} {summary}")
+            if matcher and not entity_ids:
                 continue
 
             item_id = _item_hash(title, link)
-            if item_id in dedup_set:
+            if not dedup.add(item_id):
                 continue
 
-            dedup_set.add(item_id)
+            published_ts, published_quality = published_fields(entry)
             item = {
                 "id": item_id,
                 "source": source_name,
@@ -73,12 +104,20 @@ def pull_feeds(feed_sources: list, entities: dict, out_dir: str | Path) -> dict:
                 "title": title,
                 "summary": summary,
                 "link": link,
-                "published": entry.get("published") or entry.get("updated"),
+                "published": entry.get("published"),
+                "published_ts": published_ts,
+                "published_quality": published_quality,
                 "lang": _detect_lang(source_name, title, summary, entry.get("language")),
+                "entity_ids": entity_ids,
+                "cluster_id": clusters.assign(item_id, title, source_name)["cluster_id"],
                 "pulled_at": now_iso_tz(),
             }
-            append_jsonl(items_path, item)
+            append_item(items_path, item, ts_index)
             items.append(item)
 
-    write_json(dedup_path, sorted(dedup_set))
+    save_ts_index(items_path, ts_index)
+    dedup.flush()
+    clusters.save()
+    # Marks go last: a run that dies earlier rescans the same entries and dedup drops what was already written.
+    save_marks(out_path, marks)
     return {"items_path": str(items_path), "count": len(items), "items": items}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib import request
+from urllib.error import HTTPError, URLError
+
+from modules.common.utils import ensure_dir, now_iso_tz, read_json
+
+USER_AGENT = "portwaechter-news/1.0"
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT_SEC = 10
+
+
+def validators_path(out_dir: str | Path) -> Path:
+    return Path(out_dir) / "feed_validators.json"
+
+
+def load_validators(out_dir: str | Path) -> dict:
+    path = validators_path(out_dir)
+    if not path.exists():
+        return {}
+    try:
+        payload = read_json(path)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_validators(out_dir: str | Path, validators: dict) -> None:
+    path = validators_path(out_dir)
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(validators, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _is_http(url: str) -> bool:
+    return url.startswith(("http://", "https://"))
+
+
+def fetch_feed(url: str, validators: dict | None = None, timeout_sec: float = DEFAULT_TIMEOUT_SEC) -> dict:
+    """Conditional GET for one feed: sends stored ETag/Last-Modified and reports 304 as `not_modified`."""
+    headers = {"User-Agent": USER_AGENT}
+    known = validators or {}
+    if known.get("etag"):
+        headers["If-None-Match"] = str(known["etag"])
+    if known.get("last_modified"):
+        headers["If-Modified-Since"] = str(known["last_modified"])
+
+    started = time.monotonic()
+    result = {"url": url, "status": "error", "http_status": None, "body": None, "etag": known.get("etag"), "last_modified": known.get("last_modified"), "bytes": 0, "error": None}
+    try:
+        with request.urlopen(request.Request(url, headers=headers, method="GET"), timeout=timeout_sec) as response:
+            body = response.read()
+            result.update(
+                {
+                    "status": "ok",
+                    "http_status": response.status,
+                    "body": body,
+                    "bytes": len(body),
+                    "etag": response.headers.get("ETag") or known.get("etag"),
+                    "last_modified": response.headers.get("Last-Modified") or known.get("last_modified"),
+                }
+            )
+    except HTTPError as exc:
+        result["http_status"] = exc.code
+        if exc.code == 304:
+            result["status"] = "not_modified"
+        else:
+            result["error"] = f"http_{exc.code}"
+    except (URLError, TimeoutError, OSError, ValueError) as exc:
+        result["error"] = str(getattr(exc, "reason", exc))[:120]
+    result["latency_ms"] = round((time.monotonic() - started) * 1000.0, 1)
+    return result
+
+
+def fetch_feeds(
+    sources: list[dict],
+    validators: dict,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout_sec: float = DEFAULT_TIMEOUT_SEC,
+) -> list[dict]:
+    """Fetch HTTP feeds concurrently with bounded workers; results keep the order of `sources`."""
+
+    def _fetch(source: dict) -> dict:
+        url = source["url"]
+        if not _is_http(url):
+            return {"url": url, "status": "local", "http_status": None, "body": None, "bytes": 0, "latency_ms": 0.0, "error": None}
+        return fetch_feed(url, validators.get(url), timeout_sec=timeout_sec)
+
+    workers = max(min(int(max_workers or 1), len(sources)), 1)
+    if workers == 1:
+        results = [_fetch(source) for source in sources]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-feeds") as pool:
+            results = list(pool.map(_fetch, sources))
+    return [{**result, "source": source["name"]} for source, result in zip(sources, results)]
+
+
+def fetch_log_row(result: dict, entries: int | None = None, scanned: int | None = None) -> dict:
+    return {
+        "ts": now_iso_tz(),
+        "source": result.get("source"),
+        "url": result.get("url"),
+        "status": result.get("status"),
+        "http_status": result.get("http_status"),
+        "latency_ms": result.get("latency_ms"),
+        "bytes": result.get("bytes"),
+        "entries": entries,
+        "scanned": scanned,
+        "error": result.get("error"),
+    }
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from modules.common.utils import ensure_dir, read_json
+
+
+def marks_path(out_dir: str | Path) -> Path:
+    return Path(out_dir) / "high_water.json"
+
+
+def load_marks(out_dir: str | Path) -> dict:
+    path = marks_path(out_dir)
+    if not path.exists():
+        return {}
+    try:
+        payload = read_json(path)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_marks(out_dir: str | Path, marks: dict) -> None:
+    path = marks_path(out_dir)
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(marks, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def mark_key(source_name: str, source_url: str) -> str:
+    return f"{source_name}|{source_url}"
+
+
+def mark_for(entries: list[dict]) -> dict | None:
+    """High-water mark of a feed: identity and timestamp of its newest entry by `published_ts`.
+
+    Position is not trusted, since oldest-first feeds and pinned items put older entries on top. A feed
+    without any dates falls back to its first entry; such a mark never stops a scan early.
+    """
+    if not entries:
+        return None
+    dated = [entry for entry in entries if entry.get("published_ts") is not None]
+    head = max(dated, key=lambda entry: float(entry["published_ts"])) if dated else entries[0]
+    return {"guid": head.get("guid"), "link": head.get("link"), "title": head.get("title"), "published_ts": head.get("published_ts")}
+
+
+def _is_mark(entry: dict, mark: dict) -> bool:
+    if mark.get("guid") and entry.get("guid"):
+        return entry["guid"] == mark["guid"]
+    return bool(entry.get("link") or entry.get("title")) and entry.get("link") == mark.get("link") and entry.get("title") == mark.get("title")
+
+
+def _newest_first(entries: list[dict]) -> bool:
+    stamps = [entry.get("published_ts") for entry in entries]
+    if any(stamp is None for stamp in stamps):
+        return False
+    return all(float(newer) >= float(older) for newer, older in zip(stamps, stamps[1:]))
+
+
+def entries_since_mark(entries: list[dict], mark: dict | None, full_scan: bool = False) -> tuple[list[dict], bool]:
+    """Entries ahead of the previous run's newest entry, plus whether the scan stopped early.
+
+    The scan only stops at the mark when the feed is confirmed newest-first: every entry up to the mark and
+    the one right after it is dated, and the dates do not rise. Anything else (oldest-first feeds, pinned
+    items, undated entries, a mark that is gone or a source in `reordering_sources`) returns every entry
+    and leaves the decision to dedup.
+    """
+    if full_scan or not mark:
+        return entries, False
+    for idx, entry in enumerate(entries):
+        if _is_mark(entry, mark):
+            if _newest_first(entries[: idx + 2]):
+                return entries[:idx], True
+            return entries, False
+    return entries, False
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import calendar
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from modules.common.utils import ensure_dir, read_json
+from modules.news_tracker.fetch import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_TIMEOUT_SEC,
+    fetch_feeds,
+    load_validators,
+    save_validators,
+)
+
+DEFAULT_CYCLE_SECONDS = 600
+
+
+def store_dir_for(out_dir: str | Path) -> Path:
+    """Shared store next to the consumer directories: `data/news` and `data/radar` both use `data/feeds`."""
+    return Path(out_dir).parent / "feeds"
+
+
+def parse_published(value: str | None, parsed: tuple | None = None) -> tuple[float | None, str]:
+    """Epoch seconds plus a quality flag: `tz` (offset given), `naive_utc` (no offset, read as UTC),
+    `feed` (only feedparser's UTC struct was usable), `missing` or `invalid`."""
+    if value:
+        published_dt = None
+        try:
+            published_dt = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            try:
+                published_dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                published_dt = None
+        if published_dt is not None:
+            if published_dt.tzinfo is None:
+                return published_dt.replace(tzinfo=timezone.utc).timestamp(), "naive_utc"
+            return published_dt.timestamp(), "tz"
+    if parsed:
+        return float(calendar.timegm(tuple(parsed)[:9])), "feed"
+    return None, "invalid" if value else "missing"
+
+
+def published_fields(entry: dict) -> tuple[float | None, str]:
+    """Ingest-time fields of a stored entry; entries stored before they were added are parsed on the fly."""
+    if "published_quality" in entry:
+        return entry.get("published_ts"), str(entry["published_quality"])
+    return parse_published(entry.get("published"))
+
+
+def normalize_entry(entry: dict) -> dict:
+    published = entry.get("published") or entry.get("updated")
+    published_ts, quality = parse_published(published, entry.get("published_parsed") or entry.get("updated_parsed"))
+    return {
+        "title": (entry.get("title") or "").strip(),
+        "summary": (entry.get("summary") or "").strip(),
+        "link": (entry.get("link") or "").strip(),
+        "guid": entry.get("id"),
+        "published": published,
+        "published_ts": published_ts,
+        "published_quality": quality,
+        "language": entry.get("language"),
+    }
+
+
+def _entries_path(store_dir: Path, url: str) -> Path:
+    return store_dir / "entries" / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def _load_stored(store_dir: Path, url: str) -> dict:
+    path = _entries_path(store_dir, url)
+    if not path.exists():
+        return {}
+    try:
+        payload = read_json(path)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) and payload.get("url") == url else {}
+
+
+def _save_stored(store_dir: Path, url: str, fetched_at: float, entries: list[dict]) -> None:
+    path = _entries_path(store_dir, url)
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"url": url, "fetched_at": fetched_at, "entries": entries}, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _parse(payload: bytes | str) -> list[dict]:
+    import feedparser
+
+    return [normalize_entry(entry) for entry in feedparser.parse(payload).entries]
+
+
+def ingest_feeds(sources: list[dict], store_dir: str | Path, fetch_cfg: dict | None = None, now: float | None = None) -> list[dict]:
+    """Fetch and parse each unique feed URL at most once per cycle and hand out normalized entries per source.
+
+    News and radar both read through this store: a URL fetched within `cycle_seconds` is served from
+    `data/feeds/entries/` without a request, and a 304 serves the stored entries without parsing.
+    Result rows carry `status` (`ok`, `cached`, `not_modified`, `local`, `error`), `parsed` and `entries`.
+    """
+    store_path = Path(store_dir)
+    settings = fetch_cfg or {}
+    cycle = float(settings.get("cycle_seconds", DEFAULT_CYCLE_SECONDS) or 0)
+    now_ts = float(now if now is not None else time.time())
+
+    stored: dict[str, dict] = {}
+    to_fetch: list[dict] = []
+    for source in sources:
+        url = source["url"]
+        if url in stored:
+            continue
+        stored[url] = _load_stored(store_path, url)
+        if not (stored[url] and cycle > 0 and now_ts - float(stored[url].get("fetched_at", 0) or 0) < cycle):
+            to_fetch.append({"name": source["name"], "url": url})
+
+    validators = load_validators(store_path)
+    # Without stored entries a 304 would leave nothing to serve, so such URLs are fetched unconditionally.
+    conditional = {url: value for url, value in validators.items() if stored.get(url)}
+    fetched = {
+        result["url"]: result
+        for result in fetch_feeds(
+            to_fetch,
+            conditional,
+            max_workers=int(settings.get("max_workers", DEFAULT_MAX_WORKERS) or 1),
+            timeout_sec=float(settings.get("timeout_sec", DEFAULT_TIMEOUT_SEC) or DEFAULT_TIMEOUT_SEC),
+        )
+    } if to_fetch else {}
+
+    by_url: dict[str, dict] = {}
+    for url, result in fetched.items():
+        row = {key: value for key, value in result.items() if key not in {"body", "source"}}
+        if result["status"] == "ok":
+            row.update({"parsed": True, "entries": _parse(result["body"])})
+            _save_stored(store_path, url, now_ts, row["entries"])
+            if result.get("etag") or result.get("last_modified"):
+                validators[url] = {"etag": result.get("etag"), "last_modified": result.get("last_modified")}
+        elif result["status"] == "local":
+            row.update({"parsed": True, "entries": _parse(url)})
+        elif result["status"] == "not_modified":
+            # Entries are persisted with the validators, so a consumer that missed the last fetch still sees them.
+            row.update({"parsed": False, "entries": stored[url].get("entries", [])})
+            if stored[url]:
+                _save_stored(store_path, url, now_ts, row["entries"])
+        else:
+            row.update({"parsed": False, "entries": []})
+        by_url[url] = row
+    if fetched:
+        save_validators(store_path, validators)
+
+    rows = []
+    for source in sources:
+        url = source["url"]
+        row = by_url.get(url) or {
+            "url": url,
+            "status": "cached",
+            "http_status": None,
+            "bytes": 0,
+            "latency_ms": 0.0,
+            "error": None,
+            "parsed": False,
+            "entries": stored[url].get("entries", []),
+        }
+        rows.append({**row, "source": source["name"]})
+    return rows
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import bisect
+import json
+from datetime import datetime
+from pathlib import Path
+
+from modules.common.utils import append_jsonl, ensure_dir, read_json
+
+
+def index_path(items_path: str | Path) -> Path:
+    path = Path(items_path)
+    return path.with_name(f"{path.stem}.ts_index.json")
+
+
+def item_ts(item: dict) -> float:
+    """Sort key of an item: its published epoch, or the ingest time when the feed gave no usable date."""
+    if item.get("published_ts") is not None:
+        return float(item["published_ts"])
+    try:
+        return datetime.fromisoformat(str(item.get("pulled_at"))).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def rebuild_ts_index(items_path: str | Path) -> dict:
+    path = Path(items_path)
+    rows: list[list[float]] = []
+    size = 0
+    if path.exists():
+        with path.open("rb") as fh:
+            for raw in fh:
+                if raw.strip():
+                    try:
+                        rows.append([item_ts(json.loads(raw)), size])
+                    except json.JSONDecodeError:
+                        pass
+                size += len(raw)
+    rows.sort()
+    return {"size": size, "rows": rows}
+
+
+def load_ts_index(items_path: str | Path) -> dict:
+    """Sorted `[published_ts, byte_offset]` pairs of a day file; rebuilt when the file changed behind its back."""
+    path = Path(items_path)
+    size = path.stat().st_size if path.exists() else 0
+    sidecar = index_path(path)
+    if sidecar.exists():
+        try:
+            index = read_json(sidecar)
+        except Exception:
+            index = None
+        if isinstance(index, dict) and index.get("size") == size and isinstance(index.get("rows"), list):
+            return index
+    return rebuild_ts_index(path)
+
+
+def save_ts_index(items_path: str | Path, index: dict) -> None:
+    sidecar = index_path(items_path)
+    ensure_dir(sidecar.parent)
+    tmp = sidecar.with_suffix(sidecar.suffix + ".tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(sidecar)
+
+
+def append_item(items_path: str | Path, item: dict, index: dict) -> None:
+    path = Path(items_path)
+    offset = path.stat().st_size if path.exists() else 0
+    append_jsonl(path, item)
+    bisect.insort(index["rows"], [item_ts(item), offset])
+    index["size"] = path.stat().st_size
+
+
+def read_items_since(items_path: str | Path, since_ts: float, until_ts: float | None = None) -> list[dict]:
+    """Items published in `[since_ts, until_ts]`, oldest first; the window is found by binary search."""
+    path = Path(items_path)
+    if not path.exists():
+        return []
+    rows = load_ts_index(path)["rows"]
+    start = bisect.bisect_left(rows, [float(since_ts), -1])
+    stop = len(rows) if until_ts is None else bisect.bisect_right(rows, [float(until_ts), float("inf")])
+    items = []
+    with path.open("rb") as fh:
+        for _ts, offset in rows[start:stop]:
+            fh.seek(int(offset))
+            items.append(json.loads(fh.readline()))
+    return items
@@ -5,12 +5,12 @@ from datetime import datetime
 from pathlib import Path
 
 from modules.common.config import load_config
-from modules.common.utils import append_jsonl, ensure_dir
+from modules.common.utils import append_jsonl, ensure_dir, now_iso_tz
 from modules.news_tracker.entities import build_entities
 from modules.news_tracker.feeds import pull_feeds
 from modules.news_tracker.notifier import send_top_opportunities
 from modules.news_tracker.ranker import rank_opportunities
-from modules.news_tracker.translate import translate_stub
+from modules.news_tracker.translate import BACKENDS, TranslationMemory, translate_items, translate_stub
 
 
 DEFAULT_FEEDS = [
@@ -27,6 +27,25 @@ def _latest_snapshot(root_dir: Path) -> Path:
     return snapshots[-1]
 
 
+def _translate(cfg: dict, news_dir: Path, date_tag: str, items: list[dict]) -> list[dict]:
+    news_cfg = cfg.get("news", {})
+    translation_cfg = news_cfg.get("translation") or {}
+    backend_name = translation_cfg.get("backend")
+    if backend_name not in BACKENDS or not items:
+        return [translate_stub(item) for item in items]
+    memory = TranslationMemory(news_dir / "translation_memory.json", int(translation_cfg.get("max_entries", 20000) or 20000))
+    translated_items, stats = translate_items(
+        items,
+        BACKENDS[backend_name](cfg),
+        memory,
+        target_lang=str(news_cfg.get("translate_to", "de")),
+        batch_size=int(translation_cfg.get("batch_size", 32) or 32),
+    )
+    memory.save()
+    append_jsonl(news_dir / f"translation_stats_{date_tag}.jsonl", {"ts": now_iso_tz(), "backend": backend_name, **stats})
+    return translated_items
+
+
 def run() -> None:
     cfg = load_config()
     root_dir = Path(cfg.get("app", {}).get("root_dir", Path.cwd()))
@@ -38,7 +57,14 @@ def run() -> None:
     entities = build_entities(latest_snapshot, entities_path)
 
     feed_sources = cfg.get("news", {}).get("feed_sources", DEFAULT_FEEDS)
-    pulled = pull_feeds(feed_sources, entities, news_dir)
+    pulled = pull_feeds(
+        feed_sources,
+        entities,
+        news_dir,
+        fetch_cfg=cfg.get("news", {}).get("fetch"),
+        dedup_retention_days=int(cfg.get("news", {}).get("dedup_retention_days", 30) or 30),
+        cluster_cfg=cfg.get("news", {}).get("clustering"),
+    )
 
     date_tag = datetime.now().strftime("%Y%m%d")
     translated_path = news_dir / f"items_translated_{date_tag}.jsonl"
@@ -46,12 +72,14 @@ def run() -> None:
         translated_path.unlink()
     translated_path.write_text("", encoding="utf-8")
 
-    for item in pulled.get("items", []):
-        translated = translate_stub(item)
+    for translated in _translate(cfg, news_dir, date_tag, pulled.get("items", [])):
         append_jsonl(translated_path, translated)
 
+    # The ranker reads the append-only day file, so its index carries across runs; only entries new to the
+    # day's top list come back and get sent.
+    items_path = pulled.get("items_path") or news_dir / f"items_{date_tag}.jsonl"
     ranking_path = news_dir / f"top_opportunities_{date_tag}.json"
-    ranking = rank_opportunities(translated_path, ranking_path)
+    ranking = rank_opportunities(items_path, ranking_path, translate=lambda rows: _translate(cfg, news_dir, date_tag, rows))
     send_top_opportunities(ranking.get("top", []), cfg)
 
 
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import deque
+
+
+def entity_id(entity: dict) -> str:
+    return str(entity.get("isin") or entity.get("name") or "").upper()
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher over all entity keywords; one pass per text returns every matched entity ID.
+
+    Matching is case-insensitive substring matching, the same rule as the former `term in text` scan,
+    including overlapping keywords of different entities.
+    """
+
+    def __init__(self, entities: list[dict]) -> None:
+        self.order: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[str]] = [set()]
+        for entity in entities:
+            ident = entity_id(entity)
+            if not ident:
+                continue
+            self.order.setdefault(ident, len(self.order))
+            for keyword in entity.get("keywords", []):
+                if keyword:
+                    self._insert(str(keyword).lower(), ident)
+        self._link()
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def _insert(self, keyword: str, ident: str) -> None:
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(ident)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def match(self, text: str) -> list[str]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+        return sorted(found, key=self.order.__getitem__)
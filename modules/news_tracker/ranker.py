@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Callable
 
-from modules.common.utils import now_iso_tz, write_json
+from modules.common.story_clusters import load_cluster_sizes
+from modules.common.utils import ensure_dir, now_iso_tz, read_json, write_json
 
 
 KEYWORDS = ("earnings", "guidance", "contract", "acquisition", "approval", "warning", "outlook")
 SOURCE_BOOST = ("ir", "ad-hoc", "regulatory")
+CORROBORATION_POINTS = 1.0
+CORROBORATION_CAP = 3
+TOP_K = 10
 
 
 def _read_jsonl(path: str | Path) -> list[dict]:
@@ -35,45 +42,149 @@ def _parse_date(value: str | None) -> datetime | None:
             return None
 
 
-def _recency_score(published: str | None) -> float:
+def _published_ts(published: str | None) -> float | None:
     published_dt = _parse_date(published)
     if not published_dt:
-        return 0.0
-
+        return None
     if published_dt.tzinfo is None:
         published_dt = published_dt.replace(tzinfo=timezone.utc)
+    return published_dt.timestamp()
+
 
-    age_hours = (datetime.now(timezone.utc) - published_dt.astimezone(timezone.utc)).total_seconds() / 3600
+def _recency_from_ts(published_ts: float | None, now_ts: float) -> float:
+    if published_ts is None:
+        return 0.0
+    age_hours = (now_ts - published_ts) / 3600
     return round(max(0.0, 10.0 - (age_hours / 6.0)), 2)
 
 
-def rank_opportunities(items_jsonl: str | Path, out_json: str | Path) -> dict:
-    items = _read_jsonl(items_jsonl)
-    ranked = []
+def _recency_score(published: str | None) -> float:
+    return _recency_from_ts(_published_ts(published), datetime.now(timezone.utc).timestamp())
+
 
-    for item in items:
-        text = f"{item.get('title', '')} {item.get('summary', '')}".lower()
-        hits = [keyword for keyword in KEYWORDS if keyword in text]
+def _static_score(item: dict) -> tuple[float, list[str]]:
+    """Time-independent part of the score, computed once when the item enters the index."""
+    text = f"{item.get('title', '')} {item.get('summary', '')}".lower()
+    hits = [keyword for keyword in KEYWORDS if keyword in text]
+    score = len(hits) * 2
+    source_text = str(item.get("source", "")).lower()
+    if any(marker in source_text for marker in SOURCE_BOOST):
+        score += 3
+    return float(score), hits
 
-        score = _recency_score(item.get("published"))
-        score += len(hits) * 2
 
-        source_text = str(item.get("source", "")).lower()
-        if any(marker in source_text for marker in SOURCE_BOOST):
-            score += 3
+def _index_path(out_json: str | Path) -> Path:
+    out_path = Path(out_json)
+    return out_path.with_name(f"{out_path.stem}_index.json")
 
-        ranked.append({
-            **item,
-            "score": round(score, 2),
-            "keyword_hits": hits,
-        })
 
-    ranked.sort(key=lambda row: row.get("score", 0), reverse=True)
-    top = ranked[:10]
+def _load_index(path: Path) -> dict:
+    empty = {"fingerprint": None, "offset": 0, "seq": 0, "entries": {}, "announced": []}
+    if not path.exists():
+        return empty
+    try:
+        index = read_json(path)
+    except Exception:
+        return empty
+    return index if isinstance(index, dict) and isinstance(index.get("entries"), dict) else empty
+
+
+def _save_index(path: Path, index: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def update_index(index: dict, items_jsonl: str | Path) -> int:
+    """Score the lines appended to `items_jsonl` since the last run; a rewritten file restarts the index.
+
+    One entry per story cluster: the first item is kept, later copies only raise its member count.
+    """
+    path = Path(items_jsonl)
+    if not path.exists():
+        return 0
+    with path.open("rb") as fh:
+        fingerprint = hashlib.sha1(fh.readline()).hexdigest()
+        size = fh.seek(0, 2)
+        if fingerprint != index.get("fingerprint") or size < int(index.get("offset", 0) or 0):
+            index.update({"fingerprint": fingerprint, "offset": 0, "seq": 0, "entries": {}, "announced": []})
+        fh.seek(int(index["offset"]))
+        added = 0
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break  # a writer is mid-line; pick it up next run
+            index["offset"] += len(raw)
+            line = raw.decode("utf-8").strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            cluster_id = str(item.get("cluster_id") or item.get("id") or f"line:{index['offset']}")
+            entry = index["entries"].get(cluster_id)
+            if entry is not None:
+                entry["members"] += 1
+                continue
+            static, hits = _static_score(item)
+            index["entries"][cluster_id] = {
+                "seq": index["seq"],
+                "static": static,
+                "hits": hits,
+                "published_ts": item["published_ts"] if "published_quality" in item else _published_ts(item.get("published")),
+                "members": 1,
+                "item": item,
+            }
+            index["seq"] += 1
+            added += 1
+    return added
+
+
+def top_from_index(index: dict, sizes: dict[str, int], k: int = TOP_K, now_ts: float | None = None) -> list[dict]:
+    """Apply recency decay and corroboration at read time and select the top `k` with a bounded heap."""
+    now_value = now_ts if now_ts is not None else datetime.now(timezone.utc).timestamp()
+
+    def _scored():
+        for cluster_id, entry in index["entries"].items():
+            cluster_size = max(int(sizes.get(cluster_id, 1) or 1), int(entry["members"]))
+            score = _recency_from_ts(entry["published_ts"], now_value) + entry["static"]
+            score += CORROBORATION_POINTS * min(cluster_size - 1, CORROBORATION_CAP)
+            # Negated sequence keeps arrival order among equal scores, as the former stable sort did.
+            yield round(score, 2), -entry["seq"], entry, cluster_size
+
+    top = heapq.nlargest(k, _scored(), key=lambda row: (row[0], row[1]))
+    return [
+        {**entry["item"], "cluster_size": cluster_size, "score": score, "keyword_hits": entry["hits"]}
+        for score, _seq, entry, cluster_size in top
+    ]
+
+
+def _top_key(row: dict) -> str:
+    return str(row.get("cluster_id") or row.get("id") or row.get("link") or row.get("title") or "")
+
+
+def rank_opportunities(
+    items_jsonl: str | Path,
+    out_json: str | Path,
+    translate: Callable[[list[dict]], list[dict]] | None = None,
+) -> dict:
+    """Rank the day's append-only items and return only the entries that are new to the day's top list.
+
+    Entries already listed by an earlier run of the day are remembered in the index (`announced`), so a
+    run without new items yields an empty `top` and nothing is sent again. `translate` fills the German
+    fields of the returned rows.
+    """
+    index_path = _index_path(out_json)
+    index = _load_index(index_path)
+    update_index(index, items_jsonl)
+
+    sizes = load_cluster_sizes(Path(items_jsonl).parent / "story_clusters.json")
+    announced = set(index.get("announced") or [])
+    top = [row for row in top_from_index(index, sizes) if _top_key(row) not in announced]
+    index["announced"] = sorted(announced | {_top_key(row) for row in top})
+    _save_index(index_path, index)
 
     output = {
         "generated_at": now_iso_tz(),
-        "top": top,
+        "top": translate(top) if translate and top else top,
     }
     write_json(out_json, output)
     return output
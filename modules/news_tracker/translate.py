@@ -1,5 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Callable, Protocol
+
+from modules.common.utils import ensure_dir, read_json
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class TranslationBackend(Protocol):
+    def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]: ...
+
+
+BACKENDS: dict[str, Callable[[dict], TranslationBackend]] = {}
+
+
+def register_backend(name: str, factory: Callable[[dict], TranslationBackend]) -> None:
+    BACKENDS[name] = factory
+
 
 def translate_stub(item: dict) -> dict:
     translated = dict(item)
@@ -13,3 +37,147 @@ def translate_stub(item: dict) -> dict:
         translated["summary_de"] = []
 
     return translated
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", str(text or ""))).strip()
+
+
+def memory_key(text: str, source_lang: str, target_lang: str) -> str:
+    digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{digest}|{source_lang}|{target_lang}"
+
+
+class TranslationMemory:
+    """Persisted translations keyed by (normalized text hash, source language, target language).
+
+    The least recently used entries beyond `max_entries` are dropped on save.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = Path(path)
+        self.max_entries = max(int(max_entries), 1)
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                payload = read_json(self.path)
+            except Exception:
+                payload = {}
+            entries = payload.get("entries") if isinstance(payload, dict) else None
+            self.entries = entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> str | None:
+        entry = self.entries.get(key)
+        if not isinstance(entry, dict):
+            return None
+        entry["used"] = int(time.time())
+        return str(entry.get("text", ""))
+
+    def put(self, key: str, text: str) -> None:
+        self.entries[key] = {"text": text, "used": int(time.time())}
+
+    def save(self) -> None:
+        if len(self.entries) > self.max_entries:
+            keep = sorted(self.entries.items(), key=lambda row: int(row[1].get("used", 0) or 0), reverse=True)[: self.max_entries]
+            self.entries = dict(keep)
+        ensure_dir(self.path.parent)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"entries": self.entries}, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def translate_texts(
+    texts: list[str],
+    source_lang: str,
+    target_lang: str,
+    backend: TranslationBackend,
+    memory: TranslationMemory,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[list[str | None], dict]:
+    """Translate through the memory; only distinct texts missing from it reach the backend, in batches.
+
+    A batch that raises or returns the wrong number of texts yields None for its texts and is not memorized.
+    """
+    keys = [memory_key(text, source_lang, target_lang) for text in texts]
+    resolved: dict[str, str] = {}
+    missing: dict[str, str] = {}
+    hits = 0
+    for key, text in zip(keys, texts):
+        if key in resolved or key in missing:
+            continue
+        cached = memory.get(key)
+        if cached is not None:
+            resolved[key] = cached
+            hits += 1
+        else:
+            missing[key] = normalize_text(text)
+
+    pending = list(missing.items())
+    size = max(int(batch_size), 1)
+    failed = 0
+    for start in range(0, len(pending), size):
+        chunk = pending[start : start + size]
+        try:
+            outputs = backend.translate_batch([text for _, text in chunk], source_lang, target_lang)
+        except Exception:
+            outputs = None
+        if not isinstance(outputs, list) or len(outputs) != len(chunk):
+            failed += len(chunk)
+            continue
+        for (key, _), output in zip(chunk, outputs):
+            resolved[key] = output
+            memory.put(key, output)
+
+    unique = hits + len(missing)
+    stats = {
+        "requested": len(texts),
+        "unique": unique,
+        "hits": hits,
+        "misses": len(missing),
+        "batches": (len(pending) + size - 1) // size,
+        "fallbacks": failed,
+        "hit_rate": round(hits / unique, 4) if unique else 1.0,
+    }
+    return [resolved.get(key) for key in keys], stats
+
+
+def translate_items(
+    items: list[dict],
+    backend: TranslationBackend,
+    memory: TranslationMemory,
+    target_lang: str = "de",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[list[dict], dict]:
+    """Fill `title_de`/`summary_de` for all items; titles and summaries of one source language go out together.
+
+    Texts the backend failed on get the `translate_stub` wording instead.
+    """
+    translated = [dict(item) for item in items]
+    by_lang: dict[str, list[tuple[int, str, str]]] = {}
+    for idx, item in enumerate(translated):
+        lang = str(item.get("lang") or "en")
+        if lang == target_lang:
+            item["title_de"] = item.get("title", "")
+            item["summary_de"] = []
+            continue
+        by_lang.setdefault(lang, []).append((idx, "title", str(item.get("title") or "")))
+        if item.get("summary"):
+            by_lang[lang].append((idx, "summary", str(item["summary"])))
+
+    totals = {"requested": 0, "unique": 0, "hits": 0, "misses": 0, "batches": 0, "fallbacks": 0}
+    for lang, slots in by_lang.items():
+        outputs, stats = translate_texts([text for _, _, text in slots], lang, target_lang, backend, memory, batch_size)
+        for (idx, field, _), output in zip(slots, outputs):
+            if output is None:
+                stub = translate_stub(items[idx])
+                translated[idx][f"{field}_de"] = stub[f"{field}_de"]
+            elif field == "title":
+                translated[idx]["title_de"] = output
+            else:
+                translated[idx]["summary_de"] = [output]
+        for key in totals:
+            totals[key] += stats[key]
+    for item in translated:
+        item.setdefault("summary_de", [])
+    totals["hit_rate"] = round(totals["hits"] / totals["unique"], 4) if totals["unique"] else 1.0
+    return translated, totals
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from modules.common.holdings_index import build_holdings_index, weights_desc
 from modules.common.utils import now_iso_tz
 
 
@@ -15,12 +16,13 @@ def _weights(snapshot: dict) -> list[dict]:
     return weighted
 
 
-def propose_rebalance(snapshot: dict, analysis: dict, cfg: dict) -> dict:
+def propose_rebalance(snapshot: dict, analysis: dict, cfg: dict, index: dict | None = None) -> dict:
     rebalance_cfg = cfg.get("optimizer", {}).get("rebalance", {})
     max_position = float(rebalance_cfg.get("max_position_weight_pct", 20))
     max_top3 = float(rebalance_cfg.get("max_top3_weight_pct", 45))
 
-    weighted = _weights(snapshot)
+    active_index = index if index is not None else build_holdings_index(_weights(snapshot))
+    weighted = active_index["rows"]
     actions: list[dict] = []
     rationale: list[str] = []
 
@@ -57,11 +59,7 @@ def propose_rebalance(snapshot: dict, analysis: dict, cfg: dict) -> dict:
     top3_weight = float(analysis.get("concentration", {}).get("top3_pct", 0))
     if top3_weight > max_top3:
         rationale.append(f"Top-3 concentration {top3_weight}% exceeds limit {max_top3}%")
-        core_sorted = sorted(
-            [p for p in weighted if p.get("instrument_type") in {"stock", "etf"}],
-            key=lambda row: float(row.get("weight_pct") or 0),
-            reverse=True,
-        )
+        core_sorted = [p for p in weights_desc(active_index) if p.get("instrument_type") in {"stock", "etf"}]
         target_each = round(max_top3 / 3, 2)
         for pos in core_sorted[:3]:
             isin = str(pos.get("isin"))
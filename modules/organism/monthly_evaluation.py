@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 
 from modules.common.utils import now_iso_tz, read_json
+from modules.v2.recommendation_history import history_enabled, run_summaries
 from modules.v2.telegram.copy import candidate_name, classification_label
 from modules.virus_bridge.cost_status import build_cost_status
 from modules.virus_bridge.execution_performance import _build_all_positions, load_exit_records
@@ -69,13 +70,33 @@ def _latest_trade_candidate_risk(ticket_id: str, cfg: dict) -> float | None:
         return None
 
 
+def _months_between(start: datetime, end: datetime) -> list[str]:
+    months: list[str] = []
+    year, month = start.year, start.month
+    while datetime(year, month, 1) < end:
+        months.append(f"{year:04d}{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
 def _activity_metrics(cfg: dict, start: datetime, end: datetime) -> dict:
     root = _root_dir(cfg)
     recommendations_total = 0
     buckets = {"KAUFEN PRUEFEN": 0, "VERKAUFEN PRUEFEN": 0, "RISIKO REDUZIEREN": 0, "HALTEN": 0}
     scanner_runs = 0
+    history_runs: set[str] = set()
+    if history_enabled(cfg):
+        for run in run_summaries(cfg, _months_between(start, end)):
+            if not _in_period(_parse_ts(run.get("generated_at")), start, end):
+                continue
+            history_runs.add(str(run.get("run_id")))
+            scanner_runs += 1
+            recommendations_total += int(run.get("rows", 0) or 0)
+            for label, count in (run.get("labels") or {}).items():
+                if label in buckets:
+                    buckets[label] += int(count or 0)
     for path in sorted((root / "data" / "v2").glob("recommendations_*.json")):
-        if not _in_period(_mtime(path), start, end):
+        if path.stem[len("recommendations_") :] in history_runs or not _in_period(_mtime(path), start, end):
             continue
         scanner_runs += 1
         try:
@@ -4,7 +4,12 @@ import hashlib
 from datetime import datetime
 from pathlib import Path
 
-from modules.common.utils import append_jsonl, ensure_dir, now_iso_tz, read_json, write_json
+from modules.common.dedup_store import DEFAULT_RETENTION_DAYS, DedupStore
+from modules.common.story_clusters import DEFAULT_THRESHOLD, DEFAULT_WINDOW_HOURS, StoryClusters
+from modules.common.utils import ensure_dir, now_iso_tz
+from modules.news_tracker.high_water import entries_since_mark, load_marks, mark_for, mark_key, save_marks
+from modules.news_tracker.ingest import ingest_feeds, published_fields, store_dir_for
+from modules.news_tracker.item_index import append_item, load_ts_index, save_ts_index
 from modules.radar.universe import build_universe
 
 
@@ -14,36 +19,47 @@ def _item_hash(source: str, title: str, link: str) -> str:
 
 
 def pull_radar_feeds(cfg: dict, out_dir: str | Path) -> str:
-    import feedparser
-
     out_path = Path(out_dir)
     ensure_dir(out_path)
 
-    dedup_path = out_path / "dedup_set.json"
-    dedup_set = set(read_json(dedup_path)) if dedup_path.exists() else set()
+    radar_cfg = cfg.get("radar", {})
+    retention_days = int(radar_cfg.get("dedup_retention_days", DEFAULT_RETENTION_DAYS) or DEFAULT_RETENTION_DAYS)
+    dedup = DedupStore(out_path / "dedup_journal.jsonl", retention_days, legacy_path=out_path / "dedup_set.json")
+    clustering = radar_cfg.get("clustering", {})
+    clusters = StoryClusters(
+        out_path / "story_clusters.json",
+        threshold=float(clustering.get("threshold", DEFAULT_THRESHOLD) or DEFAULT_THRESHOLD),
+        window_hours=int(clustering.get("window_hours", DEFAULT_WINDOW_HOURS) or DEFAULT_WINDOW_HOURS),
+    )
 
     date_tag = datetime.now().strftime("%Y%m%d")
     items_path = out_path / f"radar_items_{date_tag}.jsonl"
+    ts_index = load_ts_index(items_path)
 
-    universe = build_universe(cfg)
-    for entity in universe:
-        if entity.get("type") != "feed":
-            continue
-
-        source_name = entity.get("name") or entity.get("url")
-        source_url = entity.get("url")
-        parsed = feedparser.parse(source_url)
-
-        for entry in parsed.entries:
-            title = (entry.get("title") or "").strip()
-            link = (entry.get("link") or "").strip()
-            summary = (entry.get("summary") or "").strip()
+    sources = [
+        {"name": entity.get("name") or entity.get("url"), "url": entity.get("url")}
+        for entity in build_universe(cfg)
+        if entity.get("type") == "feed" and entity.get("url")
+    ]
+    # Radar shares the news fetch settings unless it has its own, so both see the same fetch cycle.
+    fetch_cfg = radar_cfg.get("fetch") or cfg.get("news", {}).get("fetch")
+    marks = load_marks(out_path)
+    full_scan = {str(value) for value in (fetch_cfg or {}).get("reordering_sources", [])}
+    for result in ingest_feeds(sources, store_dir_for(out_path), fetch_cfg):
+        source_name = result["source"]
+        source_url = result["url"]
+        key = mark_key(source_name, source_url)
+        fresh, _stopped = entries_since_mark(result["entries"], marks.get(key), full_scan=bool(full_scan & {source_name, source_url}))
+        if result["entries"]:
+            marks[key] = mark_for(result["entries"])
+        for entry in fresh:
+            title, link, summary = entry["title"], entry["link"], entry["summary"]
             item_id = _item_hash(source_name, title, link)
-            if item_id in dedup_set:
+            if not dedup.add(item_id):
                 continue
 
-            dedup_set.add(item_id)
-            append_jsonl(
+            published_ts, published_quality = published_fields(entry)
+            append_item(
                 items_path,
                 {
                     "id": item_id,
@@ -52,12 +68,19 @@ def pull_radar_feeds(cfg: dict, out_dir: str | Path) -> str:
                     "title": title,
                     "summary": summary,
                     "link": link,
-                    "published": entry.get("published") or entry.get("updated"),
+                    "published": entry.get("published"),
+                    "published_ts": published_ts,
+                    "published_quality": published_quality,
                     "pulled_at": now_iso_tz(),
+                    "cluster_id": clusters.assign(item_id, title, source_name)["cluster_id"],
                 },
+                ts_index,
             )
 
-    write_json(dedup_path, sorted(dedup_set))
+    dedup.flush()
+    clusters.save()
     if not items_path.exists():
         items_path.write_text("", encoding="utf-8")
+    save_ts_index(items_path, ts_index)
+    save_marks(out_path, marks)
     return str(items_path)
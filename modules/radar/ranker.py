@@ -7,13 +7,17 @@ from email.utils import parsedate_to_datetime
 from pathlib import Path
 
 from modules.common.config import load_config
+from modules.common.story_clusters import collapse_clusters, load_cluster_sizes
 from modules.common.utils import now_iso_tz, read_json
+from modules.news_tracker.matcher import KeywordAutomaton
 
 HOLDING_BOOST = 5.0
 LARGECAP_SCORE = 2.0
 US_TECH_SCORE = 3.0
 SMALLCAP_SCORE = 2.0
 SPAM_PENALTY = 4.0
+CORROBORATION_SCORE = 1.0
+CORROBORATION_CAP = 3
 
 LARGECAP_KEYWORDS = (
     "dax",
@@ -56,6 +60,28 @@ SPAM_KEYWORDS = (
     "boersenbrief",
 )
 
+CATEGORY_KEYWORDS = {
+    "largecap": LARGECAP_KEYWORDS,
+    "us_tech": US_TECH_KEYWORDS,
+    "smallcap": SMALLCAP_KEYWORDS,
+    "spam": SPAM_KEYWORDS,
+}
+CATEGORY_REASONS = {
+    "holding": "Holding Match",
+    "largecap": "DAX Keyword",
+    "us_tech": "AI Keyword",
+    "smallcap": "Smallcap Keyword",
+    "spam": "Spam Penalty",
+}
+DEFAULT_WEIGHTS = {
+    "holding": HOLDING_BOOST,
+    "largecap": LARGECAP_SCORE,
+    "us_tech": US_TECH_SCORE,
+    "smallcap": SMALLCAP_SCORE,
+    "spam": SPAM_PENALTY,
+    "corroboration": CORROBORATION_SCORE,
+}
+
 
 def _read_jsonl(path: str | Path) -> list[dict]:
     rows: list[dict] = []
@@ -93,6 +119,9 @@ def _normalize_title(title: str) -> str:
 
 
 def _published_dt(item: dict) -> datetime | None:
+    # Items ingested with a parsed epoch skip the string parsing below.
+    if item.get("published_ts") is not None:
+        return datetime.fromtimestamp(float(item["published_ts"]), tz=timezone.utc)
     return _parse_date(item.get("published_at") or item.get("published") or item.get("pulled_at"))
 
 
@@ -110,10 +139,6 @@ def _freshness_points(published_dt: datetime | None) -> tuple[float, list[str]]:
     return 0.0, []
 
 
-def _contains_any(text: str, keywords: tuple[str, ...]) -> bool:
-    return any(keyword in text for keyword in keywords)
-
-
 def _load_holding_names(cfg: dict) -> list[str]:
     root_dir = Path(cfg.get("app", {}).get("root_dir", Path.cwd()))
     snapshots = sorted((root_dir / "data" / "snapshots").glob("portfolio_*.json"))
@@ -155,59 +180,72 @@ def _dedupe_titles(items: list[dict], window_hours: int = 6) -> list[dict]:
     return accepted
 
 
-def rank_radar(items_jsonl: str | Path) -> dict:
-    cfg = load_config()
-    min_score = float(cfg.get("radar", {}).get("min_score", 4))
+class RadarClassifier:
+    """Radar scoring built once per run: one keyword automaton over all categories plus weights and publisher priors.
 
-    items = _dedupe_titles(_read_jsonl(items_jsonl), window_hours=6)
-    holding_names = _load_holding_names(cfg)
+    Category keywords keep the substring rule of the former tuple scans; `radar.weights`, `radar.keywords` and
+    `radar.publisher_priors` in the config override or extend the module defaults.
+    """
 
-    ranked: list[dict] = []
-    for item in items:
+    def __init__(self, cfg: dict, holding_names: list[str] | None = None) -> None:
+        radar_cfg = cfg.get("radar", {})
+        self.min_score = float(radar_cfg.get("min_score", 4))
+        self.weights = {**DEFAULT_WEIGHTS, **{key: float(value) for key, value in (radar_cfg.get("weights") or {}).items()}}
+        extra = radar_cfg.get("keywords") or {}
+        keywords = {category: [*words, *(extra.get(category) or [])] for category, words in CATEGORY_KEYWORDS.items()}
+        keywords["holding"] = list(holding_names if holding_names is not None else _load_holding_names(cfg))
+        self.matcher = KeywordAutomaton([{"name": category, "keywords": words} for category, words in keywords.items()])
+        self.publisher_priors = [(str(marker).lower(), float(points)) for marker, points in (radar_cfg.get("publisher_priors") or {}).items()]
+
+    def score(self, item: dict) -> dict:
         title = str(item.get("title", "")).strip()
         source = str(item.get("source", "")).strip()
-        text = f"{title} {item.get('summary', '')}".lower()
+        hits = set(self.matcher.match(f"{title} {item.get('summary', '')}"))
 
         score = 0.0
         reasons: list[str] = []
-
-        if holding_names and any(name in text for name in holding_names):
-            score += HOLDING_BOOST
-            reasons.append("Holding Match")
-
-        if _contains_any(text, LARGECAP_KEYWORDS):
-            score += LARGECAP_SCORE
-            reasons.append("DAX Keyword")
-
-        if _contains_any(text, US_TECH_KEYWORDS):
-            score += US_TECH_SCORE
-            reasons.append("AI Keyword")
-
-        if _contains_any(text, SMALLCAP_KEYWORDS):
-            score += SMALLCAP_SCORE
-            reasons.append("Smallcap Keyword")
+        for category in ("holding", "largecap", "us_tech", "smallcap"):
+            if category.upper() in hits:
+                score += self.weights[category]
+                reasons.append(CATEGORY_REASONS[category])
+
+        source_text = source.lower()
+        for marker, points in self.publisher_priors:
+            if marker in source_text:
+                score += points
+                reasons.append(f"Publisher Prior ({marker})")
+
+        cluster_size = int(item.get("cluster_size", 1))
+        if cluster_size > 1:
+            score += self.weights["corroboration"] * min(cluster_size - 1, CORROBORATION_CAP)
+            reasons.append(f"Corroborated (x{cluster_size})")
 
         published_dt = _published_dt(item)
         fresh_points, fresh_reasons = _freshness_points(published_dt)
         score += fresh_points
         reasons.extend(fresh_reasons)
 
-        if _contains_any(text, SPAM_KEYWORDS):
-            score -= SPAM_PENALTY
-            reasons.append("Spam Penalty")
+        if "SPAM" in hits:
+            score -= self.weights["spam"]
+            reasons.append(CATEGORY_REASONS["spam"])
 
-        if score < min_score:
-            continue
+        return {
+            "title": title,
+            "source": source,
+            "published_at": published_dt.isoformat() if published_dt else None,
+            "score": round(score, 2),
+            "reasons": reasons,
+            "cluster_size": cluster_size,
+        }
+
+
+def rank_radar(items_jsonl: str | Path, cfg: dict | None = None, classifier: RadarClassifier | None = None) -> dict:
+    active_cfg = cfg if cfg is not None else load_config()
+    radar = classifier or RadarClassifier(active_cfg)
 
-        ranked.append(
-            {
-                "title": title,
-                "source": source,
-                "published_at": published_dt.isoformat() if published_dt else None,
-                "score": round(score, 2),
-                "reasons": reasons,
-            }
-        )
+    sizes = load_cluster_sizes(Path(items_jsonl).parent / "story_clusters.json")
+    items = _dedupe_titles(collapse_clusters(_read_jsonl(items_jsonl), sizes), window_hours=6)
 
+    ranked = [row for row in (radar.score(item) for item in items) if row["score"] >= radar.min_score]
     ranked.sort(key=lambda row: (row.get("score", 0), row.get("published_at") or ""), reverse=True)
     return {"generated_at": now_iso_tz(), "top": ranked[:10]}
@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 
 from modules.common.config import load_config
+from modules.common.latest_quotes import load_marketdata_view, lookup_latest
 from modules.setup_engine.planner import build_setup, enqueue_setup_for_approval, handle_approval_command, notify_setup
 
 
@@ -13,28 +14,8 @@ def _latest(path: Path, pattern: str) -> Path | None:
     return files[-1] if files else None
 
 
-def _read_jsonl(path: Path) -> list[dict]:
-    if not path.exists():
-        return []
-    rows = []
-    with path.open("r", encoding="utf-8") as fh:
-        for line in fh:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
 def _latest_quotes_by_isin(root: Path) -> dict:
-    path = _latest(root / "data" / "marketdata", "quotes_*.jsonl")
-    rows = _read_jsonl(path) if path else []
-    out = {}
-    for row in rows:
-        isin = str(row.get("isin") or "")
-        if isin and row.get("status") == "ok":
-            out[isin] = row
-    return out
+    return load_marketdata_view(root / "data" / "marketdata")
 
 
 def run(cfg: dict) -> list[dict]:
@@ -50,7 +31,7 @@ def run(cfg: dict) -> list[dict]:
     quotes = _latest_quotes_by_isin(root)
     created = []
     for candidate in setups:
-        setup = build_setup(candidate, quotes.get(str(candidate.get("isin")), {}), cfg)
+        setup = build_setup(candidate, lookup_latest(quotes, candidate.get("isin")) or {}, cfg)
         enqueue_setup_for_approval(setup, cfg)
         notify_setup(setup, cfg)
         created.append(setup)
@@ -291,6 +291,7 @@ def write_inbox(items: list[dict], cfg: dict) -> None:
 
 
 def handle_command(cmd: dict, cfg: dict, state: dict | None = None) -> tuple[str, dict]:
+    cfg = {**cfg, "_quote_consumer": "telegram"}
     active_state = state if isinstance(state, dict) else {"last_update_id": 0, "ui_context_by_chat": {}}
     text = str(cmd.get("normalized_text") or cmd.get("text") or "")
     chat_id = str(cmd.get("chat_id") or "")
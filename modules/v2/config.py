@@ -44,10 +44,21 @@ DEFAULTS: dict[str, Any] = {
         "minute_limit_soft": 45,
         "minute_limit_hard": 55,
         "per_run_budget": 20,
+        "credentials": [],
+        "key_failure_threshold": 2,
+        "key_cooldown_sec": 300,
         "batch_only": True,
         "allow_symbol_search_runtime": False,
         "max_universe_per_run": 30,
         "rotate_universe_chunks": True,
+        "scheduler": "rotate",
+        "voi": {
+            "weights": {"volatility": 1.0, "volume": 1.0, "news": 1.5, "threshold": 1.0, "staleness": 1.0},
+            "volatility_ref_pct": 5.0,
+            "volume_spike_ratio": 1.8,
+            "news_hits_ref": 3,
+            "staleness_cap_minutes": 120,
+        },
         "preferred_scan_interval_minutes": 5,
         "degrade_mode": {
             "enabled": True,
@@ -67,12 +78,25 @@ DEFAULTS: dict[str, Any] = {
         "watchlist_path": "data/watchlist/watchlist.json",
         "env_file": "/etc/portwaechter/portwaechter.env",
         "quiet_hours": {"start": "22:00", "end": "08:30"},
-        "marketdata": {"batch_size": 8, "timeout_sec": 10, "max_live_fallback_symbols": 8, "max_retry_symbols": 12},
+        "marketdata": {
+            "batch_size": 8,
+            "timeout_sec": 10,
+            "max_live_fallback_symbols": 8,
+            "max_retry_symbols": 12,
+            "max_concurrent_batches": 4,
+            "adaptive_batch": {"enabled": False, "min_size": 2, "max_size": 32, "step": 2, "target_latency_ms": 2500, "max_error_rate": 0.2},
+        },
+        "quote_cache": {"enabled": True, "path": "data/v2/quote_cache.json", "ttl_sec": 900},
+        "incremental": {"enabled": False, "persist": "full", "max_age_hours": 24},
+        "profiling": {"enabled": True, "dir": "data/v2/profiles"},
+        "history": {"enabled": True, "snapshots": True},
+        "premarket": {"warm_max_age_min": 45},
+        "sharding": {"enabled": False, "workers": 4},
+        "delta_notify": {"enabled": True},
         "telegram": {
             "watch_max_per_day": 10,
             "action_max_per_day": 3,
             "defense_max_per_day": 5,
-            "cooldown_minutes": 90,
         },
     }
 }
@@ -163,6 +187,10 @@ def v2_marketdata(cfg: dict[str, Any]) -> dict[str, Any]:
     return cfg.get("v2", {}).get("marketdata", {})
 
 
+def quote_cache(cfg: dict[str, Any]) -> dict[str, Any]:
+    return cfg.get("v2", {}).get("quote_cache", {})
+
+
 def v2_telegram(cfg: dict[str, Any]) -> dict[str, Any]:
     return cfg.get("v2", {}).get("telegram", {})
 
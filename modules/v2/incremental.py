@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from modules.common.utils import ensure_dir, read_json
+from modules.v2.config import data_dir
+
+SCORED_FIELDS = ("portfolio_priority", "portfolio_context", "opportunity_score", "defense_score", "classification")
+VOLATILE_QUOTE_FIELDS = {"cache_age_sec"}
+HOLDING_FIELDS = ("isin", "symbol", "weight_pct", "sector", "theme")
+
+
+def incremental_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("incremental", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def incremental_enabled(cfg: dict) -> bool:
+    return bool(incremental_cfg(cfg).get("enabled", False))
+
+
+def delta_persistence(cfg: dict) -> bool:
+    return incremental_enabled(cfg) and str(incremental_cfg(cfg).get("persist") or "full").strip().lower() == "delta"
+
+
+def incremental_dir(cfg: dict) -> Path:
+    return data_dir(cfg) / "incremental"
+
+
+def _state_path(cfg: dict) -> Path:
+    return incremental_dir(cfg) / "state.json"
+
+
+def _atomic_write_json(path: Path, payload: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def digest(value: object) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def instrument_key(candidate: dict) -> str:
+    return str(candidate.get("isin") or candidate.get("symbol") or "").strip().upper()
+
+
+def holdings_digest(holdings: list[dict]) -> str:
+    return digest(sorted(([row.get(field) for field in HOLDING_FIELDS] for row in holdings or []), key=str))
+
+
+def scoring_fingerprint(candidate: dict, regime: str, holdings_hash: str, expectancy_hash: str, today: date | None = None) -> str:
+    """Hash everything scoring, classification and rendering read for one scanner candidate."""
+    quote = {key: value for key, value in (candidate.get("quote") or {}).items() if key not in VOLATILE_QUOTE_FIELDS}
+    inputs = {key: value for key, value in candidate.items() if key not in SCORED_FIELDS and key not in {"quote", "regime"}}
+    # Quote freshness in classify depends on the calendar day, so the day is part of the fingerprint.
+    return digest(
+        {
+            "candidate": inputs,
+            "quote": quote,
+            "regime": regime,
+            "holdings": holdings_hash,
+            "expectancy": expectancy_hash,
+            "day": (today or date.today()).isoformat(),
+        }
+    )
+
+
+def load_incremental_state(cfg: dict) -> dict[str, Any]:
+    path = _state_path(cfg)
+    empty = {"generated_at": None, "order": [], "entries": {}}
+    if not path.exists():
+        return empty
+    try:
+        payload = read_json(path)
+    except Exception:
+        return empty
+    if not isinstance(payload, dict) or not isinstance(payload.get("entries"), dict):
+        return empty
+    return {**empty, **payload}
+
+
+def reusable_entry(state: dict, key: str, fingerprint: str) -> dict | None:
+    entry = state.get("entries", {}).get(key)
+    if isinstance(entry, dict) and entry.get("fingerprint") == fingerprint:
+        return entry
+    return None
+
+
+def _prune(entries: dict, now_dt: datetime, max_age_hours: float) -> dict:
+    cutoff = now_dt - timedelta(hours=max_age_hours)
+    kept: dict = {}
+    for key, entry in entries.items():
+        try:
+            seen = datetime.fromisoformat(str(entry.get("seen_at") or ""))
+        except ValueError:
+            continue
+        if seen >= cutoff:
+            kept[key] = entry
+    return kept
+
+
+def persist_incremental(
+    cfg: dict,
+    state: dict,
+    entries: dict[str, dict],
+    changed_keys: list[str],
+    write_delta: bool,
+    now_dt: datetime | None = None,
+) -> dict:
+    """Fold this run into the reuse state and write a manifest (plus the delta payload if requested)."""
+    ref = now_dt or datetime.now()
+    stamp = ref.strftime("%Y%m%d_%H%M")
+    order = list(entries.keys())
+    previous_order = [key for key in state.get("order", []) if isinstance(key, str)]
+    removed = [key for key in previous_order if key not in entries]
+    changed = set(changed_keys)
+
+    merged = dict(state.get("entries", {}))
+    for key, entry in entries.items():
+        merged[key] = {**entry, "seen_at": ref.isoformat()} if key in changed or key not in merged else {**merged[key], "seen_at": ref.isoformat()}
+    merged = _prune(merged, ref, float(incremental_cfg(cfg).get("max_age_hours", 24) or 24))
+
+    out_dir = incremental_dir(cfg)
+    paths: dict[str, str] = {}
+    if write_delta:
+        delta_path = out_dir / f"delta_{stamp}.json"
+        _atomic_write_json(
+            delta_path,
+            {
+                "generated_at": ref.isoformat(),
+                "changed": [key for key in order if key in changed],
+                "removed": removed,
+                "candidates": [entries[key]["candidate"] for key in order if key in changed],
+                "recommendations": [entries[key]["recommendation"] for key in order if key in changed],
+            },
+        )
+        paths["delta_path"] = str(delta_path)
+
+    manifest_path = out_dir / f"manifest_{stamp}.json"
+    _atomic_write_json(
+        manifest_path,
+        {
+            "generated_at": ref.isoformat(),
+            "instruments": {
+                key: {
+                    "fingerprint": entries[key]["fingerprint"],
+                    "changed": key in changed,
+                    "classification": entries[key]["recommendation"].get("classification"),
+                }
+                for key in order
+            },
+            "changed_count": len(changed),
+            "reused_count": len(order) - len(changed),
+            "removed": removed,
+            **paths,
+        },
+    )
+    paths["manifest_path"] = str(manifest_path)
+    _atomic_write_json(_state_path(cfg), {"generated_at": ref.isoformat(), "order": order, "entries": merged})
+    return paths
+
+
+def latest_incremental_recommendations(cfg: dict) -> list[dict]:
+    state = load_incremental_state(cfg)
+    entries = state.get("entries", {})
+    return [entries[key]["recommendation"] for key in state.get("order", []) if isinstance(entries.get(key), dict)]
@@ -5,26 +5,41 @@ import json
 from datetime import datetime
 import logging
 
-from modules.common.utils import ensure_dir, read_json, write_json
+from modules.common.latest_quotes import update_v2_view
+from modules.common.utils import ensure_dir, write_json
 from modules.decision_engine.expectancy import load_latest_expectancy
 from modules.integration.pw_to_virus import export_action_candidates_to_bridge
 from modules.marketdata_watcher.volume_baseline import load_volume_baseline, save_volume_baseline, update_volume_baseline
 from modules.v2.config import data_dir, load_v2_config, resolve_env_value, root_dir
+from modules.v2.incremental import (
+    SCORED_FIELDS,
+    delta_persistence,
+    digest,
+    holdings_digest,
+    incremental_enabled,
+    instrument_key,
+    load_incremental_state,
+    persist_incremental,
+    reusable_entry,
+    scoring_fingerprint,
+)
 from modules.v2.marketdata.api_governor import (
     current_mode,
     load_governor_state,
     reset_minute_if_needed,
     save_governor_state,
 )
+from modules.v2.market_regime import latest_regime
 from modules.v2.marketdata.batch_quotes import fetch_quotes_for_instruments
-from modules.v2.recommendations.classify import classify_candidate
+from modules.v2.profiling import RunProfiler
+from modules.v2.recommendation_diff import delta_enabled, diff_recommendations, load_delta_state, notification_rows, save_delta_state
+from modules.v2.recommendation_history import append_run, history_enabled, write_snapshots
 from modules.v2.recommendations.render import render_recommendation
 from modules.v2.scanner.orchestrator import run_scanner
-from modules.v2.scoring.defense_score import compute_defense_score
-from modules.v2.scoring.opportunity_score import compute_opportunity_score
-from modules.v2.scoring.portfolio_priority import compute_portfolio_priority
+from modules.v2.scoring.batch import score_candidates
+from modules.v2.sharding import run_sharded_scan, shard_count
 from modules.v2.symbols import build_missing_mapping_report
-from modules.v2.telegram.notifier import send_action, send_defense, send_watch_bundle
+from modules.v2.telegram.notifier import entity_key, send_action, send_defense, send_watch_bundle, skip_reason, watch_bundle_key
 from modules.v2.universe.holdings_universe import load_current_holdings
 from modules.v2.universe.scanner_universe import load_scanner_universe, merge_universes
 from modules.v2.universe.scheduling import select_assets_for_run
@@ -32,23 +47,19 @@ from modules.v2.universe.scheduling import select_assets_for_run
 log = logging.getLogger(__name__)
 
 
-def _latest_regime(cfg: dict) -> str:
-    briefings = sorted((root_dir(cfg) / "data" / "briefings").glob("morning_*.json"))
-    if not briefings:
-        return "neutral"
-    briefing = read_json(briefings[-1])
-    return str((briefing.get("regime") or {}).get("regime") or "neutral")
-
-
 def _persist(cfg: dict, candidates: list[dict], recommendations: list[dict]) -> dict:
     out_dir = data_dir(cfg)
     ensure_dir(out_dir)
     stamp = datetime.now().strftime("%Y%m%d_%H%M")
     candidates_path = out_dir / f"candidates_{stamp}.json"
-    recommendations_path = out_dir / f"recommendations_{stamp}.json"
     write_json(candidates_path, {"generated_at": datetime.now().isoformat(), "candidates": candidates})
-    write_json(recommendations_path, {"generated_at": datetime.now().isoformat(), "recommendations": recommendations})
-    return {"candidates_path": str(candidates_path), "recommendations_path": str(recommendations_path)}
+    update_v2_view(out_dir, candidates, candidates_path)
+    paths = {"run_id": stamp, "candidates_path": str(candidates_path)}
+    if write_snapshots(cfg):
+        recommendations_path = out_dir / f"recommendations_{stamp}.json"
+        write_json(recommendations_path, {"generated_at": datetime.now().isoformat(), "recommendations": recommendations})
+        paths["recommendations_path"] = str(recommendations_path)
+    return paths
 
 
 def _update_baseline(cfg: dict, candidates: list[dict]) -> None:
@@ -63,59 +74,146 @@ def _update_baseline(cfg: dict, candidates: list[dict]) -> None:
     save_volume_baseline(baseline_path, baseline)
 
 
-def _notify(cfg: dict, recommendations: list[dict]) -> None:
+def _notify(cfg: dict, recommendations: list[dict]) -> list[dict]:
+    """Send WATCH bundle and ACTION/DEFENSE messages; returns the rows whose send actually failed.
+
+    Rows skipped as already sent today or over the daily limit count as settled, so they are not offered again.
+    """
+    unsent: list[dict] = []
     watches = [row for row in recommendations if row.get("classification") == "WATCH"]
-    if watches:
-        send_watch_bundle(watches, cfg)
+    if watches and not send_watch_bundle(watches, cfg) and skip_reason("watch", watch_bundle_key(watches), cfg) is None:
+        unsent.extend(watches)
     for row in recommendations:
         text = row.get("telegram_text")
         if not text:
             continue
         if row.get("classification") == "ACTION":
-            send_action(row, text, cfg)
+            kind, sent = "action", send_action(row, text, cfg)
         elif row.get("classification") == "DEFENSE":
-            send_defense(row, text, cfg)
+            kind, sent = "defense", send_defense(row, text, cfg)
+        else:
+            continue
+        if not sent and skip_reason(kind, entity_key(row), cfg) is None:
+            unsent.append(row)
+    return unsent
 
 
-def run(cfg: dict | None = None) -> dict:
+def run(cfg: dict | None = None, profile: bool = False) -> dict:
     active_cfg = cfg or load_v2_config()
-    holdings = load_current_holdings(active_cfg)
-    scanner = load_scanner_universe(active_cfg)
-    universe = merge_universes(holdings, scanner)
-    governor_state = reset_minute_if_needed(load_governor_state(active_cfg), datetime.now())
-    selected_universe = select_assets_for_run(universe, governor_state, active_cfg)
-    save_governor_state(governor_state, active_cfg)
+    profiler = RunProfiler(active_cfg, cprofile=profile)
+    with profiler.stage("universe") as stage:
+        holdings = load_current_holdings(active_cfg)
+        scanner = load_scanner_universe(active_cfg)
+        universe = merge_universes(holdings, scanner)
+        mapping_report = build_missing_mapping_report(holdings, cfg=active_cfg)
+        stage["rows_out"] = len(universe)
+    with profiler.stage("select_assets", rows_in=len(universe)) as stage:
+        governor_state = reset_minute_if_needed(load_governor_state(active_cfg), datetime.now())
+        selected_universe = select_assets_for_run(universe, governor_state, active_cfg)
+        save_governor_state(governor_state, active_cfg)
+        stage["rows_out"] = len(selected_universe)
     selected_holdings = [row for row in selected_universe if row.get("group") == "holding"]
     selected_scanner = [row for row in selected_universe if row.get("group") != "holding"]
-    mapping_report = build_missing_mapping_report(holdings, cfg=active_cfg)
 
-    quotes = fetch_quotes_for_instruments(selected_universe, active_cfg, api_key=resolve_env_value(active_cfg, "TWELVEDATA_API_KEY"))
-    candidates = run_scanner(active_cfg, holdings=selected_holdings, scanner=selected_scanner, quotes=quotes)
-    regime = _latest_regime(active_cfg)
-    expectancy = load_latest_expectancy(active_cfg)
+    if shard_count(active_cfg) > 1:
+        with profiler.stage("sharded_scan", rows_in=len(selected_universe)) as stage:
+            quotes, candidates = run_sharded_scan(
+                active_cfg,
+                merge_universes(selected_holdings, selected_scanner),
+                api_key=resolve_env_value(active_cfg, "TWELVEDATA_API_KEY"),
+            )
+            stage["rows_out"] = len(candidates)
+    else:
+        with profiler.stage("fetch_quotes", rows_in=len(selected_universe)) as stage:
+            quotes = fetch_quotes_for_instruments(selected_universe, active_cfg, api_key=resolve_env_value(active_cfg, "TWELVEDATA_API_KEY"))
+            stage["rows_out"] = len(quotes)
+        with profiler.stage("scanner", rows_in=len(quotes)) as stage:
+            candidates = run_scanner(active_cfg, holdings=selected_holdings, scanner=selected_scanner, quotes=quotes)
+            stage["rows_out"] = len(candidates)
 
-    recommendations: list[dict] = []
-    for candidate in candidates:
-        candidate["regime"] = regime
-        candidate["portfolio_priority"] = compute_portfolio_priority(candidate, holdings)
-        opp_score = compute_opportunity_score(candidate, regime, expectancy)
-        defense_score = compute_defense_score(candidate, regime, float(candidate.get("weight_pct", 0) or 0))
-        classification = classify_candidate(candidate, opp_score, defense_score)
-        candidate["opportunity_score"] = opp_score
-        candidate["defense_score"] = defense_score
-        candidate["classification"] = classification
-        rendered = render_recommendation(
-            candidate,
-            classification,
-            {"opportunity": opp_score, "defense": defense_score, "regime": regime},
-            cfg=active_cfg,
-        )
-        recommendations.append({**rendered["json"], "telegram_text": rendered["telegram_text"]})
+    with profiler.stage("scoring", rows_in=len(candidates)) as stage:
+        regime = latest_regime(active_cfg)
+        expectancy = load_latest_expectancy(active_cfg)
+
+        incremental = incremental_enabled(active_cfg)
+        previous_state = load_incremental_state(active_cfg) if incremental else {}
+        holdings_hash = holdings_digest(holdings) if incremental else ""
+        expectancy_hash = digest(expectancy) if incremental else ""
+        entries: dict[str, dict] = {}
+        changed_keys: list[str] = []
+
+        recommendations_by_index: dict[int, dict] = {}
+        pending: list[tuple[int, str, str]] = []
+        for idx, candidate in enumerate(candidates):
+            candidate["regime"] = regime
+            key = instrument_key(candidate)
+            fingerprint = scoring_fingerprint(candidate, regime, holdings_hash, expectancy_hash) if incremental else ""
+            reused = reusable_entry(previous_state, key, fingerprint) if incremental and key else None
+            if reused:
+                candidate.update({field: reused["candidate"].get(field) for field in SCORED_FIELDS})
+                recommendations_by_index[idx] = reused["recommendation"]
+                entries[key] = {"fingerprint": fingerprint, "candidate": candidate, "recommendation": reused["recommendation"]}
+                continue
+            pending.append((idx, key, fingerprint))
 
-    bridge_paths = export_action_candidates_to_bridge(recommendations, active_cfg)
-    _update_baseline(active_cfg, candidates)
-    persisted = _persist(active_cfg, candidates, recommendations)
-    _notify(active_cfg, [row for row in recommendations if row.get("classification") != "IGNORE"])
+        scored = score_candidates([candidates[idx] for idx, _, _ in pending], holdings, regime, expectancy)
+        for (idx, key, fingerprint), result in zip(pending, scored):
+            candidate = candidates[idx]
+            opp_score = result["opportunity"]
+            defense_score = result["defense"]
+            classification = result["classification"]
+            candidate["opportunity_score"] = opp_score
+            candidate["defense_score"] = defense_score
+            candidate["classification"] = classification
+            rendered = render_recommendation(
+                candidate,
+                classification,
+                {"opportunity": opp_score, "defense": defense_score, "regime": regime},
+                cfg=active_cfg,
+            )
+            recommendation = {**rendered["json"], "telegram_text": rendered["telegram_text"]}
+            recommendations_by_index[idx] = recommendation
+            if incremental and key:
+                entries[key] = {"fingerprint": fingerprint, "candidate": candidate, "recommendation": recommendation}
+                changed_keys.append(key)
+        recommendations = [recommendations_by_index[idx] for idx in range(len(candidates))]
+        entries = {key: entries[key] for key in map(instrument_key, candidates) if key in entries}
+        stage["rows_out"] = len(recommendations)
+
+    with profiler.stage("bridge_export", rows_in=len(recommendations)) as stage:
+        bridge_paths = export_action_candidates_to_bridge(recommendations, active_cfg)
+        stage["rows_out"] = len(bridge_paths)
+    with profiler.stage("update_baseline", rows_in=len(candidates)):
+        _update_baseline(active_cfg, candidates)
+    with profiler.stage("persist", rows_in=len(recommendations)) as stage:
+        if delta_persistence(active_cfg):
+            persisted = persist_incremental(active_cfg, previous_state, entries, changed_keys, write_delta=True)
+            changed = set(changed_keys)
+            update_v2_view(
+                data_dir(active_cfg),
+                [candidate for candidate in candidates if instrument_key(candidate) in changed],
+                persisted["delta_path"],
+            )
+            stage["rows_out"] = len(changed_keys)
+        else:
+            persisted = _persist(active_cfg, candidates, recommendations)
+            if incremental:
+                persisted.update(persist_incremental(active_cfg, previous_state, entries, changed_keys, write_delta=False))
+            stage["rows_out"] = len(recommendations)
+        if history_enabled(active_cfg):
+            # Same run_id as recommendations_<stamp>.json, so the monthly evaluation counts the run once.
+            run_id = persisted.get("run_id") or datetime.now().strftime("%Y%m%d_%H%M")
+            persisted.update(append_run(active_cfg, run_id, candidates, recommendations))
+    notify_rows = [row for row in recommendations if row.get("classification") != "IGNORE"]
+    delta_state = load_delta_state(active_cfg) if delta_enabled(active_cfg) else None
+    delta = diff_recommendations(delta_state["entries"], recommendations) if delta_state is not None else None
+    if delta is not None:
+        notify_rows = notification_rows(delta, notify_rows)
+    with profiler.stage("notify", rows_in=len(notify_rows)):
+        unsent = _notify(active_cfg, notify_rows)
+    if delta_state is not None:
+        # Deltas that did not go out stay pending, so the next run offers them again.
+        save_delta_state(active_cfg, recommendations, delta_state["entries"], {instrument_key(row) for row in unsent})
     governor_runtime = active_cfg.get("_api_governor_runtime", {}) if isinstance(active_cfg.get("_api_governor_runtime"), dict) else {}
     governor_summary = {
         "selected_assets": len(selected_universe),
@@ -134,6 +232,7 @@ def run(cfg: dict | None = None) -> dict:
         governor_summary["minute_used"],
         governor_summary["mode"],
     )
+    profile_paths = profiler.finish({"selected_assets": len(selected_universe), "api_cost": governor_summary["api_cost"]})
     return {
         "status": "ok",
         "mapping_report": mapping_report,
@@ -142,15 +241,18 @@ def run(cfg: dict | None = None) -> dict:
         "recommendations": recommendations,
         "bridge_exported": bridge_paths,
         "governor_summary": governor_summary,
+        "profile": profile_paths,
+        "delta": delta["counts"] if delta is not None else None,
     }
 
 
 def _cli() -> None:
     parser = argparse.ArgumentParser(description="PortWächter V2 runner")
     parser.add_argument("command", choices=["run"])
+    parser.add_argument("--profile", action="store_true", help="dump a cProfile/pstats file for this run")
     args = parser.parse_args()
     if args.command == "run":
-        result = run()
+        result = run(profile=args.profile)
         print(
             json.dumps(
                 {
@@ -158,6 +260,7 @@ def _cli() -> None:
                     "persisted": result["persisted"],
                     "mapping_report": result["mapping_report"],
                     "governor_summary": result["governor_summary"],
+                    "profile": result["profile"],
                 },
                 ensure_ascii=False,
                 indent=2,
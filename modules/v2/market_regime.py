@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from modules.common.utils import read_json
+from modules.v2.config import root_dir
+
+
+def latest_regime(cfg: dict) -> str:
+    """Regime of the newest morning briefing, `neutral` when there is none."""
+    briefings = sorted((root_dir(cfg) / "data" / "briefings").glob("morning_*.json"))
+    if not briefings:
+        return "neutral"
+    briefing = read_json(briefings[-1])
+    return str((briefing.get("regime") or {}).get("regime") or "neutral")
@@ -8,6 +8,7 @@ from typing import Any
 from modules.common.utils import append_jsonl, ensure_dir, read_json
 from modules.v2.config import api_governor as api_governor_cfg
 from modules.v2.config import root_dir
+from modules.v2.marketdata.credential_pool import pool_limits
 
 
 def _minute_key(now_dt: datetime) -> str:
@@ -28,10 +29,16 @@ def _metrics_path(cfg: dict, now_dt: datetime | None = None) -> Path:
 
 
 def _hard_limit(cfg: dict) -> int:
+    limits = pool_limits(cfg)
+    if limits is not None:
+        return limits[1]
     return int(api_governor_cfg(cfg).get("minute_limit_hard", 55) or 55)
 
 
 def _soft_limit(cfg: dict) -> int:
+    limits = pool_limits(cfg)
+    if limits is not None:
+        return limits[0]
     return int(api_governor_cfg(cfg).get("minute_limit_soft", 45) or 45)
 
 
@@ -123,14 +130,28 @@ def current_mode(state: dict, cfg: dict, run_cost_used: int = 0) -> str:
     return "normal"
 
 
-def log_usage(event: dict, cfg: dict) -> None:
+def _usage_payload(event: dict, cfg: dict) -> dict:
     payload = {
         "timestamp": datetime.now().isoformat(),
         "provider": str(api_governor_cfg(cfg).get("provider") or "twelvedata"),
     }
     if isinstance(event, dict):
         payload.update({key: value for key, value in event.items() if key != "apikey"})
-    append_jsonl(_metrics_path(cfg), payload)
+    return payload
+
+
+def log_usage(event: dict, cfg: dict) -> None:
+    append_jsonl(_metrics_path(cfg), _usage_payload(event, cfg))
+
+
+def log_usage_many(events: list[dict], cfg: dict) -> None:
+    lines = [json.dumps(_usage_payload(event, cfg), ensure_ascii=False) for event in events or []]
+    if not lines:
+        return
+    path = _metrics_path(cfg)
+    ensure_dir(path.parent)
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
 
 
 def status_snapshot(cfg: dict) -> dict:
@@ -140,6 +161,14 @@ def status_snapshot(cfg: dict) -> dict:
         "minute_used": int(state.get("used_in_current_minute", 0) or 0),
         "minute_limit_hard": _hard_limit(cfg),
         "mode": current_mode(state, cfg),
+        "keys": {
+            name: {
+                "minute_used": int(entry.get("used_in_current_minute", 0) or 0) if entry.get("current_minute") == state.get("current_minute") else 0,
+                "cooldown_until": entry.get("cooldown_until"),
+            }
+            for name, entry in (state.get("keys") or {}).items()
+            if isinstance(entry, dict)
+        },
         "scanner_throttled": current_mode(state, cfg) != "normal",
         "v2_primary_provider": bool(api_governor_cfg(cfg).get("v2_primary_provider", True)),
         "disable_v1_twelvedata_when_v2_active": bool(
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from modules.v2.config import api_governor as api_governor_cfg
 from modules.v2.config import v2_marketdata
+from modules.v2.marketdata.batch_tuning import record_batch_samples, tune_batch_size, tuning_enabled
+from modules.v2.marketdata.credential_pool import (
+    load_credential_pool,
+    pick_credential,
+    record_credential_result,
+    reserve_credential,
+)
 from modules.v2.marketdata.fallback_router import get_quotes_with_fallback
+from modules.v2.marketdata.quote_cache import cached_quotes, store_quotes
 from modules.v2.marketdata.api_governor import (
     can_spend,
     current_mode,
     load_governor_state,
     log_usage,
+    log_usage_many,
     reserve_budget,
     reset_minute_if_needed,
     save_governor_state,
@@ -80,6 +91,7 @@ def _runtime_bucket(cfg: dict) -> dict:
         "holdings_count": 0,
         "scanner_count": 0,
         "selected_assets": 0,
+        "cache_hits": 0,
         "blocked_by_budget": False,
     }
     if not isinstance(cfg.get("_api_governor_runtime"), dict):
@@ -88,6 +100,28 @@ def _runtime_bucket(cfg: dict) -> dict:
     return cfg["_api_governor_runtime"]
 
 
+def _max_concurrent_batches(cfg: dict) -> int:
+    return max(int(v2_marketdata(cfg).get("max_concurrent_batches", 4) or 1), 1)
+
+
+def _dispatch_batches(plan: list[dict], cfg: dict) -> list[dict]:
+    def _fetch(entry: dict) -> dict:
+        started = time.monotonic()
+        rows = get_quotes_with_fallback(
+            entry["symbols"],
+            api_key=entry["credential"]["api_key"] if entry["use_twelvedata"] else None,
+            cfg=cfg,
+            live_fallback_limit=entry["live_fallback_limit"],
+        )
+        return {"rows": rows, "latency_ms": (time.monotonic() - started) * 1000.0}
+
+    workers = min(_max_concurrent_batches(cfg), len(plan))
+    if workers <= 1:
+        return [_fetch(entry) for entry in plan]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="v2-quotes") as pool:
+        return list(pool.map(_fetch, plan))
+
+
 def fetch_quotes_for_instruments(instruments: list[dict], cfg: dict, api_key: str | None = None) -> list[dict]:
     unique_symbols = _symbol_order(instruments)
     runtime = _runtime_bucket(cfg)
@@ -99,16 +133,31 @@ def fetch_quotes_for_instruments(instruments: list[dict], cfg: dict, api_key: st
     state = reset_minute_if_needed(load_governor_state(cfg), datetime.now())
     per_run_budget = int(governor.get("per_run_budget", 20) or 20)
     batch_only = bool(governor.get("batch_only", True))
+    pool = load_credential_pool(cfg, api_key=api_key)
     run_cost = 0
 
+    cached = cached_quotes(unique_symbols, cfg, consumer="scanner")
+    runtime["cache_hits"] = len(cached)
+    fetch_symbols = [symbol for symbol in unique_symbols if symbol not in cached]
+
     batch_size = int(v2_marketdata(cfg).get("batch_size", 8) or 8)
-    quotes: list[dict] = []
-    for batch in _chunks(unique_symbols, batch_size):
+    tuning_events: list[dict] = []
+    if cfg.get("_pinned_batch_size"):
+        # A sharded run tunes once in the parent; shards only apply that size and record samples.
+        batch_size = int(cfg["_pinned_batch_size"])
+    elif tuning_enabled(cfg):
+        batch_size, adjustment = tune_batch_size(state, cfg)
+        tuning_events = [adjustment] if adjustment else []
+    plan: list[dict] = []
+    for batch in _chunks(fetch_symbols, batch_size):
         mode = current_mode(state, cfg, run_cost_used=run_cost)
-        use_twelvedata = bool(api_key)
+        credential = pick_credential(pool, state, 1, cfg) if pool else None
+        use_twelvedata = credential is not None
         if bool(governor.get("enabled", True)) and (run_cost >= per_run_budget or not can_spend(state, 1, cfg)):
             use_twelvedata = False
             mode = _merge_mode(mode, "blocked" if not can_spend(state, 1, cfg) else "degraded")
+        elif pool and credential is None:
+            mode = _merge_mode(mode, "degraded")
         runtime["mode"] = _merge_mode(str(runtime.get("mode") or "normal"), mode)
 
         live_fallback_limit = None
@@ -116,41 +165,61 @@ def fetch_quotes_for_instruments(instruments: list[dict], cfg: dict, api_key: st
             runtime["blocked_by_budget"] = True
             live_fallback_limit = 0
 
+        key_used = None
         if use_twelvedata and bool(governor.get("enabled", True)):
             state = reserve_budget(state, 1, cfg)
+            key_used = reserve_credential(state, credential, 1)
             run_cost += 1
             runtime["api_cost"] = run_cost
 
-        rows = get_quotes_with_fallback(
-            batch,
-            api_key=api_key if use_twelvedata else None,
-            cfg=cfg,
-            live_fallback_limit=live_fallback_limit,
-        )
-        quotes.extend(rows)
         runtime["minute_used"] = int(state.get("used_in_current_minute", 0) or 0)
-        log_usage(
+        plan.append(
             {
-                "kind": "quote_batch",
-                "symbols_count": len(batch),
-                "cost": 1 if use_twelvedata and bool(governor.get("enabled", True)) else 0,
-                "used_in_minute_after": runtime["minute_used"],
-                "mode": runtime["mode"],
-            },
-            cfg,
+                "symbols": batch,
+                "use_twelvedata": use_twelvedata,
+                "credential": credential,
+                "live_fallback_limit": live_fallback_limit,
+                "usage": {
+                    "kind": "quote_batch",
+                    "symbols_count": len(batch),
+                    "batch_size": batch_size,
+                    "cost": 1 if use_twelvedata and bool(governor.get("enabled", True)) else 0,
+                    "key": credential["name"] if use_twelvedata else None,
+                    "key_used_in_minute_after": key_used,
+                    "used_in_minute_after": runtime["minute_used"],
+                    "mode": runtime["mode"],
+                },
+            }
         )
-    by_symbol = {row.get("symbol"): row for row in quotes}
+
+    quotes: list[dict] = []
+    samples: list[dict] = []
+    for entry, result in zip(plan, _dispatch_batches(plan, cfg)):
+        rows = result["rows"]
+        if entry["use_twelvedata"]:
+            record_credential_result(state, entry["credential"]["name"], rows, cfg)
+            samples.append({**result, "size": batch_size})
+        quotes.extend(rows)
+    if tuning_enabled(cfg):
+        record_batch_samples(state, samples, cfg)
+    log_usage_many(tuning_events + [entry["usage"] for entry in plan], cfg)
+    by_symbol = {**cached, **{row.get("symbol"): row for row in quotes}}
 
     if not batch_only:
         retry_symbols = _retry_candidates(instruments, by_symbol, cfg)
         for symbol in retry_symbols:
             mode = current_mode(state, cfg, run_cost_used=run_cost)
-            if bool(governor.get("enabled", True)) and (run_cost >= per_run_budget or not can_spend(state, 1, cfg)):
+            credential = pick_credential(pool, state, 1, cfg) if pool else None
+            if bool(governor.get("enabled", True)) and (run_cost >= per_run_budget or not can_spend(state, 1, cfg) or (pool and credential is None)):
                 runtime["mode"] = _merge_mode(str(runtime.get("mode") or "normal"), _merge_mode(mode, "degraded"))
                 break
-            retry_rows = get_quotes_with_fallback([symbol], api_key=api_key, cfg=cfg, live_fallback_limit=1)
+            retry_rows = get_quotes_with_fallback([symbol], api_key=credential["api_key"] if credential else None, cfg=cfg, live_fallback_limit=1)
+            if credential:
+                record_credential_result(state, credential["name"], retry_rows, cfg)
             if bool(governor.get("enabled", True)):
                 state = reserve_budget(state, 1, cfg)
+                if credential:
+                    reserve_credential(state, credential, 1)
                 run_cost += 1
                 runtime["api_cost"] = run_cost
                 runtime["minute_used"] = int(state.get("used_in_current_minute", 0) or 0)
@@ -159,6 +228,7 @@ def fetch_quotes_for_instruments(instruments: list[dict], cfg: dict, api_key: st
                         "kind": "quote_retry",
                         "symbols_count": 1,
                         "cost": 1,
+                        "key": credential["name"] if credential else None,
                         "used_in_minute_after": runtime["minute_used"],
                         "mode": runtime["mode"],
                     },
@@ -169,9 +239,15 @@ def fetch_quotes_for_instruments(instruments: list[dict], cfg: dict, api_key: st
 
     runtime["minute_used"] = int(state.get("used_in_current_minute", 0) or 0)
     save_governor_state(state, cfg)
+    store_quotes(
+        [row for symbol, row in by_symbol.items() if symbol not in cached],
+        cfg,
+        isin_by_symbol={str(item.get("symbol") or "").strip().upper(): item.get("isin") for item in instruments if item.get("isin")},
+    )
     log.warning(
-        "v2_batch_governor: selected_assets=%s api_cost=%s minute_used=%s mode=%s",
+        "v2_batch_governor: selected_assets=%s cache_hits=%s api_cost=%s minute_used=%s mode=%s",
         runtime["selected_assets"],
+        runtime["cache_hits"],
         runtime["api_cost"],
         runtime["minute_used"],
         runtime["mode"],
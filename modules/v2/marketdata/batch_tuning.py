@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from modules.v2.config import v2_marketdata
+from modules.v2.marketdata.credential_pool import provider_error_code
+
+RATE_LIMIT_CODE = 429
+
+
+def tuning_cfg(cfg: dict) -> dict[str, Any]:
+    settings = v2_marketdata(cfg).get("adaptive_batch", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def tuning_enabled(cfg: dict) -> bool:
+    return bool(tuning_cfg(cfg).get("enabled", False))
+
+
+def history_size(cfg: dict) -> int:
+    return int(tuning_cfg(cfg).get("history_size", 60) or 60)
+
+
+def _bounds(cfg: dict) -> tuple[int, int]:
+    settings = tuning_cfg(cfg)
+    low = max(int(settings.get("min_size", 2) or 2), 2)
+    high = max(int(settings.get("max_size", 32) or 32), low)
+    return low, high
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def tune_batch_size(state: dict, cfg: dict) -> tuple[int, dict | None]:
+    """Pick this run's batch size from the persisted batch history: halve on errors, grow while fast and clean.
+
+    Returns the size and, when it changed, a usage-log event describing the adjustment.
+    """
+    settings = tuning_cfg(cfg)
+    low, high = _bounds(cfg)
+    tuning = state.setdefault("batch_tuning", {"size": None, "samples": []})
+    configured = int(v2_marketdata(cfg).get("batch_size", 8) or 8)
+    current = min(max(int(tuning.get("size") or configured), low), high)
+    window = int(settings.get("window", 20) or 20)
+    samples = [row for row in tuning.get("samples", []) if isinstance(row, dict) and int(row.get("size", 0) or 0) == current][-window:]
+    min_samples = int(settings.get("min_samples", 3) or 3)
+
+    size, reason = current, None
+    symbols = sum(int(row.get("symbols", 0) or 0) for row in samples)
+    error_rate = sum(int(row.get("errors", 0) or 0) for row in samples) / symbols if symbols else 0.0
+    latency = _median([float(row.get("latency_ms", 0) or 0) for row in samples]) if samples else 0.0
+    if any(row.get("rate_limited") for row in samples[-min_samples:]):
+        size, reason = max(current // 2, low), "rate_limited"
+    elif len(samples) >= min_samples and error_rate > float(settings.get("max_error_rate", 0.2) or 0.2):
+        size, reason = max(current // 2, low), "error_rate"
+    elif (
+        len(samples) >= min_samples
+        and error_rate <= float(settings.get("max_error_rate", 0.2) or 0.2) / 2
+        and latency <= float(settings.get("target_latency_ms", 2500) or 2500)
+    ):
+        size, reason = min(current + int(settings.get("step", 2) or 2), high), "fast_and_clean"
+
+    tuning["size"] = size
+    if size == current:
+        return size, None
+    # Samples describe the old size; the new size starts collecting its own evidence.
+    return size, {
+        "kind": "batch_size_adjust",
+        "from_size": current,
+        "to_size": size,
+        "reason": reason,
+        "samples": len(samples),
+        "error_rate": round(error_rate, 4),
+        "latency_p50_ms": round(latency, 1),
+        "cost": 0,
+    }
+
+
+def record_batch_samples(state: dict, results: list[dict], cfg: dict, now_dt: datetime | None = None) -> None:
+    """Append one sample per TwelveData batch (size, latency, failed symbols) and trim to `history_size`."""
+    tuning = state.setdefault("batch_tuning", {"size": None, "samples": []})
+    stamp = (now_dt or datetime.now()).isoformat(timespec="seconds")
+    samples = list(tuning.get("samples", []))
+    for result in results:
+        rows = result["rows"]
+        failed = [row for row in rows if not (row.get("status") == "ok" and row.get("provider") == "twelvedata")]
+        errors = [str(row.get("primary_error") or row.get("error") or "") for row in failed]
+        samples.append(
+            {
+                "ts": stamp,
+                "size": result["size"],
+                "symbols": len(rows),
+                "errors": len(failed),
+                "rate_limited": any(provider_error_code(error) == RATE_LIMIT_CODE for error in errors),
+                "latency_ms": round(float(result["latency_ms"]), 1),
+            }
+        )
+    tuning["samples"] = samples[-history_size(cfg) :]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+
+from modules.v2.config import api_governor as api_governor_cfg
+from modules.v2.config import resolve_env_value
+
+DEFAULT_KEY_NAME = "default"
+AUTH_ERROR_CODES = {401, 403, 429}
+ERROR_CODE_RE = re.compile(r"^http_(\d{3})")
+
+
+def _minute_key(now_dt: datetime) -> str:
+    return now_dt.strftime("%Y-%m-%dT%H:%M")
+
+
+def credential_settings(cfg: dict) -> list[dict]:
+    rows = api_governor_cfg(cfg).get("credentials")
+    return [row for row in rows if isinstance(row, dict)] if isinstance(rows, list) else []
+
+
+def provider_error_code(error: object) -> int | None:
+    """HTTP-style code of a provider error (`http_429:...`), whether it came from the status line or the body."""
+    match = ERROR_CODE_RE.match(str(error or ""))
+    return int(match.group(1)) if match else None
+
+
+def load_credential_pool(cfg: dict, api_key: str | None = None) -> list[dict]:
+    """Resolve configured TwelveData keys; without `api_governor.credentials` the single run key forms the pool."""
+    governor = api_governor_cfg(cfg)
+    soft = int(governor.get("minute_limit_soft", 45) or 45)
+    hard = int(governor.get("minute_limit_hard", 55) or 55)
+    pool: list[dict] = []
+    for idx, row in enumerate(credential_settings(cfg)):
+        secret = resolve_env_value(cfg, str(row.get("env") or "")) if row.get("env") else None
+        if not secret:
+            continue
+        pool.append(
+            {
+                "name": str(row.get("name") or f"key{idx + 1}"),
+                "api_key": secret,
+                "minute_limit_soft": int(row.get("minute_limit_soft", soft) or soft),
+                "minute_limit_hard": int(row.get("minute_limit_hard", hard) or hard),
+            }
+        )
+    if not pool and api_key:
+        pool.append({"name": DEFAULT_KEY_NAME, "api_key": api_key, "minute_limit_soft": soft, "minute_limit_hard": hard})
+    return pool
+
+
+def pool_limits(cfg: dict) -> tuple[int, int] | None:
+    """Summed soft/hard minute limits of the configured keys that resolved, or None when none did."""
+    pool = load_credential_pool(cfg)
+    if not pool:
+        return None
+    return (
+        sum(int(row["minute_limit_soft"]) for row in pool),
+        sum(int(row["minute_limit_hard"]) for row in pool),
+    )
+
+
+def key_state(state: dict, name: str, now_dt: datetime | None = None) -> dict:
+    keys = state.setdefault("keys", {})
+    entry = keys.setdefault(name, {"current_minute": None, "used_in_current_minute": 0, "consecutive_failures": 0, "cooldown_until": None})
+    minute = _minute_key(now_dt or datetime.now())
+    if entry.get("current_minute") != minute:
+        entry["current_minute"] = minute
+        entry["used_in_current_minute"] = 0
+    return entry
+
+
+def _healthy(entry: dict, now_dt: datetime) -> bool:
+    until = entry.get("cooldown_until")
+    if not until:
+        return True
+    try:
+        return datetime.fromisoformat(str(until)) <= now_dt
+    except ValueError:
+        return True
+
+
+def headroom(credential: dict, state: dict, now_dt: datetime | None = None) -> int:
+    entry = key_state(state, credential["name"], now_dt)
+    return max(int(credential["minute_limit_hard"]) - int(entry.get("used_in_current_minute", 0) or 0), 0)
+
+
+def pick_credential(pool: list[dict], state: dict, cost: int, cfg: dict, now_dt: datetime | None = None) -> dict | None:
+    """Healthy key with the most headroom that can still absorb `cost`; ties keep configuration order."""
+    ref = now_dt or datetime.now()
+    enforce = bool(api_governor_cfg(cfg).get("enabled", True))
+    best: dict | None = None
+    best_room = -1
+    for credential in pool:
+        if not _healthy(key_state(state, credential["name"], ref), ref):
+            continue
+        room = headroom(credential, state, ref)
+        if enforce and room < cost:
+            continue
+        if room > best_room:
+            best, best_room = credential, room
+    return best
+
+
+def reserve_credential(state: dict, credential: dict, cost: int, now_dt: datetime | None = None) -> int:
+    entry = key_state(state, credential["name"], now_dt)
+    entry["used_in_current_minute"] = int(entry.get("used_in_current_minute", 0) or 0) + max(int(cost), 0)
+    return entry["used_in_current_minute"]
+
+
+def record_credential_result(state: dict, name: str, rows: list[dict], cfg: dict, now_dt: datetime | None = None) -> None:
+    """Track key health: auth/rate-limit failures on a whole batch put the key on cooldown after a few strikes."""
+    ref = now_dt or datetime.now()
+    entry = key_state(state, name, ref)
+    errors = [
+        str(row.get("primary_error") or row.get("error") or "")
+        for row in rows
+        if isinstance(row, dict) and not (row.get("status") == "ok" and row.get("provider", "twelvedata") == "twelvedata")
+    ]
+    failed = bool(rows) and len(errors) == len(rows) and all(provider_error_code(error) in AUTH_ERROR_CODES for error in errors)
+    if not failed:
+        entry["consecutive_failures"] = 0
+        return
+    entry["consecutive_failures"] = int(entry.get("consecutive_failures", 0) or 0) + 1
+    governor = api_governor_cfg(cfg)
+    if entry["consecutive_failures"] >= int(governor.get("key_failure_threshold", 2) or 2):
+        cooldown = int(governor.get("key_cooldown_sec", 300) or 300)
+        entry["cooldown_until"] = (ref + timedelta(seconds=cooldown)).isoformat(timespec="seconds")
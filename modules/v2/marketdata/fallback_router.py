@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import json
-from pathlib import Path
-
+from modules.common.latest_quotes import load_marketdata_view, lookup_latest
 from modules.marketdata_watcher.adapter_http import fetch_stooq_latest
 from modules.v2.config import load_v2_config, root_dir, v2_marketdata
 from modules.v2.marketdata.provider_twelvedata import get_quote, get_quotes_batch
+from modules.v2.marketdata.quote_cache import cached_quotes, store_quotes
 
 
 def _to_float(value: object) -> float | None:
@@ -31,19 +30,8 @@ def _empty_quote(symbol: str) -> dict:
     return {"symbol": str(symbol or "").strip().upper(), "price": None, "percent_change": None, "volume": None, "timestamp": None, "status": "error", "provider": "none"}
 
 
-def _latest_marketdata_rows(cfg: dict) -> list[dict]:
-    market_dir = root_dir(cfg) / "data" / "marketdata"
-    latest = sorted(market_dir.glob("quotes_*.jsonl"))
-    if not latest:
-        return []
-    rows: list[dict] = []
-    with latest[-1].open("r", encoding="utf-8") as fh:
-        for line in fh:
-            try:
-                rows.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
-    return rows
+def _latest_marketdata_view(cfg: dict) -> dict:
+    return load_marketdata_view(root_dir(cfg) / "data" / "marketdata")
 
 
 def _normalize_stooq(symbol: str, raw: dict, provider: str) -> dict:
@@ -68,15 +56,12 @@ def _normalize_stooq(symbol: str, raw: dict, provider: str) -> dict:
     }
 
 
-def _find_cached(symbol: str, rows: list[dict]) -> dict | None:
-    want = _stooq_symbol(symbol)
-    for row in reversed(rows):
-        if str(row.get("symbol") or "").lower() != want:
-            continue
-        if row.get("status") != "ok":
-            continue
-        return _normalize_stooq(symbol, row, provider="fallback")
-    return None
+def _find_cached(symbol: str, view: dict) -> dict | None:
+    row = lookup_latest(view, _stooq_symbol(symbol))
+    if row is None or row.get("status") != "ok":
+        return None
+    # Marked so the quote cache does not re-stamp an old file row as fresh.
+    return {**_normalize_stooq(symbol, row, provider="fallback"), "from_file_cache": True}
 
 
 def get_quote_with_fallback(
@@ -108,36 +93,47 @@ def get_quotes_with_fallback(
     if not requested:
         return []
 
+    # The scanner path consults and fills the cache in batch_quotes, where the governor budget lives.
+    cache_hits = {} if context == "scanner" else cached_quotes(requested, active_cfg, consumer=context)
+    pending = [symbol for symbol in requested if symbol not in cache_hits]
     td_quotes = (
         {
             row["symbol"]: {**row, "provider": "twelvedata"}
-            for row in get_quotes_batch(requested, api_key or "", cfg=active_cfg, context=context)
+            for row in get_quotes_batch(pending, api_key or "", cfg=active_cfg, context=context)
         }
-        if api_key
+        if api_key and pending
         else {}
     )
-    cached_rows = _latest_marketdata_rows(active_cfg)
+    cached_view = _latest_marketdata_view(active_cfg) if pending else {}
     live_budget = live_fallback_limit
     if live_budget is None:
         live_budget = int(v2_marketdata(active_cfg).get("max_live_fallback_symbols", 20))
 
     resolved: list[dict] = []
     for symbol in requested:
+        if symbol in cache_hits:
+            resolved.append(cache_hits[symbol])
+            continue
+
         td_row = td_quotes.get(symbol)
         if td_row and td_row.get("status") == "ok":
             resolved.append(td_row)
             continue
 
-        cached = _find_cached(symbol, cached_rows)
+        # Keep the Twelve Data failure next to the fallback row so key health can still see it.
+        primary = {"primary_error": td_row.get("error")} if td_row else {}
+        cached = _find_cached(symbol, cached_view)
         if cached:
-            resolved.append(cached)
+            resolved.append({**cached, **primary})
             continue
 
         if live_budget <= 0:
-            resolved.append(_empty_quote(symbol))
+            resolved.append({**_empty_quote(symbol), **primary})
             continue
 
         live_budget -= 1
         live = _normalize_stooq(symbol, fetch_stooq_latest(_stooq_symbol(symbol)), provider="fallback")
-        resolved.append(live if live.get("status") == "ok" else _empty_quote(symbol))
+        resolved.append({**(live if live.get("status") == "ok" else _empty_quote(symbol)), **primary})
+    if context != "scanner":
+        store_quotes([row for row in resolved if row.get("symbol") not in cache_hits], active_cfg)
     return resolved
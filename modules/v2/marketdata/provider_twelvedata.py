@@ -6,6 +6,7 @@ from urllib import parse, request
 from urllib.error import HTTPError, URLError
 
 from modules.v2.config import api_governor as api_governor_cfg
+from modules.v2.config import v2_marketdata
 from modules.v2.marketdata.api_governor import log_usage
 
 API_URL = "https://api.twelvedata.com/quote"
@@ -54,9 +55,17 @@ def _error_quote(symbol: str, message: str) -> dict:
     }
 
 
-def _request_quotes(symbols: list[str], api_key: str, timeout_sec: int = 10) -> object:
+def _body_error(raw: dict) -> str:
+    """TwelveData reports quota and auth errors as HTTP 200 with `{"status": "error", "code": 429}`; keep the
+    code in the same `http_<code>` form as transport errors so key health and batch tuning see it."""
+    message = str(raw.get("message") or raw.get("error") or "provider_error")
+    code = _to_int(raw.get("code"))
+    return f"http_{code}:{message[:80]}" if code else message
+
+
+def _request_quotes(symbols: list[str], api_key: str, timeout_sec: int = 10, api_url: str = API_URL) -> object:
     query = parse.urlencode({"symbol": ",".join(symbols), "apikey": api_key})
-    req = request.Request(f"{API_URL}?{query}", headers=REQUEST_HEADERS, method="GET")
+    req = request.Request(f"{api_url}?{query}", headers=REQUEST_HEADERS, method="GET")
     with request.urlopen(req, timeout=timeout_sec) as response:
         return json.loads(response.read().decode("utf-8"))
 
@@ -93,7 +102,7 @@ def _batch_only_blocked(symbols: list[str], cfg: dict | None, context: str) -> b
 def normalize_quote(raw: dict) -> dict:
     symbol = str(raw.get("meta_symbol") or raw.get("symbol") or "").strip().upper()
     if not raw or raw.get("status") == "error":
-        return _error_quote(symbol, str(raw.get("message") or raw.get("error") or "provider_error"))
+        return _error_quote(symbol, _body_error(raw or {}))
 
     price = _to_float(raw.get("close") or raw.get("price"))
     if price is None:
@@ -128,7 +137,13 @@ def get_quotes_batch(symbols: list[str], api_key: str, *, cfg: dict | None = Non
 
     api_map = {_api_symbol(symbol): symbol for symbol in requested}
     try:
-        payload = _request_quotes(list(api_map.keys()), api_key)
+        marketdata = v2_marketdata(cfg or {})
+        payload = _request_quotes(
+            list(api_map.keys()),
+            api_key,
+            timeout_sec=int(marketdata.get("timeout_sec", 10) or 10),
+            api_url=str(marketdata.get("quote_url") or API_URL),
+        )
     except HTTPError as exc:
         detail = exc.read().decode("utf-8", errors="ignore") if exc.fp else ""
         return [_error_quote(symbol, f"http_{exc.code}:{detail[:80]}") for symbol in requested]
@@ -137,6 +152,9 @@ def get_quotes_batch(symbols: list[str], api_key: str, *, cfg: dict | None = Non
     except Exception as exc:
         return [_error_quote(symbol, str(exc)) for symbol in requested]
 
+    if isinstance(payload, dict) and payload.get("status") == "error":
+        return [_error_quote(symbol, _body_error(payload)) for symbol in requested]
+
     rows = _flatten_payload(payload)
     by_symbol: dict[str, dict] = {}
     for row in rows:
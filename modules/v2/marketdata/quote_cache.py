@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from modules.common.utils import ensure_dir, read_json
+from modules.v2.config import quote_cache as quote_cache_cfg
+from modules.v2.config import root_dir
+
+DEFAULT_TTL_SEC = 900
+DEFAULT_POLICY = {"max_age_sec": DEFAULT_TTL_SEC, "accept_quality": ["live", "fallback"]}
+DEFAULT_POLICIES: dict[str, dict[str, Any]] = {
+    "scanner": {"max_age_sec": 600, "accept_quality": ["live"]},
+    "manual": {"max_age_sec": 300, "accept_quality": ["live"]},
+    "premarket": {"max_age_sec": 900, "accept_quality": ["live", "fallback"]},
+    "bridge": {"max_age_sec": 900, "accept_quality": ["live", "fallback"]},
+    "telegram": {"max_age_sec": 900, "accept_quality": ["live", "fallback"]},
+}
+
+
+def _cache_path(cfg: dict) -> Path:
+    rel = str(quote_cache_cfg(cfg).get("path") or "data/v2/quote_cache.json")
+    path = Path(rel)
+    return path if path.is_absolute() else root_dir(cfg) / path
+
+
+def _enabled(cfg: dict) -> bool:
+    return bool(quote_cache_cfg(cfg).get("enabled", True))
+
+
+def _default_cache() -> dict[str, Any]:
+    return {"entries": {}, "isins": {}}
+
+
+def _atomic_write_json(path: Path, payload: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def _key(value: object) -> str:
+    return str(value or "").strip().upper()
+
+
+def _quality(quote: dict) -> str:
+    provider = str(quote.get("provider") or "").strip().lower()
+    return "live" if provider == "twelvedata" else "fallback"
+
+
+def _ttl_sec(cfg: dict, source: str) -> int:
+    settings = quote_cache_cfg(cfg)
+    by_source = settings.get("ttl_by_source") if isinstance(settings.get("ttl_by_source"), dict) else {}
+    return int(by_source.get(source, settings.get("ttl_sec", DEFAULT_TTL_SEC)) or DEFAULT_TTL_SEC)
+
+
+def _age_sec(entry: dict, now_dt: datetime) -> float | None:
+    try:
+        cached_at = datetime.fromisoformat(str(entry.get("cached_at") or ""))
+    except ValueError:
+        return None
+    return (now_dt - cached_at).total_seconds()
+
+
+def consumer_policy(cfg: dict, consumer: str) -> dict[str, Any]:
+    policy = dict(DEFAULT_POLICIES.get(consumer, DEFAULT_POLICY))
+    configured = quote_cache_cfg(cfg).get("consumers")
+    if isinstance(configured, dict) and isinstance(configured.get(consumer), dict):
+        policy.update(configured[consumer])
+    return policy
+
+
+def load_quote_cache(cfg: dict) -> dict[str, Any]:
+    path = _cache_path(cfg)
+    if not path.exists():
+        return _default_cache()
+    try:
+        payload = read_json(path)
+    except Exception:
+        return _default_cache()
+    if not isinstance(payload, dict):
+        return _default_cache()
+    cache = _default_cache()
+    cache["entries"] = payload.get("entries") if isinstance(payload.get("entries"), dict) else {}
+    cache["isins"] = payload.get("isins") if isinstance(payload.get("isins"), dict) else {}
+    return cache
+
+
+def save_quote_cache(cache: dict, cfg: dict) -> None:
+    _atomic_write_json(_cache_path(cfg), {"entries": cache.get("entries", {}), "isins": cache.get("isins", {})})
+
+
+def _prune(cache: dict, now_dt: datetime) -> None:
+    entries = cache.get("entries", {})
+    for symbol, entry in list(entries.items()):
+        age = _age_sec(entry, now_dt) if isinstance(entry, dict) else None
+        if age is None or age > int(entry.get("ttl_sec", DEFAULT_TTL_SEC) or DEFAULT_TTL_SEC):
+            entries.pop(symbol, None)
+    cache["isins"] = {isin: symbol for isin, symbol in cache.get("isins", {}).items() if symbol in entries}
+
+
+def store_quotes(
+    quotes: list[dict],
+    cfg: dict,
+    isin_by_symbol: dict[str, str] | None = None,
+    now_dt: datetime | None = None,
+) -> int:
+    if not _enabled(cfg):
+        return 0
+    ref = now_dt or datetime.now()
+    cache = load_quote_cache(cfg)
+    stored = 0
+    for quote in quotes or []:
+        if not isinstance(quote, dict) or quote.get("status") != "ok" or quote.get("from_file_cache"):
+            continue
+        symbol = _key(quote.get("symbol"))
+        if not symbol:
+            continue
+        source = str(quote.get("provider") or "unknown")
+        cache["entries"][symbol] = {
+            "quote": {key: value for key, value in quote.items() if key != "cache_age_sec"},
+            "source": source,
+            "quality": _quality(quote),
+            "cached_at": ref.isoformat(),
+            "ttl_sec": _ttl_sec(cfg, source),
+        }
+        isin = _key((isin_by_symbol or {}).get(symbol))
+        if isin:
+            cache["isins"][isin] = symbol
+        stored += 1
+    _prune(cache, ref)
+    save_quote_cache(cache, cfg)
+    return stored
+
+
+def cached_quotes(
+    keys: list[str],
+    cfg: dict,
+    consumer: str = "scanner",
+    now_dt: datetime | None = None,
+    cache: dict | None = None,
+) -> dict[str, dict]:
+    """Return fresh cached quotes for symbols or ISINs, keyed by the requested value."""
+    if not _enabled(cfg):
+        return {}
+    ref = now_dt or datetime.now()
+    active = cache if cache is not None else load_quote_cache(cfg)
+    policy = consumer_policy(cfg, consumer)
+    max_age = int(policy.get("max_age_sec", DEFAULT_TTL_SEC) or 0)
+    accepted = {str(value) for value in policy.get("accept_quality", [])}
+    out: dict[str, dict] = {}
+    for raw in keys or []:
+        needle = _key(raw)
+        symbol = needle if needle in active["entries"] else active["isins"].get(needle)
+        entry = active["entries"].get(symbol) if symbol else None
+        if not isinstance(entry, dict) or str(entry.get("quality") or "") not in accepted:
+            continue
+        age = _age_sec(entry, ref)
+        if age is None or age < 0 or age > min(max_age, int(entry.get("ttl_sec", DEFAULT_TTL_SEC) or 0)):
+            continue
+        out[needle] = {**dict(entry.get("quote") or {}), "cache_age_sec": int(age)}
+    return out
+
+
+def fresh_quote_map(cfg: dict, consumer: str, now_dt: datetime | None = None) -> dict[str, dict]:
+    """Return every fresh cached quote keyed by symbol and, where known, by ISIN."""
+    if not _enabled(cfg):
+        return {}
+    cache = load_quote_cache(cfg)
+    keys = list(cache["entries"].keys()) + list(cache["isins"].keys())
+    return cached_quotes(keys, cfg, consumer=consumer, now_dt=now_dt, cache=cache)
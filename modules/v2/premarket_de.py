@@ -4,6 +4,7 @@ import argparse
 
 from modules.performance.notifier import send_performance_text
 from modules.v2.telegram.copy import candidate_name, classification_label, display_name, market_label, premarket_priority, premarket_section_title, short_name
+from modules.v2.premarket_warm import load_warm_rows
 from modules.v2.telegram.help import load_latest_recommendations as _load_latest_recommendations
 
 EU_COUNTRIES = {
@@ -28,7 +29,8 @@ ALLOWED_LABELS = {"KAUFEN PRUEFEN", "VERKAUFEN PRUEFEN", "RISIKO REDUZIEREN"}
 
 
 def load_latest_recommendations(cfg: dict) -> list[dict]:
-    return _load_latest_recommendations(cfg)
+    warm = load_warm_rows(cfg, "de")
+    return warm if warm is not None else _load_latest_recommendations(cfg)
 
 
 def _score_value(candidate: dict) -> float:
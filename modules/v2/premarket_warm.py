@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from modules.common.utils import ensure_dir, read_json
+from modules.v2.config import data_dir, load_v2_config
+from modules.v2.market_regime import latest_regime
+from modules.v2.telegram.copy import classification_label
+from modules.v2.telegram.help import latest_recommendations_run, load_latest_recommendations
+
+MARKETS = ("de", "us")
+
+
+def premarket_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("premarket", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def warm_path(cfg: dict, market: str, now_dt: datetime | None = None) -> Path:
+    stamp = (now_dt or datetime.now()).strftime("%Y%m%d")
+    return data_dir(cfg) / "premarket" / f"warm_{market}_{stamp}.json"
+
+
+def _atomic_write_json(path: Path, payload: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def _relevance(market: str) -> tuple[Callable[[dict], bool], set[str]]:
+    if market == "de":
+        from modules.v2.premarket_de import ALLOWED_LABELS, _de_relevant
+
+        return _de_relevant, ALLOWED_LABELS
+    from modules.v2.premarket_us import ALLOWED_LABELS, _us_relevant
+
+    return _us_relevant, ALLOWED_LABELS
+
+
+def premarket_universe(recommendations: list[dict], market: str) -> list[dict]:
+    relevant, allowed = _relevance(market)
+    return [
+        row
+        for row in recommendations
+        if str(row.get("classification") or "").upper() != "IGNORE"
+        and relevant(row)
+        and classification_label(row.get("classification"), row) in allowed
+    ]
+
+
+def warm_premarket(cfg: dict, market: str, now_dt: datetime | None = None) -> dict:
+    """Resolve the premarket rows and the briefing regime once and store a render-ready payload.
+
+    The premarket texts only use names, classification and regime, so no quotes are fetched here. The
+    payload records the v2 run it was built from; a newer run makes it stale.
+    """
+    ref = now_dt or datetime.now()
+    source_run = latest_recommendations_run(cfg)
+    rows = premarket_universe(load_latest_recommendations(cfg), market)
+    regime = latest_regime(cfg)
+    warm_rows = [{**row, "regime": regime} for row in rows]
+
+    path = warm_path(cfg, market, ref)
+    _atomic_write_json(
+        path,
+        {
+            "generated_at": ref.isoformat(timespec="seconds"),
+            "market": market,
+            "source_run": source_run,
+            "regime": regime,
+            "recommendations": warm_rows,
+        },
+    )
+    return {"path": str(path), "rows": len(warm_rows), "regime": regime}
+
+
+def load_warm_rows(cfg: dict, market: str, now_dt: datetime | None = None) -> list[dict] | None:
+    """Rows prepared by the pre-warm job, or None when it did not run today, is older than `warm_max_age_min`
+    or a newer v2 run has replaced the recommendations it was built from."""
+    ref = now_dt or datetime.now()
+    path = warm_path(cfg, market, ref)
+    if not path.exists():
+        return None
+    try:
+        payload = read_json(path)
+        generated = datetime.fromisoformat(str(payload.get("generated_at") or ""))
+    except Exception:
+        return None
+    max_age_min = float(premarket_cfg(cfg).get("warm_max_age_min", 45) or 45)
+    if not 0 <= (ref - generated).total_seconds() <= max_age_min * 60:
+        return None
+    if payload.get("source_run") != latest_recommendations_run(cfg):
+        return None
+    rows = payload.get("recommendations")
+    return rows if isinstance(rows, list) else None
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(description="CB Fund Desk premarket pre-warm")
+    parser.add_argument("market", choices=list(MARKETS))
+    args = parser.parse_args()
+    print(json.dumps(warm_premarket(load_v2_config(), args.market), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import math
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+from modules.common.utils import append_jsonl, ensure_dir
+from modules.v2.config import load_v2_config, root_dir
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+METRICS = ("wall_sec", "cpu_sec", "peak_rss_delta_kb", "io_read_bytes", "io_written_bytes")
+
+
+def profiling_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("profiling", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def profiling_enabled(cfg: dict) -> bool:
+    return bool(profiling_cfg(cfg).get("enabled", True))
+
+
+def profile_dir(cfg: dict) -> Path:
+    path = Path(str(profiling_cfg(cfg).get("dir") or "data/v2/profiles"))
+    return path if path.is_absolute() else root_dir(cfg) / path
+
+
+def _peak_rss_kb() -> int | None:
+    if resource is None:
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _io_counters() -> dict[str, int]:
+    # rchar/wchar count every read()/write() of the process, files and sockets alike.
+    try:
+        lines = Path("/proc/self/io").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    counters = dict(line.split(":", 1) for line in lines if ":" in line)
+    try:
+        return {"read": int(counters["rchar"]), "written": int(counters["wchar"])}
+    except (KeyError, ValueError):
+        return {}
+
+
+def _sample() -> dict[str, Any]:
+    return {"wall": time.perf_counter(), "cpu": time.process_time(), "rss": _peak_rss_kb(), "io": _io_counters()}
+
+
+def _delta(start: dict, end: dict, key: str) -> int | None:
+    if start.get(key) is None or end.get(key) is None:
+        return None
+    return int(end[key] - start[key])
+
+
+class RunProfiler:
+    """Collect per-stage timings for one v2 run and append them to run_profile_YYYYMMDD.jsonl."""
+
+    def __init__(self, cfg: dict, cprofile: bool = False) -> None:
+        self.cfg = cfg
+        self.enabled = profiling_enabled(cfg) or cprofile
+        self.stages: list[dict[str, Any]] = []
+        self._start = _sample()
+        self._started_at = datetime.now()
+        self._cprofile = cProfile.Profile() if cprofile else None
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None) -> Iterator[dict[str, Any]]:
+        record: dict[str, Any] = {"stage": name, "rows_in": rows_in, "rows_out": None}
+        if not self.enabled:
+            yield record
+            return
+        start = _sample()
+        try:
+            yield record
+        finally:
+            end = _sample()
+            record.update(_measure(start, end))
+            self.stages.append(record)
+
+    def finish(self, extra: dict | None = None) -> dict[str, str]:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if not self.enabled:
+            return {}
+        stamp = self._started_at.strftime("%Y%m%d")
+        out_dir = profile_dir(self.cfg)
+        paths: dict[str, str] = {}
+        if self._cprofile is not None:
+            ensure_dir(out_dir)
+            pstats_path = out_dir / f"run_{self._started_at.strftime('%Y%m%d_%H%M%S')}.pstats"
+            self._cprofile.dump_stats(str(pstats_path))
+            paths["pstats_path"] = str(pstats_path)
+        profile_path = out_dir / f"run_profile_{stamp}.jsonl"
+        append_jsonl(
+            profile_path,
+            {
+                "started_at": self._started_at.isoformat(timespec="seconds"),
+                "total": _measure(self._start, _sample()),
+                "stages": self.stages,
+                **(extra or {}),
+                **paths,
+            },
+        )
+        paths["profile_path"] = str(profile_path)
+        return paths
+
+
+def _measure(start: dict, end: dict) -> dict[str, Any]:
+    return {
+        "wall_sec": round(end["wall"] - start["wall"], 4),
+        "cpu_sec": round(end["cpu"] - start["cpu"], 4),
+        "peak_rss_delta_kb": _delta(start, end, "rss"),
+        "io_read_bytes": _delta(start.get("io", {}), end.get("io", {}), "read"),
+        "io_written_bytes": _delta(start.get("io", {}), end.get("io", {}), "written"),
+    }
+
+
+def load_run_profiles(cfg: dict, days: int = 7, now_dt: datetime | None = None) -> list[dict]:
+    ref = (now_dt or datetime.now()).date()
+    wanted = {(ref - timedelta(days=offset)).strftime("%Y%m%d") for offset in range(max(days, 1))}
+    rows: list[dict] = []
+    for path in sorted(profile_dir(cfg).glob("run_profile_*.jsonl")):
+        if path.stem[len("run_profile_"):] not in wanted:
+            continue
+        with path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(row, dict):
+                    rows.append(row)
+    return rows
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 4)
+
+
+def summarize_profiles(rows: list[dict], percentiles: tuple[int, ...] = (50, 90, 99)) -> dict[str, Any]:
+    """Percentiles per stage (plus the whole run as `total`) across the given run profiles."""
+    samples: dict[str, list[dict]] = {}
+    for row in rows:
+        if isinstance(row.get("total"), dict):
+            samples.setdefault("total", []).append(row["total"])
+        for stage in row.get("stages", []) or []:
+            if isinstance(stage, dict) and stage.get("stage"):
+                samples.setdefault(str(stage["stage"]), []).append(stage)
+
+    summary: dict[str, Any] = {}
+    for name, records in samples.items():
+        entry: dict[str, Any] = {"runs": len(records)}
+        for metric in METRICS:
+            values = [float(record[metric]) for record in records if record.get(metric) is not None]
+            if not values:
+                continue
+            entry[metric] = {f"p{pct}": percentile(values, pct) for pct in percentiles}
+            entry[metric]["max"] = round(max(values), 4)
+        summary[name] = entry
+    return {"runs": len(rows), "stages": summary}
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(description="PortWächter V2 run profile summary")
+    parser.add_argument("command", choices=["summary"])
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+    if args.command == "summary":
+        cfg = load_v2_config()
+        print(json.dumps(summarize_profiles(load_run_profiles(cfg, days=args.days)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from modules.common.utils import ensure_dir, read_json
+from modules.v2.config import data_dir
+from modules.v2.incremental import instrument_key
+
+# Higher rank = more urgent for the user; moving up is an upgrade, moving down a downgrade.
+CLASS_RANK = {"IGNORE": 0, "WATCH": 1, "ACTION": 2, "DEFENSE": 3}
+DELTA_STATUSES = ("new", "upgraded", "downgraded", "removed", "unchanged")
+
+
+def delta_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("delta_notify", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def delta_enabled(cfg: dict) -> bool:
+    return bool(delta_cfg(cfg).get("enabled", True))
+
+
+def _state_path(cfg: dict) -> Path:
+    return data_dir(cfg) / "delta_state.json"
+
+
+def load_delta_state(cfg: dict, today: date | None = None) -> dict:
+    """Classification per instrument from the previous run of the same day; a new day starts from scratch."""
+    day = (today or date.today()).isoformat()
+    path = _state_path(cfg)
+    empty = {"date": day, "entries": {}}
+    if not path.exists():
+        return empty
+    try:
+        state = read_json(path)
+    except Exception:
+        return empty
+    if not isinstance(state, dict) or state.get("date") != day or not isinstance(state.get("entries"), dict):
+        return empty
+    return state
+
+
+def save_delta_state(
+    cfg: dict,
+    recommendations: list[dict],
+    previous: dict[str, str] | None = None,
+    hold_back: set[str] | None = None,
+    today: date | None = None,
+) -> None:
+    """Remember this run's classifications; held-back keys keep their previous one so the delta is offered again."""
+    entries: dict[str, str] = {}
+    for row in recommendations:
+        key = instrument_key(row)
+        if not key:
+            continue
+        if key in (hold_back or set()):
+            if key in (previous or {}):
+                entries[key] = previous[key]
+            continue
+        entries[key] = str(row.get("classification") or "")
+    path = _state_path(cfg)
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"date": (today or date.today()).isoformat(), "entries": entries}, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def diff_recommendations(previous: dict[str, str], recommendations: list[dict]) -> dict:
+    """Structured diff against the previous run: new, upgraded, downgraded, removed and unchanged instruments."""
+    diff: dict[str, Any] = {status: [] for status in DELTA_STATUSES}
+    by_key: dict[str, str] = {}
+    for row in recommendations:
+        key = instrument_key(row)
+        if not key:
+            continue
+        current = str(row.get("classification") or "")
+        before = previous.get(key)
+        if before is None:
+            status = "new"
+        elif before == current:
+            status = "unchanged"
+        elif CLASS_RANK.get(current, 0) > CLASS_RANK.get(before, 0):
+            status = "upgraded"
+        else:
+            status = "downgraded"
+        by_key[key] = status
+        diff[status].append(row)
+    diff["removed"] = [key for key in previous if key not in by_key]
+    diff["by_key"] = by_key
+    diff["counts"] = {status: len(diff[status]) for status in DELTA_STATUSES}
+    return diff
+
+
+def notification_rows(diff: dict, recommendations: list[dict]) -> list[dict]:
+    """Rows worth a message: new or upgraded instruments and any move into ACTION (DEFENSE -> ACTION ranks as a
+    downgrade but is still a call to act); WATCH rows only when some WATCH row moved, as they go out as one bundle."""
+    by_key = diff["by_key"]
+    watch_moved = any(
+        by_key.get(instrument_key(row)) != "unchanged" for row in recommendations if row.get("classification") == "WATCH"
+    )
+    return [
+        row
+        for row in recommendations
+        if (row.get("classification") == "WATCH" and watch_moved)
+        or (row.get("classification") != "WATCH" and by_key.get(instrument_key(row)) in {"new", "upgraded"})
+        or (row.get("classification") == "ACTION" and by_key.get(instrument_key(row)) == "downgraded")
+    ]
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from modules.common.utils import ensure_dir, read_json
+from modules.v2.config import data_dir
+from modules.v2.incremental import digest, instrument_key
+from modules.v2.telegram.copy import classification_label
+
+# Live market data changes every run; versions are told apart by what the recommendation is built on.
+LIVE_FIELDS = {"quote"}
+
+
+def history_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("history", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def history_enabled(cfg: dict) -> bool:
+    return bool(history_cfg(cfg).get("enabled", True))
+
+
+def write_snapshots(cfg: dict) -> bool:
+    return bool(history_cfg(cfg).get("snapshots", True))
+
+
+def history_dir(cfg: dict) -> Path:
+    return data_dir(cfg) / "history"
+
+
+def _month(run_id: str) -> str:
+    return str(run_id)[:6]
+
+
+def _index_path(cfg: dict, month: str) -> Path:
+    return history_dir(cfg) / f"index_{month}.json"
+
+
+def _latest_path(cfg: dict) -> Path:
+    return history_dir(cfg) / "latest.json"
+
+
+def _atomic_write_json(path: Path, payload: dict) -> None:
+    ensure_dir(path.parent)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False, separators=(",", ":"))
+    tmp.replace(path)
+
+
+def _read_dict(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        payload = read_json(path)
+    except Exception:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _append_lines(path: Path, rows: list[dict]) -> list[int]:
+    """Append JSON lines and return the byte offset each one starts at."""
+    ensure_dir(path.parent)
+    offsets: list[int] = []
+    with path.open("ab") as fh:
+        fh.seek(0, 2)
+        for row in rows:
+            offsets.append(fh.tell())
+            fh.write((json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+    return offsets
+
+
+def _read_line(path: Path, offset: int) -> dict | None:
+    if not path.exists():
+        return None
+    with path.open("rb") as fh:
+        fh.seek(int(offset))
+        line = fh.readline()
+    try:
+        payload = json.loads(line.decode("utf-8"))
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _without_live_fields(row: dict | None) -> dict | None:
+    return {key: value for key, value in row.items() if key not in LIVE_FIELDS} if isinstance(row, dict) else row
+
+
+def load_index(cfg: dict, month: str) -> dict:
+    index = _read_dict(_index_path(cfg, month))
+    return {"runs": index.get("runs", []), "by_classification": index.get("by_classification", {})}
+
+
+def load_latest(cfg: dict) -> dict:
+    latest = _read_dict(_latest_path(cfg))
+    return {"run_id": latest.get("run_id"), "generated_at": latest.get("generated_at"), "order": latest.get("order", []), "entries": latest.get("entries", {})}
+
+
+def append_run(
+    cfg: dict,
+    run_id: str,
+    candidates: list[dict],
+    recommendations: list[dict],
+    generated_at: str | None = None,
+) -> dict:
+    """Append one run keyed by (run_id, ISIN); payloads whose recommendation-defining fields match an ISIN's previous
+    version are stored as a reference, so a referenced row keeps the quote it was first stored with."""
+    month = _month(run_id)
+    out_dir = history_dir(cfg)
+    latest = load_latest(cfg)
+    entries = dict(latest["entries"])
+    candidates_by_key = {instrument_key(row): row for row in candidates}
+
+    rows: list[dict] = []
+    new_payloads: list[dict] = []
+    new_rows: list[dict] = []
+    for recommendation in recommendations:
+        key = instrument_key(recommendation)
+        if not key:
+            continue
+        payload = {"candidate": candidates_by_key.get(key), "recommendation": recommendation}
+        payload_digest = digest({key: _without_live_fields(value) for key, value in payload.items()})
+        classification = str(recommendation.get("classification") or "")
+        row = {
+            "isin": key,
+            "classification": classification,
+            "label": classification_label(recommendation.get("user_classification") or classification, recommendation),
+            "digest": payload_digest,
+        }
+        previous = entries.get(key)
+        if isinstance(previous, dict) and previous.get("digest") == payload_digest:
+            row["payload"] = previous["payload"]
+        else:
+            new_payloads.append({"digest": payload_digest, "run_id": run_id, "isin": key, **payload})
+            new_rows.append(row)
+        rows.append(row)
+
+    offsets = _append_lines(out_dir / f"payloads_{month}.jsonl", new_payloads) if new_payloads else []
+    for row, offset in zip(new_rows, offsets):
+        row["payload"] = [month, offset]
+
+    stamp = generated_at or datetime.now().isoformat()
+    run_offset = _append_lines(out_dir / f"runs_{month}.jsonl", [{"run_id": run_id, "generated_at": stamp, "rows": rows}])[0]
+
+    index = load_index(cfg, month)
+    counts: dict[str, int] = {}
+    labels: dict[str, int] = {}
+    for row in rows:
+        counts[row["classification"]] = counts.get(row["classification"], 0) + 1
+        labels[row["label"]] = labels.get(row["label"], 0) + 1
+    index["runs"].append({"run_id": run_id, "generated_at": stamp, "offset": run_offset, "rows": len(rows), "counts": counts, "labels": labels})
+    for row in rows:
+        versions = index["by_classification"].setdefault(row["classification"], {}).setdefault(row["isin"], [])
+        if row["payload"] not in versions:
+            versions.append(row["payload"])
+    _atomic_write_json(_index_path(cfg, month), index)
+
+    for row in rows:
+        entries[row["isin"]] = {"run_id": run_id, "digest": row["digest"], "payload": row["payload"], "classification": row["classification"]}
+    _atomic_write_json(_latest_path(cfg), {"run_id": run_id, "generated_at": stamp, "order": [row["isin"] for row in rows], "entries": entries})
+    return {
+        "history_runs_path": str(out_dir / f"runs_{month}.jsonl"),
+        "history_stored": len(new_payloads),
+        "history_referenced": len(rows) - len(new_payloads),
+    }
+
+
+class PayloadReader:
+    """Resolve [month, offset] payload references, reading each stored version once."""
+
+    def __init__(self, cfg: dict) -> None:
+        self.cfg = cfg
+        self._cache: dict[tuple[str, int], dict | None] = {}
+
+    def get(self, ref: object) -> dict | None:
+        if not isinstance(ref, list) or len(ref) != 2:
+            return None
+        key = (str(ref[0]), int(ref[1]))
+        if key not in self._cache:
+            self._cache[key] = _read_line(history_dir(self.cfg) / f"payloads_{key[0]}.jsonl", key[1])
+        return self._cache[key]
+
+    def recommendation(self, ref: object) -> dict | None:
+        payload = self.get(ref)
+        row = payload.get("recommendation") if payload else None
+        return row if isinstance(row, dict) else None
+
+
+def latest_run_recommendations(cfg: dict) -> tuple[str | None, list[dict]]:
+    """Recommendations of the most recent run, in run order."""
+    latest = load_latest(cfg)
+    reader = PayloadReader(cfg)
+    rows = []
+    for key in latest["order"]:
+        entry = latest["entries"].get(key)
+        recommendation = reader.recommendation(entry.get("payload")) if isinstance(entry, dict) else None
+        if recommendation is not None:
+            rows.append(recommendation)
+    return latest["run_id"], rows
+
+
+def latest_per_isin(cfg: dict) -> dict[str, dict]:
+    """Most recent recommendation for every instrument ever seen, regardless of the run it came from."""
+    reader = PayloadReader(cfg)
+    out: dict[str, dict] = {}
+    for key, entry in load_latest(cfg)["entries"].items():
+        recommendation = reader.recommendation(entry.get("payload")) if isinstance(entry, dict) else None
+        if recommendation is not None:
+            out[key] = recommendation
+    return out
+
+
+def recommendations_by_classification(cfg: dict, month: str, classification: str) -> dict[str, list[dict]]:
+    """Distinct recommendation versions per ISIN that carried `classification` during `month` (YYYYMM)."""
+    reader = PayloadReader(cfg)
+    by_isin = load_index(cfg, month)["by_classification"].get(classification, {})
+    return {
+        key: [row for row in (reader.recommendation(ref) for ref in refs) if row is not None]
+        for key, refs in by_isin.items()
+    }
+
+
+def run_summaries(cfg: dict, months: list[str]) -> list[dict]:
+    """Per-run counts from the month indexes, without touching payloads."""
+    runs: list[dict] = []
+    for month in months:
+        runs.extend(run for run in load_index(cfg, month)["runs"] if isinstance(run, dict))
+    return runs
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
 import re
 
+from modules.common.utils import read_json
+from modules.v2.config import root_dir
+
 SOURCE_BOOST = ("ir", "ad-hoc", "regulatory")
 POSITIVE_TERMS = ("earnings", "guidance", "acquisition", "outlook", "contract", "approval", "partnership")
 NEGATIVE_TERMS = (
@@ -29,6 +33,30 @@ NEGATIVE_TERMS = (
 STOPWORDS = {"ag", "inc", "corp", "corporation", "registered", "shares", "namens-aktien", "o", "n"}
 
 
+def load_latest_news(cfg: dict) -> list[dict]:
+    """Newest news top list plus the translated items of the latest news run."""
+    news_dir = root_dir(cfg) / "data" / "news"
+    items: list[dict] = []
+
+    ranked = sorted(news_dir.glob("top_opportunities_*.json"))
+    if ranked:
+        top = read_json(ranked[-1])
+        items.extend(top.get("top", []) if isinstance(top, dict) else [])
+
+    translated = sorted(news_dir.glob("items_translated_*.jsonl"))
+    if translated:
+        with translated[-1].open("r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return items
+
+
 def _aliases(instrument: dict) -> list[str]:
     aliases = {
         str(instrument.get("symbol") or "").split(".", 1)[0].lower(),
@@ -42,14 +70,18 @@ def _aliases(instrument: dict) -> list[str]:
     return [alias for alias in aliases if alias]
 
 
-def _match(item: dict, aliases: list[str]) -> bool:
+def _match(item: dict, aliases: list[str], isin: str = "") -> bool:
+    # Items tagged at ingest already name the holdings they mention; only untagged instruments need the text scan.
+    if isin and isin in (item.get("entity_ids") or ()):
+        return True
     text = f"{item.get('title', '')} {item.get('summary', '')}".lower()
     return any(alias in text for alias in aliases)
 
 
 def score_news(news_items: list[dict], instrument: dict) -> dict:
     aliases = _aliases(instrument)
-    matched = [item for item in news_items if _match(item, aliases)]
+    isin = str(instrument.get("isin") or "").upper()
+    matched = [item for item in news_items if _match(item, aliases, isin)]
     if not matched:
         return {"score": 0, "status": "ok", "matched_count": 0, "negative_hits": 0, "drivers": []}
 
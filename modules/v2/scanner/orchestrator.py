@@ -1,42 +1,16 @@
 from __future__ import annotations
 
-import json
-
-from modules.common.utils import read_json
 from modules.marketdata_watcher.volume_baseline import load_volume_baseline
 from modules.v2.config import load_v2_config, root_dir
 from modules.v2.marketdata.batch_quotes import fetch_quotes_for_instruments
 from modules.v2.scanner.momentum import score_momentum
-from modules.v2.scanner.news_impact import score_news
+from modules.v2.scanner.news_impact import load_latest_news, score_news
 from modules.v2.scanner.relative_strength import score_relative_strength
 from modules.v2.scanner.volume_spike import score_volume
 from modules.v2.universe.holdings_universe import load_current_holdings
 from modules.v2.universe.scanner_universe import load_scanner_universe, merge_universes
 
 
-def _latest_news(cfg: dict) -> list[dict]:
-    news_dir = root_dir(cfg) / "data" / "news"
-    items: list[dict] = []
-
-    ranked = sorted(news_dir.glob("top_opportunities_*.json"))
-    if ranked:
-        top = read_json(ranked[-1])
-        items.extend(top.get("top", []) if isinstance(top, dict) else [])
-
-    translated = sorted(news_dir.glob("items_translated_*.jsonl"))
-    if translated:
-        with translated[-1].open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    items.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-    return items
-
-
 def run_scanner(
     cfg: dict | None = None,
     holdings: list[dict] | None = None,
@@ -51,7 +25,7 @@ def run_scanner(
     quote_rows = quotes if quotes is not None else fetch_quotes_for_instruments(universe, active_cfg)
     quote_map = {str(row.get("symbol") or "").upper(): row.get("quote") for row in quote_rows}
     baseline = load_volume_baseline(root_dir(active_cfg) / "data" / "marketdata" / "volume_baseline.json")
-    latest_news = news_items if news_items is not None else _latest_news(active_cfg)
+    latest_news = news_items if news_items is not None else load_latest_news(active_cfg)
 
     candidates: list[dict] = []
     peer_moves = [
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import date
+
+from modules.common.holdings_index import build_holdings_index
+from modules.v2.recommendations.classify import classification_inputs, classify_values
+from modules.v2.scoring.defense_score import defense_from_values, score_negative_momentum
+from modules.v2.scoring.opportunity_score import SCORE_KEYS, expectancy_table, opportunity_from_values, regime_adjustment
+from modules.v2.scoring.portfolio_priority import compute_portfolio_priority
+
+
+def candidate_columns(candidates: list[dict], today: date | None = None) -> dict[str, list]:
+    """Extract every field scoring and classification read into one list per field."""
+    ref = today or date.today()
+    columns: dict[str, list] = {
+        "components": [],
+        "priority": [],
+        "negative_move": [],
+        "negative_hits": [],
+        "news_drivers": [],
+        "concentration_weight": [],
+        "weight": [],
+        "classification": [],
+    }
+    for candidate in candidates:
+        scores = candidate.get("scores", {})
+        news = candidate.get("details", {}).get("news", {})
+        columns["components"].append(tuple(float(scores.get(key, 0) or 0) for key in SCORE_KEYS))
+        columns["priority"].append(float(candidate.get("portfolio_priority", 0) or 0))
+        columns["negative_move"].append(score_negative_momentum(candidate.get("quote") or {}))
+        columns["negative_hits"].append(int(news.get("negative_hits", 0) or 0))
+        columns["news_drivers"].append({str(value or "") for value in (news.get("drivers", []) or [])})
+        columns["concentration_weight"].append(float((candidate.get("portfolio_context") or {}).get("concentration_weight_pct", 0) or 0))
+        columns["weight"].append(float(candidate.get("weight_pct", 0) or 0))
+        columns["classification"].append(classification_inputs(candidate, ref))
+    return columns
+
+
+def score_columns(columns: dict[str, list], regime: str, expectancy_data: dict) -> list[dict]:
+    """Score and classify a whole column set; run-level inputs (regime, expectancy) are resolved once."""
+    boost = regime_adjustment(regime)
+    boosts = expectancy_table(regime, expectancy_data)
+    rows: list[dict] = []
+    for idx in range(len(columns["components"])):
+        opportunity = opportunity_from_values(columns["components"][idx], columns["priority"][idx], boost, boosts)
+        defense = defense_from_values(
+            columns["negative_move"][idx],
+            columns["negative_hits"][idx],
+            columns["news_drivers"][idx],
+            columns["concentration_weight"][idx],
+            columns["weight"][idx],
+            regime,
+        )
+        rows.append(
+            {
+                "opportunity": opportunity,
+                "defense": defense,
+                "classification": classify_values(columns["classification"][idx], opportunity, defense),
+            }
+        )
+    return rows
+
+
+def score_candidates(candidates: list[dict], holdings: list[dict], regime: str, expectancy_data: dict) -> list[dict]:
+    """Batch equivalent of portfolio priority, opportunity, defense and classify for each candidate."""
+    index = build_holdings_index(holdings)
+    for candidate in candidates:
+        candidate["portfolio_priority"] = compute_portfolio_priority(candidate, holdings, index=index)
+    return score_columns(candidate_columns(candidates), regime, expectancy_data)
@@ -21,14 +21,14 @@ def _push_reason(target: list[str], value: str | None) -> None:
         target.append(text)
 
 
-def compute_defense_score(candidate: dict, regime: str, holding_weight: float) -> dict:
-    weight = float(holding_weight or 0)
-    negative_move = score_negative_momentum(candidate.get("quote") or {})
-    portfolio_context = candidate.get("portfolio_context") or {}
-    negative_hits = int(candidate.get("details", {}).get("news", {}).get("negative_hits", 0) or 0)
-    news_drivers = {str(value or "") for value in (candidate.get("details", {}).get("news", {}).get("drivers", []) or [])}
-    concentration_weight = float(portfolio_context.get("concentration_weight_pct", 0) or 0)
-
+def defense_from_values(
+    negative_move: dict,
+    negative_hits: int,
+    news_drivers: set[str],
+    concentration_weight: float,
+    weight: float,
+    regime: str,
+) -> dict:
     sell_score = 0.0
     risk_reduce_score = 0.0
     sell_reasons: list[str] = []
@@ -112,3 +112,15 @@ def compute_defense_score(candidate: dict, regime: str, holding_weight: float) -
         "sell_reasons": sell_reasons[:3],
         "risk_reduce_reasons": risk_reduce_reasons[:3],
     }
+
+
+def compute_defense_score(candidate: dict, regime: str, holding_weight: float) -> dict:
+    news = candidate.get("details", {}).get("news", {})
+    return defense_from_values(
+        score_negative_momentum(candidate.get("quote") or {}),
+        int(news.get("negative_hits", 0) or 0),
+        {str(value or "") for value in (news.get("drivers", []) or [])},
+        float((candidate.get("portfolio_context") or {}).get("concentration_weight_pct", 0) or 0),
+        float(holding_weight or 0),
+        regime,
+    )
@@ -9,10 +9,12 @@ def _score_bucket(base_score: float) -> int:
     return 2
 
 
-def _expectancy_boost(base_score: float, regime: str, expectancy_data: dict) -> tuple[float, list[str]]:
+SCORE_KEYS = ("momentum", "volume", "news", "relative_strength")
+
+
+def _expectancy_boost(bucket: int, regime: str, expectancy_data: dict) -> tuple[float, list[str]]:
     reasons: list[str] = []
     boost = 0.0
-    bucket = _score_bucket(base_score)
     score_key = f"factor_score>={bucket}"
     score_row = ((expectancy_data.get("score_calibration") or {}).get(score_key) or {}).get("3d", {})
     regime_row = ((expectancy_data.get("by_regime") or {}).get(regime) or {}).get("3d", {})
@@ -29,21 +31,32 @@ def _expectancy_boost(base_score: float, regime: str, expectancy_data: dict) ->
     return boost, reasons
 
 
-def compute_opportunity_score(candidate: dict, regime: str, expectancy_data: dict) -> dict:
-    scores = candidate.get("scores", {})
-    base_score = sum(float(scores.get(key, 0) or 0) for key in ("momentum", "volume", "news", "relative_strength"))
-    reasons = [key for key in ("momentum", "volume", "news", "relative_strength") if float(scores.get(key, 0) or 0) > 0]
+def expectancy_table(regime: str, expectancy_data: dict) -> dict[int, tuple[float, list[str]]]:
+    """Expectancy boost per score bucket; only depends on the run, not on the candidate."""
+    return {bucket: _expectancy_boost(bucket, regime, expectancy_data or {}) for bucket in (2, 3, 4)}
+
+
+def regime_adjustment(regime: str) -> float:
+    return 0.75 if regime == "risk_on" else -0.5 if regime == "risk_off" else 0.0
+
+
+def opportunity_from_values(
+    components: tuple[float, ...],
+    priority: float,
+    regime_boost: float,
+    expectancy_boosts: dict[int, tuple[float, list[str]]],
+) -> dict:
+    base_score = sum(components)
+    reasons = [key for key, value in zip(SCORE_KEYS, components) if value > 0]
 
-    regime_boost = 0.75 if regime == "risk_on" else -0.5 if regime == "risk_off" else 0.0
     if regime_boost > 0:
         reasons.append("risk_on_regime")
     elif regime_boost < 0:
         reasons.append("risk_off_penalty")
 
-    expectancy_boost, expectancy_reasons = _expectancy_boost(base_score, regime, expectancy_data or {})
+    expectancy_boost, expectancy_reasons = expectancy_boosts[_score_bucket(base_score)]
     reasons.extend(expectancy_reasons)
 
-    priority = float(candidate.get("portfolio_priority", 0) or 0)
     if priority:
         reasons.append("portfolio_priority")
 
@@ -62,3 +75,12 @@ def compute_opportunity_score(candidate: dict, regime: str, expectancy_data: dic
         "reasons": reasons,
     }
 
+
+def compute_opportunity_score(candidate: dict, regime: str, expectancy_data: dict) -> dict:
+    scores = candidate.get("scores", {})
+    return opportunity_from_values(
+        tuple(float(scores.get(key, 0) or 0) for key in SCORE_KEYS),
+        float(candidate.get("portfolio_priority", 0) or 0),
+        regime_adjustment(regime),
+        expectancy_table(regime, expectancy_data),
+    )
@@ -1,41 +1,23 @@
 from __future__ import annotations
 
+from modules.common.holdings_index import build_holdings_index, cluster_weight, concentration_risk, find_holding
 
-def _concentration_context(candidate: dict, holding: dict, holdings: list[dict]) -> dict:
+
+def _concentration_context(candidate: dict, holding: dict, index: dict) -> dict:
     cluster_field = "theme" if candidate.get("theme") or holding.get("theme") else "sector"
     cluster_value = candidate.get(cluster_field) or holding.get(cluster_field)
-    cluster_weight = 0.0
-    if cluster_value:
-        cluster_weight = sum(
-            float(row.get("weight_pct", 0) or 0)
-            for row in holdings
-            if (row.get(cluster_field) or "") == cluster_value
-        )
-    if cluster_weight >= 40:
-        risk = "high"
-    elif cluster_weight >= 25:
-        risk = "medium"
-    else:
-        risk = "low"
+    weight = cluster_weight(index, cluster_field, cluster_value)
     return {
         "cluster_field": cluster_field,
         "cluster_value": cluster_value,
-        "concentration_weight_pct": round(cluster_weight, 2),
-        "concentration_risk": risk,
+        "concentration_weight_pct": round(weight, 2),
+        "concentration_risk": concentration_risk(weight),
     }
 
 
-def compute_portfolio_priority(candidate: dict, holdings: list[dict]) -> float:
-    identifier = str(candidate.get("isin") or candidate.get("symbol") or "")
-    holding = next(
-        (
-            row
-            for row in holdings
-            if identifier
-            and identifier in {str(row.get("isin") or ""), str(row.get("symbol") or "")}
-        ),
-        None,
-    )
+def compute_portfolio_priority(candidate: dict, holdings: list[dict], index: dict | None = None) -> float:
+    active_index = index if index is not None else build_holdings_index(holdings)
+    holding = find_holding(active_index, candidate.get("isin") or candidate.get("symbol"))
     if not holding:
         candidate["portfolio_context"] = {
             "is_holding": False,
@@ -46,7 +28,7 @@ def compute_portfolio_priority(candidate: dict, holdings: list[dict]) -> float:
         return 0.0
 
     weight = float(holding.get("weight_pct", 0) or 0)
-    concentration = _concentration_context(candidate, holding, holdings)
+    concentration = _concentration_context(candidate, holding, active_index)
     candidate["portfolio_context"] = {
         "is_holding": True,
         "weight_pct": round(weight, 2),
@@ -60,9 +42,9 @@ def compute_portfolio_priority(candidate: dict, holdings: list[dict]) -> float:
     elif weight >= 3:
         score += 0.5
 
-    cluster_weight = float(concentration.get("concentration_weight_pct", 0) or 0)
-    if cluster_weight >= 40:
+    cluster_weight_pct = float(concentration.get("concentration_weight_pct", 0) or 0)
+    if cluster_weight_pct >= 40:
         score -= 0.9
-    elif cluster_weight >= 25:
+    elif cluster_weight_pct >= 25:
         score -= 0.45
     return round(score, 2)
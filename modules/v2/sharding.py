@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any
+
+from modules.v2.config import api_governor as api_governor_cfg
+from modules.v2.config import v2_marketdata
+from modules.v2.incremental import instrument_key
+from modules.v2.marketdata.api_governor import (
+    _hard_limit,
+    _soft_limit,
+    load_governor_state,
+    log_usage_many,
+    reset_minute_if_needed,
+    save_governor_state,
+)
+from modules.v2.marketdata.batch_quotes import _merge_mode, fetch_quotes_for_instruments
+from modules.v2.marketdata.batch_tuning import history_size, tune_batch_size, tuning_enabled
+from modules.v2.marketdata.credential_pool import credential_settings, key_state
+from modules.v2.marketdata.quote_cache import load_quote_cache, save_quote_cache
+from modules.v2.scanner.news_impact import load_latest_news
+from modules.v2.scanner.orchestrator import run_scanner
+from modules.v2.scanner.relative_strength import score_relative_strength
+
+RUNTIME_SUMS = ("api_cost", "cache_hits", "selected_assets", "holdings_count", "scanner_count")
+
+
+def sharding_cfg(cfg: dict) -> dict[str, Any]:
+    settings = cfg.get("v2", {}).get("sharding", {})
+    return settings if isinstance(settings, dict) else {}
+
+
+def shard_count(cfg: dict) -> int:
+    settings = sharding_cfg(cfg)
+    if not bool(settings.get("enabled", False)):
+        return 1
+    return max(int(settings.get("workers", 4) or 1), 1)
+
+
+def shard_of(item: dict, shards: int) -> int:
+    # sha1 instead of hash(): Python salts str hashes per process, shards must not move between runs.
+    key = instrument_key(item).encode("utf-8")
+    return int(hashlib.sha1(key).hexdigest()[:8], 16) % max(shards, 1)
+
+
+def partition(universe: list[dict], shards: int) -> list[list[dict]]:
+    parts: list[list[dict]] = [[] for _ in range(max(shards, 1))]
+    for item in universe:
+        parts[shard_of(item, shards)].append(item)
+    return parts
+
+
+def balance_tails(parts: list[list[dict]], batch_size: int) -> list[list[dict]]:
+    """Move a lone tail instrument to a shard with room in its last batch.
+
+    Batch-only mode blocks single-symbol requests, so a shard ending on a one-symbol batch would lose that quote.
+    """
+    if batch_size <= 1:
+        return parts
+    for idx, part in enumerate(parts):
+        if len(part) % batch_size != 1:
+            continue
+        target = next((other for jdx, other in enumerate(parts) if jdx != idx and len(other) % batch_size != 0), None)
+        if target is not None:
+            target.append(part.pop())
+    return parts
+
+
+def split_budget(total: int, shards: int) -> list[int]:
+    base, extra = divmod(max(int(total), 0), max(shards, 1))
+    return [base + (1 if idx < extra else 0) for idx in range(max(shards, 1))]
+
+
+def _shard_cfgs(cfg: dict, state: dict, shards: int, batch_size: int | None = None) -> list[dict]:
+    """Per-shard configs with their own governor state and quote cache file.
+
+    Each shard sees an equal slice of the run budget and of what is left this minute; the slice is
+    expressed by pre-filling the shard's minute counters, so limits and key pool stay as configured.
+    """
+    governor = api_governor_cfg(cfg)
+    hard = _hard_limit(cfg)
+    used = int(state.get("used_in_current_minute", 0) or 0)
+    run_budgets = split_budget(int(governor.get("per_run_budget", 20) or 20), shards)
+    minute_slices = split_budget(hard - used, shards)
+    soft_slices = split_budget(_soft_limit(cfg) - used, shards)
+    key_slices = {}
+    for row in credential_settings(cfg):
+        name = str(row.get("name") or "")
+        entry = key_state(state, name)
+        key_hard = int(row.get("minute_limit_hard", governor.get("minute_limit_hard", 55)) or 55)
+        key_slices[name] = (key_hard, split_budget(key_hard - int(entry.get("used_in_current_minute", 0) or 0), shards))
+
+    out = []
+    for idx in range(shards):
+        shard = copy.deepcopy({key: value for key, value in cfg.items() if key != "_api_governor_runtime"})
+        if batch_size:
+            shard["_pinned_batch_size"] = batch_size
+        shard_governor = shard.setdefault("api_governor", {})
+        shard_governor["state_file"] = f"data/api_governor/shards/state_{idx}.json"
+        if run_budgets[idx] > 0:
+            shard_governor["per_run_budget"] = run_budgets[idx]
+        shard.setdefault("v2", {}).setdefault("quote_cache", {})["path"] = f"data/v2/shards/quote_cache_{idx}.json"
+        allowance = minute_slices[idx] if run_budgets[idx] > 0 else 0
+        # Shift the soft limit by the same pre-fill so degrade kicks in at the shard's share of the soft headroom.
+        shard_governor["minute_limit_soft"] = max(hard - allowance + soft_slices[idx], 1)
+        keys = {}
+        for name, entry in (state.get("keys") or {}).items():
+            key_hard, slices = key_slices.get(name, (0, [0] * shards))
+            keys[name] = {**entry, "used_in_current_minute": key_hard - slices[idx]}
+        save_governor_state(
+            {
+                "current_minute": state.get("current_minute"),
+                "used_in_current_minute": hard - allowance,
+                "keys": keys,
+                "batch_tuning": copy.deepcopy(state.get("batch_tuning") or {"size": None, "samples": []}),
+            },
+            shard,
+        )
+        out.append(shard)
+    return out
+
+
+def _run_shard(job: dict) -> dict:
+    cfg = job["cfg"]
+    items = job["items"]
+    seeded = load_governor_state(cfg)
+    quotes = fetch_quotes_for_instruments(items, cfg, api_key=job["api_key"])
+    candidates = run_scanner(cfg, holdings=[], scanner=items, quotes=quotes, news_items=job["news"])
+    return {
+        "quotes": quotes,
+        "candidates": candidates,
+        "runtime": cfg.get("_api_governor_runtime", {}),
+        "seeded": seeded,
+        "state": load_governor_state(cfg),
+    }
+
+
+def _spent(before: dict, after: dict) -> int:
+    if after.get("current_minute") != before.get("current_minute"):
+        return int(after.get("used_in_current_minute", 0) or 0)
+    return max(int(after.get("used_in_current_minute", 0) or 0) - int(before.get("used_in_current_minute", 0) or 0), 0)
+
+
+def _merge_state(state: dict, results: list[dict], cfg: dict) -> dict:
+    """Fold shard spending back into the run's governor state; spending after a minute rollover is dropped."""
+    merged = dict(state)
+    for result in results:
+        seeded, shard_state = result["seeded"], result["state"]
+        if shard_state.get("current_minute") == merged.get("current_minute"):
+            merged["used_in_current_minute"] = int(merged.get("used_in_current_minute", 0) or 0) + _spent(seeded, shard_state)
+        for name, shard_entry in (shard_state.get("keys") or {}).items():
+            entry = key_state(merged, name)
+            if shard_entry.get("current_minute") == entry.get("current_minute"):
+                spent = _spent((seeded.get("keys") or {}).get(name) or {}, shard_entry)
+                entry["used_in_current_minute"] = int(entry.get("used_in_current_minute", 0) or 0) + spent
+            entry["consecutive_failures"] = max(int(entry.get("consecutive_failures", 0) or 0), int(shard_entry.get("consecutive_failures", 0) or 0))
+            entry["cooldown_until"] = max(filter(None, [entry.get("cooldown_until"), shard_entry.get("cooldown_until")]), default=None)
+    tunings = [result["state"].get("batch_tuning") for result in results if isinstance(result["state"].get("batch_tuning"), dict)]
+    if tunings:
+        seeded_samples = (state.get("batch_tuning") or {}).get("samples", [])
+        samples = list(seeded_samples)
+        for tuning in tunings:
+            samples.extend(sample for sample in tuning.get("samples", []) if sample not in seeded_samples)
+        sizes = [int(tuning["size"]) for tuning in tunings if tuning.get("size")]
+        merged["batch_tuning"] = {"size": min(sizes) if sizes else None, "samples": samples[-history_size(cfg) :]}
+    return merged
+
+
+def _merge_quote_caches(cfg: dict, shard_cfgs: list[dict]) -> None:
+    cache = load_quote_cache(cfg)
+    for shard in shard_cfgs:
+        shard_cache = load_quote_cache(shard)
+        for symbol, entry in shard_cache["entries"].items():
+            current = cache["entries"].get(symbol)
+            if not isinstance(current, dict) or str(entry.get("cached_at") or "") > str(current.get("cached_at") or ""):
+                cache["entries"][symbol] = entry
+        cache["isins"].update(shard_cache["isins"])
+    save_quote_cache(cache, cfg)
+
+
+def run_sharded_scan(cfg: dict, universe: list[dict], api_key: str | None = None) -> tuple[list[dict], list[dict]]:
+    """Fetch and scan the universe in worker processes, one stable hash shard each, and merge in universe order."""
+    shards = max(min(shard_count(cfg), len(universe)), 1)
+    state = reset_minute_if_needed(load_governor_state(cfg), datetime.now())
+    batch_size = int(v2_marketdata(cfg).get("batch_size", 8) or 8)
+    pinned = None
+    if tuning_enabled(cfg):
+        # Tuned once here; every shard would otherwise repeat the same decision from the same seeded state.
+        batch_size, adjustment = tune_batch_size(state, cfg)
+        log_usage_many([adjustment] if adjustment else [], cfg)
+        pinned = batch_size
+    shard_cfgs = _shard_cfgs(cfg, state, shards, batch_size=pinned)
+    for shard in shard_cfgs:
+        save_quote_cache(load_quote_cache(cfg), shard)
+    news = load_latest_news(cfg)
+    jobs = [
+        {"cfg": shard, "items": items, "api_key": api_key, "news": news}
+        for shard, items in zip(shard_cfgs, balance_tails(partition(universe, shards), batch_size))
+    ]
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        results = list(pool.map(_run_shard, jobs))
+
+    save_governor_state(_merge_state(state, results, cfg), cfg)
+    _merge_quote_caches(cfg, shard_cfgs)
+    runtime = cfg.setdefault("_api_governor_runtime", {})
+    runtime.update({key: sum(int(result["runtime"].get(key, 0) or 0) for result in results) for key in RUNTIME_SUMS})
+    runtime["mode"] = "normal"
+    for result in results:
+        runtime["mode"] = _merge_mode(runtime["mode"], str(result["runtime"].get("mode") or "normal"))
+    runtime["blocked_by_budget"] = any(bool(result["runtime"].get("blocked_by_budget")) for result in results)
+    runtime["minute_used"] = int(load_governor_state(cfg).get("used_in_current_minute", 0) or 0)
+
+    order = {instrument_key(item): idx for idx, item in enumerate(universe)}
+    quotes = sorted((row for result in results for row in result["quotes"]), key=lambda row: order.get(instrument_key(row), len(order)))
+    candidates = sorted((row for result in results for row in result["candidates"]), key=lambda row: order.get(instrument_key(row), len(order)))
+
+    # Relative strength ranks against every quote of the run, so it is recomputed once the shards are merged.
+    quote_map = {str(row.get("symbol") or "").upper(): row.get("quote") for row in candidates}
+    peer_moves = [
+        float(quote["percent_change"])
+        for quote in quote_map.values()
+        if isinstance(quote, dict) and quote.get("status") == "ok" and quote.get("percent_change") is not None
+    ]
+    for candidate in candidates:
+        relative = score_relative_strength(candidate["quote"], peer_moves)
+        candidate["scores"]["relative_strength"] = relative["score"]
+        candidate["details"]["relative_strength"] = relative
+    return quotes, candidates
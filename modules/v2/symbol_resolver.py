@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+from modules.common.utils import read_json, write_json
+from modules.v2.config import data_dir, load_v2_config, root_dir, scanner_universe_path
+from modules.v2.symbols import load_symbol_map
+from modules.v2.universe.holdings_universe import load_current_holdings
+
+LEGAL_SUFFIXES = {
+    "ag", "se", "sa", "nv", "plc", "inc", "corp", "corporation", "co", "company", "ltd", "limited",
+    "kgaa", "gmbh", "holding", "holdings", "group", "the", "class", "cl", "a", "b", "reg", "namens", "akt",
+}
+SOURCE_PRIORITY = {"symbol_map": 0, "tr_universe": 1, "scanner_universe": 2, "isin_to_symbol": 3, "portfolio": 4}
+MIN_PROPOSAL_SCORE = 0.55
+
+
+def normalize_name(value: object) -> str:
+    text = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode("ascii").lower()
+    tokens = [token for token in re.split(r"[^a-z0-9]+", text) if token and token not in LEGAL_SUFFIXES]
+    return " ".join(tokens)
+
+
+def name_grams(value: object) -> set[str]:
+    normalized = normalize_name(value)
+    if not normalized:
+        return set()
+    padded = f"  {normalized} "
+    return {padded[idx : idx + 3] for idx in range(len(padded) - 2)}
+
+
+def wkn_from_isin(isin: str) -> str | None:
+    # German ISINs embed the six-character WKN: DE000 + WKN + check digit.
+    text = str(isin or "").strip().upper()
+    if len(text) == 12 and text.startswith("DE000"):
+        return text[5:11]
+    return None
+
+
+def _symbol_from_stooq(value: object) -> str | None:
+    text = str(value or "").strip().upper()
+    if not text:
+        return None
+    return text[:-3] if text.endswith(".US") else text
+
+
+def _read(path: Path) -> object:
+    if not path.exists():
+        return None
+    try:
+        return read_json(path)
+    except Exception:
+        return None
+
+
+def _source_rows(cfg: dict) -> list[dict]:
+    root = root_dir(cfg)
+    rows: list[dict] = []
+    for isin, entry in load_symbol_map(cfg=cfg).items():
+        if isinstance(entry, dict):
+            rows.append({"source": "symbol_map", "isin": isin, **{key: entry.get(key) for key in ("symbol", "name", "country", "sector")}})
+
+    tr_path = Path(str(cfg.get("virus_bridge", {}).get("tr_universe_path") or "config/universe_tr_verified.json"))
+    tr_universe = _read(tr_path if tr_path.is_absolute() else root / tr_path)
+    for isin, entry in (tr_universe or {}).items() if isinstance(tr_universe, dict) else []:
+        if isinstance(entry, dict):
+            rows.append({"source": "tr_universe", "isin": isin, "symbol": entry.get("symbol"), "name": entry.get("name"), "exchange": entry.get("market")})
+
+    scanner = _read(scanner_universe_path(cfg))
+    for item in (scanner or {}).get("items", []) if isinstance(scanner, dict) else []:
+        if isinstance(item, dict):
+            rows.append({"source": "scanner_universe", **{key: item.get(key) for key in ("isin", "symbol", "name", "country", "sector")}})
+
+    isin_map = _read(root / "config" / "isin_to_symbol.json")
+    for isin, symbol in (isin_map or {}).items() if isinstance(isin_map, dict) else []:
+        rows.append({"source": "isin_to_symbol", "isin": isin, "symbol": _symbol_from_stooq(symbol)})
+
+    snapshots = sorted((root / "data" / "snapshots").glob("portfolio_*.json"))
+    snapshot = _read(snapshots[-1]) if snapshots else None
+    for position in (snapshot or {}).get("positions", []) if isinstance(snapshot, dict) else []:
+        if isinstance(position, dict) and position.get("isin"):
+            rows.append({"source": "portfolio", "isin": position.get("isin"), "name": position.get("name")})
+    return rows
+
+
+def build_symbol_index(cfg: dict, rows: list[dict] | None = None) -> dict:
+    """Merge all local instrument sources into one record per ISIN (or symbol) plus lookup tables and a name n-gram index."""
+    records: list[dict] = []
+    by_isin: dict[str, int] = {}
+    by_symbol: dict[str, int] = {}
+    ordered = sorted(rows if rows is not None else _source_rows(cfg), key=lambda row: SOURCE_PRIORITY.get(row["source"], 9))
+    for row in ordered:
+        isin = str(row.get("isin") or "").strip().upper()
+        symbol = str(row.get("symbol") or "").strip().upper()
+        idx = by_isin.get(isin) if isin else None
+        if idx is None and symbol:
+            idx = by_symbol.get(symbol)
+        if idx is None:
+            idx = len(records)
+            records.append({"isin": None, "wkn": None, "symbol": None, "name": None, "exchange": None, "country": None, "sector": None, "sources": []})
+        record = records[idx]
+        for key in ("name", "exchange", "country", "sector"):
+            if not record.get(key) and row.get(key):
+                record[key] = row[key]
+        if isin and not record["isin"]:
+            record["isin"] = isin
+            record["wkn"] = wkn_from_isin(isin)
+        if symbol and not record["symbol"]:
+            record["symbol"] = symbol
+        if row["source"] not in record["sources"]:
+            record["sources"].append(row["source"])
+        if record["isin"]:
+            by_isin.setdefault(record["isin"], idx)
+        if record["symbol"]:
+            by_symbol.setdefault(record["symbol"], idx)
+
+    by_wkn: dict[str, int] = {}
+    grams: dict[str, list[int]] = {}
+    for idx, record in enumerate(records):
+        if record["wkn"]:
+            by_wkn.setdefault(record["wkn"], idx)
+        record["grams"] = sorted(name_grams(record["name"]))
+        for gram in record["grams"]:
+            grams.setdefault(gram, []).append(idx)
+    return {"records": records, "by_isin": by_isin, "by_wkn": by_wkn, "by_symbol": by_symbol, "grams": grams}
+
+
+def _candidate(record: dict, score: float, match: str) -> dict:
+    return {
+        "symbol": record["symbol"],
+        "isin": record["isin"],
+        "wkn": record["wkn"],
+        "name": record["name"],
+        "exchange": record["exchange"],
+        "score": round(score, 4),
+        "match": match,
+        "sources": list(record["sources"]),
+    }
+
+
+def search(index: dict, query: str, limit: int = 5) -> list[dict]:
+    """Ranked matches for an ISIN, WKN, ticker or free-text name; only records with a symbol are returned."""
+    text = str(query or "").strip()
+    upper = text.upper()
+    records = index["records"]
+    exact: list[tuple[int, str]] = []
+    if upper in index["by_isin"]:
+        exact.append((index["by_isin"][upper], "isin"))
+    if upper in index["by_wkn"]:
+        exact.append((index["by_wkn"][upper], "wkn"))
+    for key in (upper, f"{upper}.DE"):
+        if key in index["by_symbol"]:
+            exact.append((index["by_symbol"][key], "symbol"))
+
+    results: list[dict] = []
+    seen: set[int] = set()
+    for idx, match in exact:
+        if idx not in seen and records[idx]["symbol"]:
+            seen.add(idx)
+            results.append(_candidate(records[idx], 1.0, match))
+
+    query_grams = name_grams(text)
+    shared: dict[int, int] = {}
+    for gram in query_grams:
+        for idx in index["grams"].get(gram, []):
+            shared[idx] = shared.get(idx, 0) + 1
+    scored = []
+    for idx, count in shared.items():
+        record = records[idx]
+        if idx in seen or not record["symbol"]:
+            continue
+        dice = 2.0 * count / (len(query_grams) + len(record["grams"]))
+        scored.append((dice, record["symbol"], idx))
+    scored.sort(key=lambda row: (-row[0], row[1]))
+    results.extend(_candidate(records[idx], dice, "name") for dice, _, idx in scored)
+    return results[: max(limit, 0)]
+
+
+def propose_mappings(cfg: dict, items: list[dict], index: dict | None = None, min_score: float = MIN_PROPOSAL_SCORE) -> dict:
+    """One pass over unmapped ISINs: propose the best local match for each, leaving symbol_map_v2.json untouched."""
+    active_index = index or build_symbol_index(cfg)
+    symbol_map = load_symbol_map(cfg=cfg)
+    proposals: list[dict] = []
+    unresolved: list[dict] = []
+    seen: set[str] = set()
+    for item in items:
+        isin = str(item.get("isin") or "").strip().upper()
+        if not isin or isin in seen:
+            continue
+        seen.add(isin)
+        mapped = symbol_map.get(isin)
+        if isinstance(mapped, dict) and mapped.get("symbol"):
+            continue
+        candidates = [row for row in search(active_index, isin, limit=1) if row["match"] == "isin"]
+        if not candidates and item.get("name"):
+            # A name match that already carries another ISIN is a different instrument, not a mapping.
+            candidates = [row for row in search(active_index, str(item.get("name")), limit=3) if not row["isin"] or row["isin"] == isin]
+        best = candidates[0] if candidates else None
+        if best and best["score"] >= min_score:
+            proposals.append({"isin": isin, "name": item.get("name"), "proposed": best, "alternatives": candidates[1:]})
+        else:
+            unresolved.append({"isin": isin, "name": item.get("name"), "best": best})
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "proposal_count": len(proposals),
+        "unresolved_count": len(unresolved),
+        "proposals": proposals,
+        "unresolved": unresolved,
+    }
+
+
+def _cli() -> None:
+    parser = argparse.ArgumentParser(description="PortWächter V2 offline symbol resolver")
+    parser.add_argument("command", choices=["search", "propose"])
+    parser.add_argument("query", nargs="?", default="")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+    cfg = load_v2_config()
+    index = build_symbol_index(cfg)
+    if args.command == "search":
+        print(json.dumps(search(index, args.query, limit=args.limit), ensure_ascii=False, indent=2))
+        return
+    report = propose_mappings(cfg, load_current_holdings(cfg), index=index)
+    out_path = data_dir(cfg) / f"symbol_map_proposals_{datetime.now().strftime('%Y%m%d')}.json"
+    write_json(out_path, report)
+    print(json.dumps({"path": str(out_path), "proposal_count": report["proposal_count"], "unresolved_count": report["unresolved_count"]}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    _cli()
@@ -4,6 +4,8 @@ from pathlib import Path
 
 from modules.common.utils import read_json
 from modules.v2.config import data_dir
+from modules.v2.incremental import delta_persistence, incremental_dir, latest_incremental_recommendations
+from modules.v2.recommendation_history import history_enabled, latest_run_recommendations, load_latest
 from modules.v2.telegram.copy import (
     candidate_label,
     candidate_name,
@@ -23,7 +25,14 @@ def _latest_recommendations_path(cfg: dict) -> Path | None:
 
 
 def load_latest_recommendations(cfg: dict) -> list[dict]:
+    if delta_persistence(cfg):
+        return latest_incremental_recommendations(cfg)
     path = _latest_recommendations_path(cfg)
+    if history_enabled(cfg):
+        run_id, rows = latest_run_recommendations(cfg)
+        # Snapshot files share the run stamp, so the newer of both sources wins.
+        if run_id and (path is None or str(run_id) >= path.stem[len("recommendations_") :]):
+            return rows
     if path is None or not path.exists():
         return []
     data = read_json(path)
@@ -33,6 +42,20 @@ def load_latest_recommendations(cfg: dict) -> list[dict]:
     return rows if isinstance(rows, list) else []
 
 
+def latest_recommendations_run(cfg: dict) -> str | None:
+    """Run stamp (YYYYMMDD_HHMM) of the source `load_latest_recommendations` reads, without loading rows."""
+    if delta_persistence(cfg):
+        manifests = sorted(incremental_dir(cfg).glob("manifest_*.json"))
+        return manifests[-1].stem[len("manifest_") :] if manifests else None
+    path = _latest_recommendations_path(cfg)
+    stamps = [path.stem[len("recommendations_") :]] if path is not None else []
+    if history_enabled(cfg):
+        run_id = load_latest(cfg)["run_id"]
+        if run_id:
+            stamps.append(str(run_id))
+    return max(stamps) if stamps else None
+
+
 def _example_symbol(latest_recommendations: list[dict] | None = None) -> str:
     for candidate in latest_recommendations or []:
         symbol = str(candidate.get("symbol") or "").strip()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from pathlib import Path
 
 from modules.common.utils import ensure_dir, now_iso_tz
@@ -16,7 +17,11 @@ def _state_path(cfg: dict) -> Path:
 
 
 def _default_state(today: str) -> dict:
-    return {"date": today, "counters": {"watch": 0, "action": 0, "defense": 0}, "sent": {}, "dedupe": []}
+    return {"date": today, "counters": {"watch": 0, "action": 0, "defense": 0}, "sent": {}}
+
+
+def _hash_key(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
 
 
 def _load_state(cfg: dict) -> dict:
@@ -30,13 +35,20 @@ def _load_state(cfg: dict) -> dict:
         return _default_state(today)
     if str(state.get("date")) != today:
         return _default_state(today)
+    # Older state files kept plain keys plus a separate dedupe list; fold them into the hashed index.
+    sent = {(key if len(key) == 16 and ":" not in key else _hash_key(key)): ts for key, ts in (state.get("sent") or {}).items()}
+    for key in state.pop("dedupe", None) or []:
+        sent.setdefault(_hash_key(str(key)), None)
+    state["sent"] = sent
     return state
 
 
 def _save_state(cfg: dict, state: dict) -> None:
     path = _state_path(cfg)
     ensure_dir(path.parent)
-    path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
 
 
 def _limit(kind: str, cfg: dict) -> int:
@@ -45,7 +57,13 @@ def _limit(kind: str, cfg: dict) -> int:
     return int(tcfg.get(mapping[kind], 0) or 0)
 
 
-def _entity_key(candidate: dict) -> str:
+SENT = "sent"
+DUPLICATE = "duplicate"
+DAILY_LIMIT = "daily_limit"
+FAILED = "failed"
+
+
+def entity_key(candidate: dict) -> str:
     return str(candidate.get("symbol") or candidate.get("isin") or candidate.get("name") or "na")
 
 
@@ -53,57 +71,54 @@ def _state_key(kind: str, entity_key: str, now: datetime) -> str:
     return f"{kind}:{entity_key}:{now.date().isoformat()}"
 
 
-def _should_send(kind: str, key: str, cfg: dict, state: dict, now: datetime) -> bool:
-    if key in set(state.get("dedupe", [])):
-        return False
+def _now(cfg: dict) -> datetime:
+    return now_berlin(cfg.get("app", {}).get("timezone", "Europe/Berlin"))
+
+
+def _skip_reason(kind: str, key: str, cfg: dict, state: dict) -> str | None:
+    # The key carries the day and the state resets daily, so one send per key and day is the whole rule.
+    if _hash_key(key) in state.setdefault("sent", {}):
+        return DUPLICATE
     counters = state.setdefault("counters", {})
     if int(counters.get(kind, 0) or 0) >= _limit(kind, cfg):
-        return False
+        return DAILY_LIMIT
+    return None
 
-    cooldown = timedelta(minutes=int(v2_telegram(cfg).get("cooldown_minutes", 90) or 90))
-    raw = state.setdefault("sent", {}).get(key)
-    if not raw:
-        return True
-    try:
-        last = datetime.fromisoformat(raw)
-    except ValueError:
-        return True
-    return now - last >= cooldown
 
+def skip_reason(kind: str, entity: str, cfg: dict) -> str | None:
+    """`DUPLICATE` or `DAILY_LIMIT` when a message for `entity` would be skipped today, else None."""
+    return _skip_reason(kind, _state_key(kind, entity, _now(cfg)), cfg, _load_state(cfg))
 
-def _send(kind: str, entity_key: str, text: str, cfg: dict) -> bool:
-    now = now_berlin(cfg.get("app", {}).get("timezone", "Europe/Berlin"))
+
+def _send(kind: str, entity_key: str, text: str, cfg: dict) -> str:
+    now = _now(cfg)
     key = _state_key(kind, entity_key, now)
     state = _load_state(cfg)
-    if not _should_send(kind, key, cfg, state, now):
-        return False
+    reason = _skip_reason(kind, key, cfg, state)
+    if reason:
+        return reason
     if not send_performance_text(text, cfg):
-        return False
-    state.setdefault("dedupe", []).append(key)
-    state.setdefault("sent", {})[key] = now_iso_tz(cfg.get("app", {}).get("timezone", "Europe/Berlin"))
+        return FAILED
+    state.setdefault("sent", {})[_hash_key(key)] = now_iso_tz(cfg.get("app", {}).get("timezone", "Europe/Berlin"))
     state.setdefault("counters", {})[kind] = int(state["counters"].get(kind, 0) or 0) + 1
     _save_state(cfg, state)
-    return True
+    return SENT
 
 
 def send_watch(candidate: dict, text: str, cfg: dict) -> bool:
-    return _send("watch", _entity_key(candidate), text, cfg)
+    return _send("watch", entity_key(candidate), text, cfg) == SENT
 
 
 def send_action(candidate: dict, text: str, cfg: dict) -> bool:
-    return _send("action", _entity_key(candidate), text, cfg)
+    return _send("action", entity_key(candidate), text, cfg) == SENT
 
 
 def send_defense(candidate: dict, text: str, cfg: dict) -> bool:
-    return _send("defense", _entity_key(candidate), text, cfg)
+    return _send("defense", entity_key(candidate), text, cfg) == SENT
 
 
 def render_watch_bundle(candidates: list[dict]) -> str:
-    rows = sorted(
-        [row for row in candidates if row.get("classification") == "WATCH"],
-        key=lambda row: float((row.get("opportunity_score") or {}).get("total_score", 0) or 0),
-        reverse=True,
-    )[:10]
+    rows = _bundle_rows(candidates)
     if not rows:
         return ""
 
@@ -144,17 +159,23 @@ def render_watch_bundle(candidates: list[dict]) -> str:
     return "\n".join(lines)[:1800]
 
 
-def send_watch_bundle(candidates: list[dict], cfg: dict) -> bool:
-    text = render_watch_bundle(candidates)
-    if not text:
-        return False
-    rows = sorted(
+def _bundle_rows(candidates: list[dict]) -> list[dict]:
+    return sorted(
         [row for row in candidates if row.get("classification") == "WATCH"],
         key=lambda row: float((row.get("opportunity_score") or {}).get("total_score", 0) or 0),
         reverse=True,
     )[:10]
-    entity_key = "bundle:" + ",".join(_entity_key(row) for row in rows)
-    return _send("watch", entity_key, text, cfg)
+
+
+def watch_bundle_key(candidates: list[dict]) -> str:
+    return "bundle:" + ",".join(entity_key(row) for row in _bundle_rows(candidates))
+
+
+def send_watch_bundle(candidates: list[dict], cfg: dict) -> bool:
+    text = render_watch_bundle(candidates)
+    if not text:
+        return False
+    return _send("watch", watch_bundle_key(candidates), text, cfg) == SENT
 
 
 def send_status(text: str, cfg: dict) -> bool:
@@ -4,6 +4,7 @@ import math
 
 from modules.v2.config import api_governor as api_governor_cfg
 from modules.v2.marketdata.api_governor import current_mode
+from modules.v2.universe.value_of_information import select_by_information_value
 
 
 def _priority_value(item: dict) -> float:
@@ -84,6 +85,10 @@ def select_assets_for_run(universe: list[dict], state: dict, cfg: dict) -> list[
     if mode != "degraded" or not bool(degrade_cfg.get("skip_low_priority_scanner_assets", True)):
         scanner_pool.extend(scanner_low)
 
+    if str(governor.get("scheduler") or "rotate").strip().lower() == "voi":
+        scanners = select_by_information_value(scanner_pool, remaining, state, cfg, holdings_count=len(selected))
+        return [*selected, *scanners]
+
     scanners = _rotated_chunk(
         scanner_pool,
         remaining,
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import math
+from datetime import datetime
+
+from modules.common.latest_quotes import load_v2_view, lookup_latest
+from modules.marketdata_watcher.volume_baseline import load_volume_baseline
+from modules.v2.config import api_governor as api_governor_cfg
+from modules.v2.config import data_dir, root_dir, v2_marketdata
+from modules.v2.marketdata.api_governor import log_usage
+from modules.v2.marketdata.quote_cache import fresh_quote_map
+from modules.v2.scanner.news_impact import load_latest_news, score_news
+from modules.v2.scanner.volume_spike import score_volume
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {"volatility": 1.0, "volume": 1.0, "news": 1.5, "threshold": 1.0, "staleness": 1.0}
+
+
+def _voi_cfg(cfg: dict) -> dict:
+    settings = api_governor_cfg(cfg).get("voi")
+    return settings if isinstance(settings, dict) else {}
+
+
+def _key(item: dict) -> str:
+    return str(item.get("symbol") or item.get("isin") or "").strip().upper()
+
+
+def _alert_threshold_pct(cfg: dict) -> float:
+    defaults = cfg.get("marketdata_alerts", {}).get("group_defaults", {})
+    radar = defaults.get("radar", {}) if isinstance(defaults, dict) else {}
+    return float(_voi_cfg(cfg).get("threshold_pct") or radar.get("threshold_pct") or 4.0)
+
+
+def build_voi_context(cfg: dict) -> dict:
+    return {
+        "view": load_v2_view(data_dir(cfg)),
+        "news": load_latest_news(cfg),
+        "baseline": load_volume_baseline(root_dir(cfg) / "data" / "marketdata" / "volume_baseline.json"),
+        "cached": fresh_quote_map(cfg, consumer="scanner"),
+    }
+
+
+def information_components(item: dict, context: dict, state: dict, cfg: dict, now_dt: datetime) -> dict[str, float]:
+    settings = _voi_cfg(cfg)
+    row = lookup_latest(context.get("view", {}), item.get("symbol")) or lookup_latest(context.get("view", {}), item.get("isin")) or {}
+    quote = row.get("quote") if isinstance(row.get("quote"), dict) else {}
+
+    pct = quote.get("percent_change")
+    abs_pct = abs(float(pct)) if pct not in (None, "") else None
+    volatility = min(abs_pct / float(settings.get("volatility_ref_pct", 5.0) or 5.0), 1.0) if abs_pct is not None else 0.0
+    threshold = _alert_threshold_pct(cfg)
+    proximity = max(1.0 - abs(threshold - abs_pct) / threshold, 0.0) if abs_pct is not None else 0.0
+
+    baseline_key = str(item.get("isin") or item.get("symbol") or "")
+    ratio = score_volume({**quote, "status": "ok"}, context.get("baseline", {}).get(baseline_key)).get("ratio") if quote else None
+    spike_ratio = float(settings.get("volume_spike_ratio", 1.8) or 1.8)
+    volume = min(max(float(ratio) - 1.0, 0.0) / max(spike_ratio - 1.0, 0.01), 1.0) if ratio is not None else 0.0
+
+    matched = int(score_news(context.get("news", []), item).get("matched_count", 0) or 0)
+    news = min(matched / float(settings.get("news_hits_ref", 3) or 3), 1.0)
+
+    last_raw = (state.get("voi_last_selected") or {}).get(_key(item))
+    staleness = 1.0
+    if last_raw:
+        try:
+            minutes = (now_dt - datetime.fromisoformat(str(last_raw))).total_seconds() / 60
+            staleness = min(max(minutes, 0.0) / float(settings.get("staleness_cap_minutes", 120) or 120), 1.0)
+        except ValueError:
+            staleness = 1.0
+
+    return {
+        "volatility": round(volatility, 4),
+        "volume": round(volume, 4),
+        "news": round(news, 4),
+        "threshold": round(proximity, 4),
+        "staleness": round(staleness, 4),
+    }
+
+
+def information_score(components: dict[str, float], cfg: dict) -> float:
+    weights = {**DEFAULT_WEIGHTS, **(_voi_cfg(cfg).get("weights") or {})}
+    return round(sum(float(weights.get(name, 0) or 0) * value for name, value in components.items()), 4)
+
+
+def select_by_information_value(
+    pool: list[dict],
+    slots: int,
+    state: dict,
+    cfg: dict,
+    holdings_count: int = 0,
+    now_dt: datetime | None = None,
+    context: dict | None = None,
+) -> list[dict]:
+    """Pick scanner assets greedily by information value; fresh cache hits go first since they cost no API credit.
+
+    Every other symbol takes one slot of a batch (1/batch_size credit), bounded by what the run budget leaves after holdings.
+    """
+    if not pool or slots <= 0:
+        return []
+    ref = now_dt or datetime.now()
+    active = context if context is not None else build_voi_context(cfg)
+    batch_size = max(int(v2_marketdata(cfg).get("batch_size", 8) or 8), 1)
+    per_run_budget = int(api_governor_cfg(cfg).get("per_run_budget", 20) or 20)
+    paid_slots = max(per_run_budget - math.ceil(holdings_count / batch_size), 0) * batch_size
+
+    ranked: list[dict] = []
+    for item in pool:
+        components = information_components(item, active, state, cfg, ref)
+        score = information_score(components, cfg)
+        cost = 0.0 if _key(item) in active.get("cached", {}) else 1.0 / batch_size
+        ranked.append({"item": item, "score": score, "cost": cost, "components": components})
+    # Paid symbols all cost the same batch share, so among them the score alone decides.
+    ranked.sort(key=lambda row: (row["cost"] > 0, -row["score"], _key(row["item"])))
+
+    chosen: list[dict] = []
+    for row in ranked:
+        if len(chosen) >= slots:
+            break
+        if row["cost"] > 0:
+            if paid_slots <= 0:
+                continue
+            paid_slots -= 1
+        chosen.append(row)
+
+    last_selected = dict(state.get("voi_last_selected") or {})
+    for row in chosen:
+        last_selected[_key(row["item"])] = ref.isoformat(timespec="seconds")
+    state["voi_last_selected"] = last_selected
+
+    log_usage(
+        {
+            "kind": "voi_selection",
+            "symbols_count": len(chosen),
+            "cost": 0,
+            "pool_size": len(pool),
+            "selected": [
+                {"symbol": _key(row["item"]), "score": row["score"], "cost": round(row["cost"], 4), "reasons": row["components"]}
+                for row in chosen
+            ],
+        },
+        cfg,
+    )
+    log.warning("v2_voi_selection: pool=%s selected=%s paid_slots_left=%s", len(pool), len(chosen), paid_slots)
+    return [row["item"] for row in chosen]
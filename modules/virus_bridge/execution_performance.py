@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from modules.common.latest_quotes import load_v2_view
 from modules.common.utils import read_json
+from modules.v2.marketdata.quote_cache import fresh_quote_map
 from modules.virus_bridge.data_quality import compute_quote_age_minutes, is_quote_fresh
 from modules.virus_bridge.exit_flow import EXIT_REASON_LABELS, load_exit_records as _load_exit_records
 from modules.virus_bridge.lifecycle import load_lifecycle
@@ -191,32 +193,28 @@ def _candidate_quote(ticket_id: str, cfg: dict) -> dict | None:
 
 
 def _latest_quote_map(cfg: dict) -> dict[str, dict]:
-    root = _root_dir(cfg) / str(cfg.get("v2", {}).get("data_dir", "data/v2"))
-    files = sorted(root.glob("candidates_*.json"))
-    if not files:
-        return {}
-    try:
-        payload = read_json(files[-1])
-    except Exception:
-        return {}
-    rows = payload.get("candidates", []) if isinstance(payload, dict) else payload
     out: dict[str, dict] = {}
-    for row in rows if isinstance(rows, list) else []:
-        if not isinstance(row, dict):
-            continue
+    view = load_v2_view(_root_dir(cfg) / str(cfg.get("v2", {}).get("data_dir", "data/v2")))
+    for key, row in view.get("symbols", {}).items():
         quote = row.get("quote") or {}
         price = _safe_float(quote.get("price") or quote.get("last_price"))
         if price is None:
             continue
-        snapshot = {
+        out[key] = {
             "price": price,
             "currency": str(quote.get("currency") or row.get("currency") or "").strip().upper() or None,
             "timestamp": quote.get("timestamp") or row.get("timestamp"),
         }
-        for key in (row.get("symbol"), row.get("isin")):
-            needle = str(key or "").strip().upper()
-            if needle:
-                out[needle] = snapshot
+    for isin, key in view.get("isins", {}).items():
+        if key in out:
+            out[isin] = out[key]
+    # Telegram commands mark `_quote_consumer` so their freshness policy applies instead of the bridge one.
+    for needle, quote in fresh_quote_map(cfg, consumer=str(cfg.get("_quote_consumer") or "bridge")).items():
+        price = _safe_float(quote.get("price"))
+        if price is None:
+            continue
+        currency = str(quote.get("currency") or "").strip().upper() or (out.get(needle) or {}).get("currency")
+        out[needle] = {"price": price, "currency": currency, "timestamp": quote.get("timestamp")}
     return out
 
 
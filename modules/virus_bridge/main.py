@@ -16,7 +16,7 @@ from modules.virus_bridge.entry_stop import derive_entry_hint, derive_stop_hint
 from modules.virus_bridge.execution_flow import load_ticket_state, render_ticket_command_text, save_ticket_state, set_active_ticket
 from modules.virus_bridge.intake import dedupe_pending_proposals, load_pending_proposals
 from modules.virus_bridge.lifecycle import init_lifecycle, record_ticket_lifecycle_event
-from modules.virus_bridge.risk_eval import evaluate_proposal
+from modules.virus_bridge.risk_eval import evaluate_proposal, open_positions_index
 from modules.virus_bridge.ticket_render import render_ticket_text
 from modules.virus_bridge.trade_candidate import build_trade_candidate, write_trade_candidate
 
@@ -180,9 +180,10 @@ def run(cfg: dict | None = None) -> dict:
         "rejected": 0,
     }
     written_paths: list[str] = []
+    positions_index = open_positions_index(active_cfg)
 
     for idx, proposal in enumerate(deduped, start=1):
-        risk_eval = evaluate_proposal(proposal, active_cfg)
+        risk_eval = evaluate_proposal(proposal, active_cfg, positions_index=positions_index)
         quote = proposal.get("quote") if isinstance(proposal.get("quote"), dict) else {}
         enriched_proposal = {
             **proposal,
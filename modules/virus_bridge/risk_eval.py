@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
 
+from modules.common.holdings_index import build_holdings_index
 from modules.common.utils import read_json
 from modules.virus_bridge.budget import get_budget_context, suggest_position_size
 from modules.virus_bridge.data_quality import compute_quote_age_minutes, is_quote_fresh
@@ -44,6 +45,10 @@ def _position_exposure(position: dict) -> float:
     return 0.0
 
 
+def open_positions_index(cfg: dict) -> dict:
+    return build_holdings_index(_open_positions(cfg), exposure=_position_exposure)
+
+
 def _clip_sizes(size_min: float, size_max: float, suggested: float, limit: float) -> tuple[float, float, float]:
     allowed = max(0.0, float(limit or 0))
     if allowed <= 0:
@@ -148,7 +153,7 @@ def _result(
     }
 
 
-def evaluate_proposal(signal_proposal: dict, cfg: dict) -> dict:
+def evaluate_proposal(signal_proposal: dict, cfg: dict, positions_index: dict | None = None) -> dict:
     asset = signal_proposal.get("asset") or {}
     isin = str(asset.get("isin") or signal_proposal.get("isin") or "").strip().upper()
     symbol = str(asset.get("symbol") or signal_proposal.get("symbol") or "").strip().upper() or None
@@ -213,7 +218,7 @@ def evaluate_proposal(signal_proposal: dict, cfg: dict) -> dict:
     signal_strength = str(signal_proposal.get("signal_strength") or "spekulativ").lower()
     market_regime = str(signal_proposal.get("market_regime") or "neutral").lower()
     budget = get_budget_context(cfg)
-    positions = _open_positions(cfg)
+    open_index = positions_index if positions_index is not None else open_positions_index(cfg)
     thresholds = _thresholds(cfg)
 
     if score < thresholds["min_reduced_score"]:
@@ -264,7 +269,7 @@ def evaluate_proposal(signal_proposal: dict, cfg: dict) -> dict:
             _push(reasons, "Defensive Marktlage")
             size_min, size_max, suggested = _clip_sizes(size_min, size_max, suggested, max(suggested * 0.7, size_min))
 
-    if len(positions) >= int(budget["max_positions"]):
+    if open_index["count"] >= int(budget["max_positions"]):
         _push(reasons, "Maximale Positionszahl erreicht")
         _push(risk_flags, "max_positions")
         return _result(
@@ -285,7 +290,7 @@ def evaluate_proposal(signal_proposal: dict, cfg: dict) -> dict:
             data_fresh,
         )
 
-    current_exposure = sum(_position_exposure(position) for position in positions)
+    current_exposure = open_index["total_exposure_eur"]
     max_exposure = float(budget["budget_eur"]) * float(budget["max_total_exposure_pct"]) / 100.0
     remaining_exposure = max_exposure - current_exposure
     if remaining_exposure <= 0:
@@ -5,7 +5,9 @@ from pathlib import Path
 from modules.briefing.delta import compute_delta, find_previous_briefing, load_previous_briefing
 from modules.briefing.helpers import briefing_text
 from modules.briefing.regime import compute_market_regime
-from modules.briefing.volume_lights import compute_volume_light, load_volume_baseline
+from modules.briefing.morning import _latest_quotes, _quotes_by_isin
+from modules.briefing.volume_lights import compute_volume_light, compute_volume_lights_for_holdings, load_volume_baseline
+from modules.common.latest_quotes import update_marketdata_view
 def test_delta_no_previous_briefing(tmp_path: Path) -> None:
     prev = find_previous_briefing(tmp_path, 7)
     assert prev is None
@@ -57,3 +59,16 @@ def test_telegram_text_contains_new_blocks_and_limit(tmp_path: Path) -> None:
     assert "Delta" in text
     assert "Regime" in text
     assert len(text) < 3500
+
+
+def test_volume_lights_read_holdings_from_latest_quote_view(tmp_path: Path) -> None:
+    quotes_dir = tmp_path / "data" / "marketdata"
+    quotes_file = quotes_dir / "quotes_20261019.jsonl"
+    update_marketdata_view(quotes_dir, [{"symbol": "BAS.DE", "isin": "DE000BASF111", "status": "ok", "volume": 500}], quotes_file)
+    positions = [{"isin": "DE000BASF111", "name": "BASF"}]
+    baseline = {"DE000BASF111": {"volumes_last_n": [100, 100, 100]}}
+
+    quotes = _quotes_by_isin(_latest_quotes(tmp_path), positions)
+    lights = compute_volume_lights_for_holdings(positions, quotes, baseline, {"min_volume_points": 3})
+    assert lights[0]["light"] == "green"
+    assert lights[0]["ratio"] == 5.0
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+
+from modules.common.dedup_store import COMPACT_MIN_DEAD, DedupStore
+
+DAY = 86400
+
+
+def _lines(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_keys_expire_after_retention_and_journal_is_append_only(tmp_path) -> None:
+    path = tmp_path / "dedup_journal.jsonl"
+    store = DedupStore(path, retention_days=2, now=10 * DAY)
+    assert store.add("a") and not store.add("a")
+    store.flush()
+
+    store = DedupStore(path, retention_days=2, now=11 * DAY)
+    assert "a" in store
+    assert store.add("b")
+    store.flush()
+    assert [row["k"] for row in _lines(path)] == ["a", "b"]
+
+    store = DedupStore(path, retention_days=2, now=12.5 * DAY)
+    assert "a" not in store and "b" in store
+    assert store.add("a")
+
+
+def test_compaction_drops_expired_lines_and_migrates_legacy_set(tmp_path) -> None:
+    legacy = tmp_path / "dedup_set.json"
+    legacy.write_text(json.dumps(["old1", "old2"]), encoding="utf-8")
+    path = tmp_path / "dedup_journal.jsonl"
+
+    store = DedupStore(path, retention_days=1, legacy_path=legacy, now=0)
+    assert "old1" in store
+    store.flush()
+    assert not legacy.exists()
+    assert sorted(row["k"] for row in _lines(path)) == ["old1", "old2"]
+
+    store = DedupStore(path, retention_days=1, now=DAY // 2)
+    for idx in range(COMPACT_MIN_DEAD):
+        store.add(f"k{idx}")
+    store.flush()
+
+    store = DedupStore(path, retention_days=1, now=DAY + DAY // 4)
+    assert len(store) == COMPACT_MIN_DEAD
+    store.add("fresh")
+    store.flush()
+    assert len(_lines(path)) == COMPACT_MIN_DEAD + 3
+
+    store = DedupStore(path, retention_days=1, now=2 * DAY)
+    store.flush()
+    assert [row["k"] for row in _lines(path)] == ["fresh"]
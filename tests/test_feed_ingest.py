@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from modules.news_tracker.feeds import pull_feeds
+from modules.news_tracker.ingest import ingest_feeds
+from modules.radar.crawler import pull_radar_feeds
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>shared</title>
+<item><title>Bayer AG hebt Prognose an</title><link>https://example.test/1</link><updated>2026-10-19T08:00:00Z</updated></item>
+<item><title>DAX schliesst fester</title><link>https://example.test/2</link></item>
+</channel></rss>"""
+
+
+def _serve() -> tuple[ThreadingHTTPServer, list[str]]:
+    hits: list[str] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            hits.append(str(self.headers.get("If-None-Match")))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = RSS.encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def test_news_and_radar_share_one_fetch_per_cycle(tmp_path) -> None:
+    server, hits = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+    cfg = {"app": {"root_dir": str(tmp_path)}, "radar": {"sources": {"rss_feeds": [url]}}, "news": {"fetch": {"cycle_seconds": 600}}}
+    entities = {"entities": [{"isin": "DE000BAY0017", "keywords": ["Bayer"]}]}
+    try:
+        news = pull_feeds([{"name": "Shared", "url": url}], entities, tmp_path / "data" / "news", fetch_cfg=cfg["news"]["fetch"])
+        radar_path = pull_radar_feeds(cfg, tmp_path / "data" / "radar")
+    finally:
+        server.shutdown()
+
+    assert hits == ["None"]
+    assert [item["title"] for item in news["items"]] == ["Bayer AG hebt Prognose an"]
+    radar_rows = [json.loads(line) for line in open(radar_path, encoding="utf-8")]
+    assert [row["title"] for row in radar_rows] == ["Bayer AG hebt Prognose an", "DAX schliesst fester"]
+    assert radar_rows[0]["published"] == "2026-10-19T08:00:00Z"
+    stored = list((tmp_path / "data" / "feeds" / "entries").glob("*.json"))
+    assert len(stored) == 1
+
+
+def test_not_modified_serves_stored_entries_without_parsing(tmp_path) -> None:
+    server, hits = _serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+    sources = [{"name": "A", "url": url}, {"name": "B", "url": url}]
+    try:
+        first = ingest_feeds(sources, tmp_path, {"cycle_seconds": 600}, now=1000)
+        cached = ingest_feeds(sources[:1], tmp_path, {"cycle_seconds": 600}, now=1200)
+        revalidated = ingest_feeds(sources[:1], tmp_path, {"cycle_seconds": 600}, now=2000)
+    finally:
+        server.shutdown()
+
+    assert hits == ["None", '"v1"']
+    assert [(row["source"], row["status"], len(row["entries"])) for row in first] == [("A", "ok", 2), ("B", "ok", 2)]
+    assert (cached[0]["status"], cached[0]["parsed"]) == ("cached", False)
+    assert (revalidated[0]["status"], revalidated[0]["parsed"], len(revalidated[0]["entries"])) == ("not_modified", False, 2)
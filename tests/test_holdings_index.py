@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from modules.common.holdings_index import build_holdings_index, cluster_weight, find_holding, weights_desc
+from modules.common.utils import write_json
+from modules.optimizer_engine.heuristics import propose_rebalance
+from modules.v2.scoring.portfolio_priority import compute_portfolio_priority
+from modules.virus_bridge.risk_eval import evaluate_proposal, open_positions_index
+
+HOLDINGS = [
+    {"isin": "DE000BASF111", "symbol": "BAS.DE", "weight_pct": 22.0, "sector": "materials"},
+    {"isin": "DE0008404005", "symbol": "ALV.DE", "weight_pct": 12.0, "sector": "financials", "theme": "insurance"},
+    {"isin": "DE000BAY0017", "symbol": "BAYN.DE", "weight_pct": 9.0, "sector": "materials"},
+    {"isin": "DE000MUV2001", "symbol": "BAS.DE", "weight_pct": 1.0, "sector": "financials"},
+]
+
+
+def test_index_resolves_isin_and_symbol_and_totals_clusters() -> None:
+    index = build_holdings_index(HOLDINGS)
+
+    assert find_holding(index, "DE000BASF111") is HOLDINGS[0]
+    assert find_holding(index, "BAS.DE") is HOLDINGS[0]
+    assert find_holding(index, "") is None
+    assert cluster_weight(index, "sector", "materials") == 31.0
+    assert cluster_weight(index, "theme", "insurance") == 12.0
+    assert index["cluster_risk"]["sector"] == {"materials": "medium", "financials": "low"}
+    assert [row["symbol"] for row in weights_desc(index)][:2] == ["BAS.DE", "ALV.DE"]
+
+
+def test_portfolio_priority_uses_shared_index() -> None:
+    index = build_holdings_index(HOLDINGS)
+    candidate = {"isin": "DE000BAY0017", "symbol": "BAYN.DE"}
+
+    priority = compute_portfolio_priority(candidate, HOLDINGS, index=index)
+
+    assert priority == 0.55
+    assert candidate["portfolio_context"] == {
+        "is_holding": True,
+        "weight_pct": 9.0,
+        "cluster_field": "sector",
+        "cluster_value": "materials",
+        "concentration_weight_pct": 31.0,
+        "concentration_risk": "medium",
+    }
+    assert compute_portfolio_priority({"symbol": "SAP.DE", "weight_pct": 2}, HOLDINGS) == 0.0
+
+
+def test_optimizer_and_risk_eval_accept_a_prebuilt_index(tmp_path) -> None:
+    snapshot = {
+        "computed_total_eur": 1000,
+        "positions": [
+            {"isin": "A", "name": "Alpha", "market_value_eur": 500, "instrument_type": "stock"},
+            {"isin": "B", "name": "Beta", "market_value_eur": 300, "instrument_type": "stock"},
+        ],
+    }
+    proposal = propose_rebalance(snapshot, {"concentration": {"top3_pct": 80}}, {"optimizer": {"rebalance": {"max_position_weight_pct": 60}}})
+    assert [action["isin"] for action in proposal["actions"]] == ["A", "B"]
+
+    write_json(
+        tmp_path / "data" / "virus_bridge" / "open_positions.json",
+        {"positions": [{"isin": "X", "size_eur": 1800}, {"isin": "Y", "market_value_eur": 1300}]},
+    )
+    write_json(
+        tmp_path / "config" / "universe_tr_verified.json",
+        {"US0079031078": {"symbol": "AMD", "tr_verified": True, "asset_type": "stock", "currency": "USD"}},
+    )
+    cfg = {"app": {"root_dir": str(tmp_path)}, "virus_bridge": {"tr_universe_path": "config/universe_tr_verified.json"}, "hedgefund": {"budget_eur": 5000, "max_positions": 3, "max_total_exposure_pct": 60}}
+    index = open_positions_index(cfg)
+    assert index["count"] == 2
+    assert index["total_exposure_eur"] == 3100.0
+
+    result = evaluate_proposal(
+        {
+            "classification": "KAUFIDEE_PRUEFEN",
+            "asset": {"symbol": "AMD", "isin": "US0079031078"},
+            "score": 7.2,
+            "signal_strength": "hoch",
+            "quote": {"last_price": 197.69, "timestamp": "2026-03-10T16:00:00+01:00"},
+            "timestamp": "2026-03-10T16:00:00+01:00",
+        },
+        cfg,
+        positions_index={**index, "total_exposure_eur": 3000.0},
+    )
+    assert "max_exposure" in result["risk_flags"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+from modules.common.latest_quotes import (
+    load_marketdata_view,
+    load_v2_view,
+    lookup_latest,
+    update_marketdata_view,
+    update_v2_view,
+    view_path,
+)
+from modules.common.utils import write_json
+from modules.v2.marketdata.fallback_router import get_quotes_with_fallback
+
+
+def test_marketdata_view_is_updated_in_place_and_keyed_by_symbol_and_isin(tmp_path) -> None:
+    quotes_dir = tmp_path / "data" / "marketdata"
+    quotes_path = quotes_dir / "quotes_20260310.jsonl"
+    update_marketdata_view(
+        quotes_dir,
+        [
+            {"isin": "DE000BASF111", "symbol": "bas.de", "status": "ok", "close": 50.0},
+            {"isin": "DE0007164600", "symbol": "sap.de", "status": "provider_error"},
+        ],
+        quotes_path,
+    )
+    update_marketdata_view(quotes_dir, [{"isin": "DE000BASF111", "symbol": "bas.de", "status": "ok", "close": 51.0}], quotes_path)
+    quotes_path.write_text("", encoding="utf-8")
+
+    view = load_marketdata_view(quotes_dir)
+
+    assert lookup_latest(view, "BAS.DE")["close"] == 51.0
+    assert lookup_latest(view, "DE000BASF111")["close"] == 51.0
+    assert lookup_latest(view, "sap.de") is None
+
+
+def test_view_is_rebuilt_once_when_newer_file_was_written_without_it(tmp_path) -> None:
+    v2_dir = tmp_path / "data" / "v2"
+    update_v2_view(v2_dir, [{"symbol": "AMD", "isin": "ISIN-AMD", "quote": {"price": 100.0}}], v2_dir / "candidates_20260310_1000.json")
+    write_json(
+        v2_dir / "candidates_20260310_1015.json",
+        {"candidates": [{"symbol": "AMD", "isin": "ISIN-AMD", "quote": {"price": 105.0, "currency": "USD"}}, {"symbol": "X", "quote": {}}]},
+    )
+
+    view = load_v2_view(v2_dir)
+
+    assert view["source_file"] == "candidates_20260310_1015.json"
+    assert lookup_latest(view, "ISIN-AMD")["quote"]["price"] == 105.0
+    assert lookup_latest(view, "X") is None
+    assert json.loads(view_path(v2_dir).read_text(encoding="utf-8"))["source_file"] == "candidates_20260310_1015.json"
+
+
+def test_fallback_router_reads_cached_stooq_quote_from_view(tmp_path) -> None:
+    quotes_dir = tmp_path / "data" / "marketdata"
+    update_marketdata_view(
+        quotes_dir,
+        [{"symbol": "bas.de", "status": "ok", "open": 50.0, "close": 51.0, "date": "2026-03-10", "time": "10:00"}],
+        quotes_dir / "quotes_20260310.jsonl",
+    )
+    (quotes_dir / "quotes_20260310.jsonl").write_text("", encoding="utf-8")
+
+    rows = get_quotes_with_fallback(
+        ["BAS.DE"],
+        cfg={"app": {"root_dir": str(tmp_path)}, "v2": {"quote_cache": {"enabled": False}}},
+        live_fallback_limit=0,
+    )
+
+    assert rows[0]["status"] == "ok"
+    assert rows[0]["price"] == 51.0
+    assert rows[0]["provider"] == "fallback"
+
+
+def test_view_starts_empty_when_a_new_day_file_becomes_the_source(tmp_path) -> None:
+    quotes_dir = tmp_path / "data" / "marketdata"
+    update_marketdata_view(quotes_dir, [{"symbol": "bas.de", "status": "ok", "close": 50.0}], quotes_dir / "quotes_20260310.jsonl")
+    update_marketdata_view(quotes_dir, [{"symbol": "sap.de", "status": "ok", "close": 180.0}], quotes_dir / "quotes_20260310.jsonl")
+    update_marketdata_view(quotes_dir, [{"symbol": "sap.de", "status": "ok", "close": 181.0}], quotes_dir / "quotes_20260311.jsonl")
+
+    view = load_marketdata_view(quotes_dir)
+
+    assert lookup_latest(view, "sap.de")["close"] == 181.0
+    assert lookup_latest(view, "bas.de") is None
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from modules.news_tracker.feeds import pull_feeds
+from modules.news_tracker.matcher import KeywordAutomaton
+from modules.v2.scanner.news_impact import score_news
+
+ENTITIES = {
+    "entities": [
+        {"isin": "DE0005140008", "name": "Deutsche Bank AG", "keywords": ["Deutsche Bank AG", "DE0005140008", "Deutsche Bank"]},
+        {"isin": "DE000BAY0017", "name": "Bayer AG", "keywords": ["Bayer AG", "DE000BAY0017", "Bayer"]},
+        {"isin": "US0000000BNK", "name": "Bank", "keywords": ["bank"]},
+    ]
+}
+
+
+def test_automaton_returns_all_overlapping_entities_in_entity_order() -> None:
+    matcher = KeywordAutomaton(ENTITIES["entities"])
+
+    assert matcher.match("BAYER und DEUTSCHE BANK melden Zahlen") == ["DE0005140008", "DE000BAY0017", "US0000000BNK"]
+    assert matcher.match("Bankenaufsicht") == ["US0000000BNK"]
+    assert matcher.match("Siemens Energy") == []
+    assert not KeywordAutomaton([])
+
+
+def test_pull_feeds_tags_items_with_matched_entity_ids(tmp_path) -> None:
+    feed = tmp_path / "feed.xml"
+    feed.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>
+<item><title>Bayer AG hebt Prognose an</title><link>https://example.test/1</link><description>Earnings beat</description></item>
+<item><title>Siemens Energy</title><link>https://example.test/2</link><description>Nothing</description></item>
+</channel></rss>""",
+        encoding="utf-8",
+    )
+
+    pulled = pull_feeds([{"name": "IR", "url": str(feed)}], ENTITIES, tmp_path / "news")
+
+    assert [item["entity_ids"] for item in pulled["items"]] == [["DE000BAY0017"]]
+    instrument = {"symbol": "BAYN.DE", "isin": "DE000BAY0017", "name": "Bayer AG"}
+    tagged_only = [{"title": "Kurz gemeldet", "summary": "", "source": "IR", "entity_ids": ["DE000BAY0017"]}]
+    assert score_news(tagged_only, instrument)["matched_count"] == 1
+    assert score_news(pulled["items"], instrument)["matched_count"] == 1
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from modules.news_tracker.feeds import pull_feeds
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>{name}</title>
+<item><title>Bayer AG hebt Prognose an</title><link>https://example.test/{name}/1</link>
+<description>Bayer Aktie steigt</description><pubDate>Mon, 19 Oct 2026 08:00:00 GMT</pubDate></item>
+<item><title>Unrelated headline</title><link>https://example.test/{name}/2</link><description>Nothing</description></item>
+</channel></rss>"""
+
+ENTITIES = {"entities": [{"name": "Bayer AG", "keywords": ["Bayer"]}]}
+
+
+def _serve(delay_sec: float = 0.0) -> tuple[ThreadingHTTPServer, list[dict]]:
+    seen: list[dict] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            name = self.path.strip("/")
+            etag = f'"{name}-v1"'
+            seen.append({"path": self.path, "if_none_match": self.headers.get("If-None-Match")})
+            if name == "broken":
+                self.send_response(500)
+                self.end_headers()
+                return
+            time.sleep(delay_sec)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = RSS.format(name=name).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Mon, 19 Oct 2026 08:00:00 GMT")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, seen
+
+
+def _read_log(out_dir) -> list[dict]:
+    path = next(out_dir.glob("feed_fetch_*.jsonl"))
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_second_pull_sends_validators_and_skips_parsing_on_304(tmp_path) -> None:
+    server, seen = _serve()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    sources = [{"name": "IR", "url": f"{base}/ir"}, {"name": "Broken", "url": f"{base}/broken"}]
+    try:
+        first = pull_feeds(sources, ENTITIES, tmp_path, fetch_cfg={"cycle_seconds": 0}, store_dir=tmp_path / "feeds")
+        second = pull_feeds(sources, ENTITIES, tmp_path, fetch_cfg={"cycle_seconds": 0}, store_dir=tmp_path / "feeds")
+    finally:
+        server.shutdown()
+
+    assert first["count"] == 1
+    assert first["items"][0]["source_url"] == f"{base}/ir"
+    assert second["count"] == 0
+    validators = json.loads((tmp_path / "feeds" / "feed_validators.json").read_text(encoding="utf-8"))
+    assert validators[f"{base}/ir"]["etag"] == '"ir-v1"'
+    assert f"{base}/broken" not in validators
+    assert [row["if_none_match"] for row in seen if row["path"] == "/ir"] == [None, '"ir-v1"']
+
+    log = _read_log(tmp_path)
+    ir_rows = [row for row in log if row["source"] == "IR"]
+    assert [row["status"] for row in ir_rows] == ["ok", "not_modified"]
+    assert ir_rows[0]["bytes"] > 0 and ir_rows[0]["entries"] == 2
+    assert ir_rows[1]["entries"] is None
+    assert all(row["latency_ms"] is not None for row in log)
+    assert [row["http_status"] for row in log if row["source"] == "Broken"] == [500, 500]
+
+
+def test_sources_are_fetched_concurrently_with_per_source_timeout(tmp_path) -> None:
+    server, _seen = _serve(delay_sec=0.3)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    sources = [{"name": f"S{idx}", "url": f"{base}/s{idx}"} for idx in range(4)]
+    try:
+        started = time.monotonic()
+        pulled = pull_feeds(sources, ENTITIES, tmp_path, fetch_cfg={"max_workers": 4, "timeout_sec": 5}, store_dir=tmp_path / "feeds")
+        elapsed = time.monotonic() - started
+        timed_out = pull_feeds(
+            [{"name": "Slow", "url": f"{base}/slow"}], ENTITIES, tmp_path / "slow", fetch_cfg={"timeout_sec": 0.05}, store_dir=tmp_path / "feeds"
+        )
+    finally:
+        server.shutdown()
+
+    assert pulled["count"] == 4
+    assert [item["source"] for item in pulled["items"]] == ["S0", "S1", "S2", "S3"]
+    assert elapsed < 1.0
+    assert timed_out["count"] == 0
+    assert _read_log(tmp_path / "slow")[0]["status"] == "error"
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+
+from modules.news_tracker.feeds import pull_feeds
+from modules.news_tracker.high_water import entries_since_mark, mark_for
+
+ITEM = "<item><title>{title}</title><link>https://example.test/{slug}</link><pubDate>{date}</pubDate></item>"
+
+
+def _entry(slug: str, ts: float | None) -> dict:
+    return {"title": slug, "link": f"https://example.test/{slug}", "guid": None, "published_ts": ts}
+
+
+def _write_feed(path, rows: list[tuple[str, str, str]]) -> None:
+    items = "".join(ITEM.format(title=title, slug=slug, date=date) for title, slug, date in rows)
+    path.write_text(f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>', encoding="utf-8")
+
+
+def test_scan_stops_at_mark_unless_feed_reorders() -> None:
+    entries = [_entry("c", 30), _entry("b", 20), _entry("a", 10)]
+    mark = mark_for(entries[1:])
+
+    assert entries_since_mark(entries, mark) == (entries[:1], True)
+    assert entries_since_mark(entries, mark, full_scan=True) == (entries, False)
+    assert entries_since_mark(entries, None) == (entries, False)
+    assert entries_since_mark(entries, mark_for([_entry("gone", 5)])) == (entries, False)
+
+    reordered = [_entry("c", 30), _entry("d", 40), _entry("b", 20)]
+    assert entries_since_mark(reordered, mark) == (reordered, False)
+
+
+def test_quiet_feed_scans_nothing_and_new_head_entries_are_picked_up(tmp_path) -> None:
+    feed = tmp_path / "feed.xml"
+    old_rows = [("Bayer Q3", "q3", "Mon, 19 Oct 2026 08:00:00 GMT"), ("Bayer Q2", "q2", "Mon, 19 Jul 2026 08:00:00 GMT")]
+    _write_feed(feed, old_rows)
+    entities = {"entities": [{"isin": "DE000BAY0017", "keywords": ["Bayer"]}]}
+    news_dir = tmp_path / "news"
+
+    def _pull() -> dict:
+        return pull_feeds([{"name": "IR", "url": str(feed)}], entities, news_dir, store_dir=tmp_path / "feeds")
+
+    assert _pull()["count"] == 2
+    assert _pull()["count"] == 0
+    _write_feed(feed, [("Bayer Prognose", "new", "Mon, 19 Oct 2026 10:00:00 GMT"), *old_rows])
+    assert [item["title"] for item in _pull()["items"]] == ["Bayer Prognose"]
+
+    log = [json.loads(line) for line in next(news_dir.glob("feed_fetch_*.jsonl")).read_text(encoding="utf-8").splitlines()]
+    assert [row["scanned"] for row in log] == [2, 0, 1]
+
+
+def test_oldest_first_feed_keeps_new_bottom_entries() -> None:
+    first = [_entry("a", 10), _entry("b", 20)]
+    mark = mark_for(first)
+    assert mark["title"] == "b"
+
+    later = [*first, _entry("c", 30)]
+    assert entries_since_mark(later, mark) == (later, False)
+    assert entries_since_mark([_entry("b", 20), _entry("c", 30)], mark) == ([_entry("b", 20), _entry("c", 30)], False)
+
+
+def test_pinned_top_item_does_not_hide_new_entries() -> None:
+    pinned = _entry("pinned", 1)
+    mark = mark_for([pinned, _entry("b", 20), _entry("a", 10)])
+    assert mark["title"] == "b"
+
+    later = [pinned, _entry("c", 30), _entry("b", 20), _entry("a", 10)]
+    assert entries_since_mark(later, mark) == (later, False)
+
+
+def test_oldest_first_feed_delivers_appended_items_on_every_pull(tmp_path) -> None:
+    feed = tmp_path / "feed.xml"
+    rows = [("Bayer Q2", "q2", "Mon, 19 Jul 2026 08:00:00 GMT"), ("Bayer Q3", "q3", "Mon, 19 Oct 2026 08:00:00 GMT")]
+    _write_feed(feed, rows)
+    entities = {"entities": [{"isin": "DE000BAY0017", "keywords": ["Bayer"]}]}
+
+    def _pull() -> dict:
+        return pull_feeds([{"name": "IR", "url": str(feed)}], entities, tmp_path / "news", store_dir=tmp_path / "feeds")
+
+    assert _pull()["count"] == 2
+    _write_feed(feed, [*rows, ("Bayer Prognose", "new", "Mon, 19 Oct 2026 10:00:00 GMT")])
+    assert [item["title"] for item in _pull()["items"]] == ["Bayer Prognose"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from modules.news_tracker import main as news_main
+from modules.news_tracker.ranker import rank_opportunities, top_from_index, update_index
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _append(path, rows: list[dict]) -> None:
+    with path.open("a", encoding="utf-8") as fh:
+        fh.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+def test_index_scores_only_appended_lines_and_restarts_on_rewrite(tmp_path) -> None:
+    items = tmp_path / "items_translated_20261019.jsonl"
+    _append(items, [{"id": "a", "title": "Bayer earnings", "published": "2026-10-19T11:00:00+00:00"}])
+    index = {"fingerprint": None, "offset": 0, "seq": 0, "entries": {}}
+
+    assert update_index(index, items) == 1
+    _append(items, [{"id": "b", "title": "Siemens outlook", "published": "2026-10-19T06:00:00+00:00"}, {"id": "a2", "cluster_id": "a", "title": "Bayer earnings copy"}])
+    with items.open("a", encoding="utf-8") as fh:
+        fh.write('{"id": "partial"')
+    assert update_index(index, items) == 1
+    assert index["entries"]["a"]["members"] == 2
+    assert update_index(index, items) == 0
+
+    items.write_text(json.dumps({"id": "z", "title": "Fresh file"}) + "\n", encoding="utf-8")
+    assert update_index(index, items) == 1
+    assert list(index["entries"]) == ["z"]
+
+
+def test_decay_is_applied_at_read_time(tmp_path) -> None:
+    items = tmp_path / "items_translated_20261019.jsonl"
+    _append(
+        items,
+        [
+            {"id": "old", "title": "Bayer earnings guidance", "published": "2026-10-18T12:00:00+00:00"},
+            {"id": "new", "title": "Siemens news", "published": "2026-10-19T11:00:00+00:00"},
+        ],
+    )
+    index = {"fingerprint": None, "offset": 0, "seq": 0, "entries": {}}
+    update_index(index, items)
+
+    now_rows = top_from_index(index, {}, now_ts=NOW)
+    assert [(row["id"], row["score"]) for row in now_rows] == [("old", 10.0), ("new", 9.83)]
+    later = top_from_index(index, {}, k=1, now_ts=NOW + 2 * 86400)
+    assert [(row["id"], row["score"]) for row in later] == [("old", 4.0)]
+
+    ranking = rank_opportunities(items, tmp_path / "top_opportunities_20261019.json")
+    assert {row["id"] for row in ranking["top"]} == {"old", "new"}
+    assert (tmp_path / "top_opportunities_20261019_index.json").exists()
+
+
+def test_news_main_sends_only_entries_new_to_the_day_top_list(tmp_path, monkeypatch) -> None:
+    (tmp_path / "data" / "snapshots").mkdir(parents=True)
+    (tmp_path / "data" / "snapshots" / "portfolio_20261019.json").write_text("{}", encoding="utf-8")
+    news_dir = tmp_path / "data" / "news"
+    items_path = news_dir / "items_20261019.jsonl"
+    batches = [
+        [{"id": "a", "title": "Bayer earnings", "lang": "de", "published": "2026-10-19T11:00:00+00:00"}],
+        [{"id": "b", "title": "Siemens outlook", "lang": "en", "published": "2026-10-19T10:00:00+00:00"}],
+        [],
+    ]
+
+    def _pull(*args, **kwargs) -> dict:
+        batch = batches.pop(0)
+        _append(items_path, batch)
+        return {"items_path": str(items_path), "items": batch}
+
+    sent: list[list[str]] = []
+    monkeypatch.setattr(news_main, "load_config", lambda: {"app": {"root_dir": str(tmp_path)}})
+    monkeypatch.setattr(news_main, "build_entities", lambda snapshot, path: {"entities": []})
+    monkeypatch.setattr(news_main, "pull_feeds", _pull)
+    monkeypatch.setattr(news_main, "send_top_opportunities", lambda top, cfg: sent.append([row["title_de"] for row in top]))
+
+    news_main.run()
+    index_file = next(news_dir.glob("top_opportunities_*_index.json"))
+    first = json.loads(index_file.read_text(encoding="utf-8"))
+    news_main.run()
+    second = json.loads(index_file.read_text(encoding="utf-8"))
+    news_main.run()
+
+    assert second["fingerprint"] == first["fingerprint"]
+    assert second["offset"] > first["offset"]
+    assert list(second["entries"]) == ["a", "b"]
+    assert sent == [["Bayer earnings"], ["[EN] Siemens outlook"], []]
+    ranking = json.loads(next(news_dir.glob("top_opportunities_????????.json")).read_text(encoding="utf-8"))
+    assert ranking["top"] == []
+    # v2 keeps reading only the current run's translated items.
+    assert next(news_dir.glob("items_translated_*.jsonl")).read_text(encoding="utf-8") == ""
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from modules.news_tracker.feeds import pull_feeds
+from modules.news_tracker.ingest import parse_published
+from modules.news_tracker.item_index import index_path, load_ts_index, read_items_since
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>
+<item><title>Bayer late</title><link>https://example.test/3</link><pubDate>Mon, 19 Oct 2026 12:00:00 +0200</pubDate></item>
+<item><title>Bayer early</title><link>https://example.test/1</link><pubDate>2026-10-19T06:00:00Z</pubDate></item>
+<item><title>Bayer naive</title><link>https://example.test/2</link><pubDate>2026-10-19 08:00</pubDate></item>
+<item><title>Bayer undated</title><link>https://example.test/4</link></item>
+</channel></rss>"""
+
+EARLY = 1792389600.0  # 2026-10-19T06:00:00Z
+
+
+def _dated(rows: list[dict]) -> list[str]:
+    # Undated items are indexed at their ingest time, which depends on the wall clock.
+    return [item["title"] for item in rows if item["published_ts"] is not None]
+
+
+def test_parse_published_flags_quality() -> None:
+    assert parse_published("Mon, 19 Oct 2026 08:00:00 +0200") == (EARLY, "tz")
+    assert parse_published("2026-10-19 06:00") == (EARLY, "naive_utc")
+    assert parse_published("garbage", (2026, 10, 19, 6, 0, 0, 0, 292, 0)) == (EARLY, "feed")
+    assert parse_published("garbage") == (None, "invalid")
+    assert parse_published(None) == (None, "missing")
+
+
+def test_ingest_stores_epoch_and_indexes_day_file_by_time(tmp_path) -> None:
+    feed = tmp_path / "feed.xml"
+    feed.write_text(FEED, encoding="utf-8")
+    entities = {"entities": [{"isin": "DE000BAY0017", "keywords": ["Bayer"]}]}
+
+    pulled = pull_feeds([{"name": "IR", "url": str(feed)}], entities, tmp_path / "news", store_dir=tmp_path / "feeds")
+
+    by_title = {item["title"]: item for item in pulled["items"]}
+    assert (by_title["Bayer early"]["published_ts"], by_title["Bayer early"]["published_quality"]) == (EARLY, "tz")
+    assert by_title["Bayer naive"]["published_quality"] == "naive_utc"
+    assert (by_title["Bayer undated"]["published_ts"], by_title["Bayer undated"]["published_quality"]) == (None, "missing")
+
+    items_path = pulled["items_path"]
+    assert index_path(items_path).exists()
+    assert _dated(read_items_since(items_path, EARLY + 3600, EARLY + 5 * 3600)) == ["Bayer naive", "Bayer late"]
+    assert _dated(read_items_since(items_path, 0, EARLY + 3 * 3600)) == ["Bayer early", "Bayer naive"]
+
+    with open(items_path, "a", encoding="utf-8") as fh:
+        fh.write('{"title": "appended elsewhere", "published_ts": 1.0}\n')
+    assert load_ts_index(items_path)["rows"][0][0] == 1.0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from modules.news_tracker.translate import TranslationMemory, translate_items, translate_stub
+
+
+class _EchoTranslator:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        self.batches.append(list(texts))
+        return [f"{target_lang}:{text.upper()}" for text in texts]
+
+
+def test_memory_sends_only_new_text_and_reports_hit_rate(tmp_path) -> None:
+    path = tmp_path / "translation_memory.json"
+    backend = _EchoTranslator()
+    items = [
+        {"title": "Profit  warning", "summary": "Guidance cut", "lang": "en"},
+        {"title": "Profit warning", "summary": "", "lang": "en"},
+        {"title": "Bayer hebt Prognose an", "summary": "x", "lang": "de"},
+    ]
+
+    memory = TranslationMemory(path)
+    translated, stats = translate_items(items, backend, memory, batch_size=1)
+    memory.save()
+
+    assert backend.batches == [["Profit warning"], ["Guidance cut"]]
+    assert [row["title_de"] for row in translated] == ["de:PROFIT WARNING", "de:PROFIT WARNING", "Bayer hebt Prognose an"]
+    assert [row["summary_de"] for row in translated] == [["de:GUIDANCE CUT"], [], []]
+    assert (stats["requested"], stats["unique"], stats["misses"], stats["batches"], stats["hit_rate"]) == (3, 2, 2, 2, 0.0)
+
+    backend.batches.clear()
+    again, stats = translate_items(items[:1] + [{"title": "New headline", "lang": "en"}], backend, TranslationMemory(path))
+    assert backend.batches == [["New headline"]]
+    assert again[0]["title_de"] == "de:PROFIT WARNING"
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 0.6667)
+
+
+def test_memory_keeps_most_recently_used_entries(tmp_path) -> None:
+    memory = TranslationMemory(tmp_path / "tm.json", max_entries=2)
+    for idx, key in enumerate(("a", "b", "c")):
+        memory.put(key, key.upper())
+        memory.entries[key]["used"] = idx
+    memory.save()
+
+    assert sorted(TranslationMemory(tmp_path / "tm.json").entries) == ["b", "c"]
+    assert translate_stub({"title": "Hi", "lang": "en"})["title_de"] == "[EN] Hi"
+
+
+class _FlakyTranslator:
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+
+    def translate_batch(self, texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+        if self.mode == "raise":
+            raise RuntimeError("backend down")
+        kept = texts[:-1] if len(texts) > 1 else texts
+        return [f"{target_lang}:{text}" for text in kept]
+
+
+def test_short_backend_result_falls_back_to_stub_for_that_batch(tmp_path) -> None:
+    items = [{"title": "Profit warning", "summary": "Guidance cut", "lang": "en"}, {"title": "Buyback", "lang": "en"}]
+    memory = TranslationMemory(tmp_path / "tm.json")
+
+    translated, stats = translate_items(items, _FlakyTranslator("short"), memory, batch_size=2)
+
+    assert [row["title_de"] for row in translated] == ["[EN] Profit warning", "de:Buyback"]
+    assert translated[0]["summary_de"] == ["(Übersetzung ausstehend)"]
+    assert stats["fallbacks"] == 2
+    assert [entry["text"] for entry in memory.entries.values()] == ["de:Buyback"]
+
+
+def test_backend_error_falls_back_to_stub_without_memorizing(tmp_path) -> None:
+    items = [{"title": "Profit warning", "summary": "Guidance cut", "lang": "en"}]
+    memory = TranslationMemory(tmp_path / "tm.json")
+
+    translated, stats = translate_items(items, _FlakyTranslator("raise"), memory)
+
+    assert translated[0]["title_de"] == "[EN] Profit warning"
+    assert translated[0]["summary_de"] == ["(Übersetzung ausstehend)"]
+    assert (stats["fallbacks"], memory.entries) == (2, {})
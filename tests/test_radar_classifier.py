@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+
+import modules.radar.ranker as ranker
+from modules.radar.ranker import RadarClassifier, rank_radar
+
+
+def test_classifier_scores_categories_priors_and_spam_in_one_pass() -> None:
+    cfg = {"radar": {"min_score": 4, "weights": {"us_tech": 4}, "keywords": {"smallcap": ["nebenwerte-perle"]}, "publisher_priors": {"reuters": 1.5}}}
+    classifier = RadarClassifier(cfg, holding_names=["bayer ag"])
+
+    row = classifier.score({"title": "Bayer AG und Nvidia im DAX", "source": "Reuters"})
+    assert row["reasons"] == ["Holding Match", "DAX Keyword", "AI Keyword", "Publisher Prior (reuters)"]
+    assert row["score"] == 5 + 2 + 4 + 1.5
+
+    spam = classifier.score({"title": "Nebenwerte-Perle als Kursrakete", "summary": "Anzeige", "source": "Blog"})
+    assert spam["reasons"] == ["Smallcap Keyword", "Spam Penalty"]
+    assert spam["score"] == 2 - 4
+
+
+def test_rank_radar_uses_injected_config_without_reloading(tmp_path, monkeypatch) -> None:
+    def _fail() -> dict:
+        raise AssertionError("load_config must not be called when cfg is injected")
+
+    monkeypatch.setattr(ranker, "load_config", _fail)
+    monkeypatch.setattr(ranker, "_load_holding_names", lambda cfg: [])
+    items_path = tmp_path / "radar_items_20261019.jsonl"
+    rows = [
+        {"id": "1", "title": "Microsoft setzt auf AI im DAX-Umfeld", "source": "Wire"},
+        {"id": "2", "title": "Wetter am Wochenende", "source": "Wire"},
+    ]
+    items_path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+
+    ranked = rank_radar(items_path, {"radar": {"min_score": 4}})
+
+    assert [row["title"] for row in ranked["top"]] == ["Microsoft setzt auf AI im DAX-Umfeld"]
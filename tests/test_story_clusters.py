@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+from modules.common.story_clusters import StoryClusters, collapse_clusters, load_cluster_sizes
+from modules.news_tracker.ranker import rank_opportunities
+
+
+def test_syndicated_headlines_share_a_cluster_across_runs(tmp_path) -> None:
+    path = tmp_path / "story_clusters.json"
+    clusters = StoryClusters(path, now=1000)
+    first = clusters.assign("a", "Bayer hebt Prognose für 2026 an", "IR")
+    second = clusters.assign("b", "Bayer hebt die Prognose für 2026 an", "dpa")
+    other = clusters.assign("c", "Siemens Energy senkt Ausblick", "IR")
+    clusters.save()
+
+    assert (first["cluster_id"], first["canonical"]) == ("a", True)
+    assert (second["cluster_id"], second["canonical"], second["size"]) == ("a", False, 2)
+    assert other["cluster_id"] == "c"
+
+    reloaded = StoryClusters(path, now=2000)
+    assert reloaded.assign("d", "BAYER hebt Prognose für 2026 an", "Reuters")["cluster_id"] == "a"
+    reloaded.save()
+    assert load_cluster_sizes(path) == {"a": 3, "c": 1}
+    assert json.loads(path.read_text(encoding="utf-8"))["clusters"]["a"]["sources"] == ["IR", "dpa", "Reuters"]
+
+    expired = StoryClusters(path, window_hours=1, now=2000 + 2 * 3600)
+    assert expired.clusters == {}
+
+
+def test_ranking_collapses_clusters_and_rewards_corroboration(tmp_path) -> None:
+    items = [
+        {"id": "a", "cluster_id": "a", "title": "Bayer earnings beat", "source": "Wire"},
+        {"id": "b", "cluster_id": "a", "title": "Bayer earnings beat estimates", "source": "Wire2"},
+        {"id": "c", "cluster_id": "c", "title": "Siemens earnings beat", "source": "Wire"},
+        {"id": "legacy", "title": "Old row without cluster", "source": "Wire"},
+    ]
+    assert [row["cluster_size"] for row in collapse_clusters(items, {"a": 3})] == [3, 1, 1]
+
+    items_path = tmp_path / "items_translated_20261019.jsonl"
+    items_path.write_text("".join(json.dumps(row) + "\n" for row in items), encoding="utf-8")
+    ranking = rank_opportunities(items_path, tmp_path / "top.json")
+
+    assert [row["id"] for row in ranking["top"]] == ["a", "c", "legacy"]
+    assert ranking["top"][0]["score"] == ranking["top"][1]["score"] + 1.0
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+from modules.v2.marketdata import provider_twelvedata
+from modules.v2.marketdata.batch_quotes import fetch_quotes_for_instruments
+from modules.v2.marketdata.batch_tuning import record_batch_samples, tune_batch_size
+
+
+def _cfg(**adaptive) -> dict:
+    settings = {"enabled": True, "min_size": 2, "max_size": 8, "step": 2, "min_samples": 2, "target_latency_ms": 500, **adaptive}
+    return {"v2": {"marketdata": {"batch_size": 4, "adaptive_batch": settings}}}
+
+
+def _sample(size: int, latency_ms: float, errors: int = 0, rate_limited: bool = False) -> dict:
+    return {"size": size, "symbols": size, "errors": errors, "rate_limited": rate_limited, "latency_ms": latency_ms}
+
+
+def test_tuning_grows_when_fast_and_shrinks_on_errors_within_bounds() -> None:
+    cfg = _cfg()
+    state = {"batch_tuning": {"size": None, "samples": [_sample(4, 120), _sample(4, 180)]}}
+    assert tune_batch_size(state, cfg)[0] == 6
+
+    state = {"batch_tuning": {"size": 8, "samples": [_sample(8, 100), _sample(8, 100)]}}
+    size, event = tune_batch_size(state, cfg)
+    assert (size, event) == (8, None)
+
+    state = {"batch_tuning": {"size": 8, "samples": [_sample(8, 100), _sample(8, 100, errors=8, rate_limited=True)]}}
+    size, event = tune_batch_size(state, cfg)
+    assert size == 4
+    assert event["reason"] == "rate_limited"
+    assert (event["from_size"], event["to_size"]) == (8, 4)
+
+    state = {"batch_tuning": {"size": 4, "samples": [_sample(4, 900), _sample(4, 1100)]}}
+    assert tune_batch_size(state, cfg) == (4, None)
+
+
+def test_samples_count_partial_failures_and_are_trimmed() -> None:
+    cfg = _cfg(history_size=2)
+    state: dict = {}
+    rows = [
+        {"symbol": "A", "status": "ok", "provider": "twelvedata"},
+        {"symbol": "B", "status": "ok", "provider": "stooq", "primary_error": "missing"},
+    ]
+    record_batch_samples(state, [{"rows": rows, "latency_ms": 10.0, "size": 2}] * 3, cfg)
+
+    samples = state["batch_tuning"]["samples"]
+    assert len(samples) == 2
+    assert (samples[0]["symbols"], samples[0]["errors"], samples[0]["rate_limited"]) == (2, 1, False)
+
+
+def test_fetch_applies_tuned_size_and_logs_the_adjustment(tmp_path) -> None:
+    requests: list[str] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            symbols = parse.parse_qs(parse.urlparse(self.path).query).get("symbol", [""])[0].split(",")
+            requests.append(",".join(symbols))
+            body = json.dumps({symbol: {"symbol": symbol, "close": "10", "percent_change": "1", "volume": "1", "datetime": "2026-03-10"} for symbol in symbols}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cfg = _cfg(target_latency_ms=5000)
+    cfg["app"] = {"root_dir": str(tmp_path)}
+    cfg["v2"]["marketdata"].update({"quote_url": f"http://127.0.0.1:{server.server_address[1]}/quote", "max_live_fallback_symbols": 0})
+    cfg["v2"]["quote_cache"] = {"enabled": False}
+    cfg["api_governor"] = {"enabled": True, "minute_limit_soft": 45, "minute_limit_hard": 55, "per_run_budget": 20}
+    instruments = [{"symbol": f"S{idx:02d}", "group": "scanner"} for idx in range(12)]
+    try:
+        fetch_quotes_for_instruments(instruments, cfg, api_key="token")
+        requests.clear()
+        rows = fetch_quotes_for_instruments(instruments, cfg, api_key="token")
+    finally:
+        server.shutdown()
+
+    assert [len(batch.split(",")) for batch in requests] == [6, 6]
+    assert all(row["quote"]["status"] == "ok" for row in rows)
+    usage_file = next((tmp_path / "data" / "api_governor").glob("usage_*.jsonl"))
+    events = [json.loads(line) for line in usage_file.read_text(encoding="utf-8").splitlines()]
+    adjustments = [event for event in events if event["kind"] == "batch_size_adjust"]
+    assert [(event["from_size"], event["to_size"], event["reason"]) for event in adjustments] == [(4, 6, "fast_and_clean")]
+
+
+def test_body_level_429_counts_as_rate_limited_and_halves_the_size(monkeypatch) -> None:
+    def _fake_request(symbols, api_key, timeout_sec=10, api_url=None):
+        return {"status": "error", "code": 429, "message": "You have run out of API credits for the current minute."}
+
+    monkeypatch.setattr(provider_twelvedata, "_request_quotes", _fake_request)
+    cfg = _cfg()
+    rows = provider_twelvedata.get_quotes_batch(["A", "B", "C", "D"], "token", cfg=cfg)
+    state = {"batch_tuning": {"size": 4, "samples": []}}
+    record_batch_samples(state, [{"rows": rows, "latency_ms": 50.0, "size": 4}], cfg)
+
+    assert state["batch_tuning"]["samples"][-1]["rate_limited"] is True
+    size, event = tune_batch_size(state, cfg)
+    assert (size, event["reason"]) == (2, "rate_limited")
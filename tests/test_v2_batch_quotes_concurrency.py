@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+from modules.v2.marketdata.batch_quotes import fetch_quotes_for_instruments
+
+
+def _start_fake_twelvedata(latency_sec: float) -> tuple[ThreadingHTTPServer, list[str]]:
+    requests: list[str] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            query = parse.parse_qs(parse.urlparse(self.path).query)
+            symbols = query.get("symbol", [""])[0].split(",")
+            requests.append(",".join(symbols))
+            time.sleep(latency_sec)
+            payload = {
+                symbol: {"symbol": symbol, "close": "10.5", "percent_change": "1.2", "volume": "1000", "datetime": "2026-03-10"}
+                for symbol in symbols
+            }
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests
+
+
+def _cfg(tmp_path, server: ThreadingHTTPServer, concurrency: int, per_run_budget: int = 20) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path)},
+        "v2": {
+            "marketdata": {
+                "batch_size": 2,
+                "timeout_sec": 5,
+                "max_live_fallback_symbols": 0,
+                "max_concurrent_batches": concurrency,
+                "quote_url": f"http://127.0.0.1:{server.server_address[1]}/quote",
+            }
+        },
+        "api_governor": {"enabled": True, "minute_limit_soft": 45, "minute_limit_hard": 55, "per_run_budget": per_run_budget},
+    }
+
+
+def _instruments(count: int) -> list[dict]:
+    return [{"symbol": f"S{idx:02d}", "group": "scanner", "weight_pct": 0} for idx in range(count)]
+
+
+def _usage_rows(tmp_path) -> list[dict]:
+    usage_file = next((tmp_path / "data" / "api_governor").glob("usage_*.jsonl"))
+    return [json.loads(line) for line in usage_file.read_text(encoding="utf-8").splitlines()]
+
+
+def test_batches_are_dispatched_concurrently_and_merged_in_instrument_order(tmp_path) -> None:
+    server, requests = _start_fake_twelvedata(latency_sec=0.3)
+    try:
+        started = time.monotonic()
+        rows = fetch_quotes_for_instruments(_instruments(8), _cfg(tmp_path, server, concurrency=4), api_key="token")
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+
+    assert len(requests) == 4
+    assert elapsed < 0.9
+    assert [row["symbol"] for row in rows] == [f"S{idx:02d}" for idx in range(8)]
+    assert all(row["quote"]["status"] == "ok" for row in rows)
+    usage = _usage_rows(tmp_path)
+    assert [row["used_in_minute_after"] for row in usage] == [1, 2, 3, 4]
+    assert all("apikey" not in row for row in usage)
+
+
+def test_concurrent_dispatch_keeps_per_run_budget(tmp_path) -> None:
+    server, requests = _start_fake_twelvedata(latency_sec=0.05)
+    try:
+        rows = fetch_quotes_for_instruments(
+            _instruments(8),
+            _cfg(tmp_path, server, concurrency=4, per_run_budget=2),
+            api_key="token",
+        )
+    finally:
+        server.shutdown()
+
+    assert len(requests) == 2
+    assert [row["quote"]["status"] for row in rows] == ["ok"] * 4 + ["error"] * 4
+    usage = _usage_rows(tmp_path)
+    assert [row["cost"] for row in usage] == [1, 1, 0, 0]
+    assert usage[-1]["mode"] == "degraded"
+    assert (tmp_path / "data" / "api_governor" / "state.json").exists()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import copy
+from datetime import date
+
+from modules.v2.recommendations.classify import classify_candidate
+from modules.v2.scoring.batch import score_candidates
+from modules.v2.scoring.defense_score import compute_defense_score
+from modules.v2.scoring.opportunity_score import compute_opportunity_score
+from modules.v2.scoring.portfolio_priority import compute_portfolio_priority
+
+TODAY = date.today().isoformat()
+HOLDINGS = [
+    {"isin": "DE000BASF111", "symbol": "BAS.DE", "weight_pct": 28.0, "sector": "materials"},
+    {"isin": "DE0007164600", "symbol": "SAP.DE", "weight_pct": 16.0, "sector": "technology"},
+    {"isin": "DE0008404005", "symbol": "ALV.DE", "weight_pct": 4.0, "sector": "materials"},
+]
+EXPECTANCY = {
+    "score_calibration": {"factor_score>=4": {"3d": {"expectancy": 0.8}}, "factor_score>=2": {"3d": {"expectancy": -0.2}}},
+    "by_regime": {"risk_on": {"3d": {"expectancy": 0.4, "expectancy_confidence": "low"}}},
+}
+
+
+def _candidate(symbol: str, group: str, pct: float, scores: dict, negative_hits: int = 0, **extra) -> dict:
+    return {
+        "symbol": symbol,
+        "group": group,
+        "quote": {"percent_change": pct, "status": "ok", "timestamp": TODAY},
+        "scores": scores,
+        "details": {"news": {"negative_hits": negative_hits, "drivers": ["negative_news"] if negative_hits else []}},
+        **extra,
+    }
+
+
+def _candidates() -> list[dict]:
+    return [
+        _candidate("BAS.DE", "holding", -4.5, {"momentum": 0, "volume": 1, "news": 0}, negative_hits=2, isin="DE000BASF111", weight_pct=28.0),
+        _candidate("SAP.DE", "holding", 2.4, {"momentum": 2, "volume": 1, "news": 2, "relative_strength": 1}, isin="DE0007164600", weight_pct=16.0),
+        _candidate("ALV.DE", "holding", 0.3, {"momentum": 1, "volume": 0, "news": 0}, isin="DE0008404005", weight_pct=4.0),
+        _candidate("RHM.DE", "scanner", 5.1, {"momentum": 3, "volume": 2, "news": 2, "relative_strength": 2}),
+        _candidate("IFX.DE", "scanner", 0.8, {"momentum": 1, "volume": 0, "news": 1}),
+        {"symbol": "OLD.DE", "group": "scanner", "quote": {"status": "error"}, "scores": {}},
+    ]
+
+
+def test_batch_scoring_matches_per_candidate_functions() -> None:
+    for regime in ("risk_on", "neutral", "risk_off"):
+        batch_input = _candidates()
+        single_input = _candidates()
+        for candidate in batch_input + single_input:
+            candidate["regime"] = regime
+
+        batch = score_candidates(batch_input, HOLDINGS, regime, EXPECTANCY)
+
+        for candidate, result in zip(single_input, batch):
+            candidate["portfolio_priority"] = compute_portfolio_priority(candidate, HOLDINGS)
+            opportunity = compute_opportunity_score(candidate, regime, EXPECTANCY)
+            defense = compute_defense_score(candidate, regime, float(candidate.get("weight_pct", 0) or 0))
+            assert result["opportunity"] == opportunity
+            assert result["defense"] == defense
+            assert result["classification"] == classify_candidate(candidate, opportunity, defense)
+        assert batch_input == single_input
+
+
+def test_batch_scoring_covers_every_classification_branch() -> None:
+    candidates = _candidates()
+    for candidate in candidates:
+        candidate["regime"] = "risk_on"
+
+    results = score_candidates(copy.deepcopy(candidates), HOLDINGS, "risk_on", EXPECTANCY)
+
+    assert [row["classification"] for row in results] == ["DEFENSE", "ACTION", "IGNORE", "ACTION", "WATCH", "IGNORE"]
+    assert results[3]["opportunity"]["reasons"][-2:] == ["positive_setup_expectancy", "positive_regime_expectancy"]
+    assert score_candidates([], HOLDINGS, "neutral", {}) == []
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+
+from modules.v2.marketdata import batch_quotes, provider_twelvedata
+from modules.v2.marketdata.api_governor import load_governor_state, status_snapshot
+from modules.v2.marketdata.credential_pool import pool_limits
+
+
+def _cfg(tmp_path, credentials: list[dict] | None = None) -> dict:
+    governor = {"enabled": True, "minute_limit_soft": 40, "minute_limit_hard": 50, "per_run_budget": 20}
+    if credentials is not None:
+        governor["credentials"] = credentials
+    return {
+        "app": {"root_dir": str(tmp_path)},
+        "v2": {"env_file": str(tmp_path / "missing.env"), "marketdata": {"batch_size": 1, "max_concurrent_batches": 1}, "quote_cache": {"enabled": False}},
+        "api_governor": governor,
+    }
+
+
+def _instruments(count: int) -> list[dict]:
+    return [{"symbol": f"S{idx}.DE", "group": "scanner"} for idx in range(count)]
+
+
+def _usage(tmp_path) -> list[dict]:
+    usage_file = next((tmp_path / "data" / "api_governor").glob("usage_*.jsonl"))
+    return [json.loads(line) for line in usage_file.read_text(encoding="utf-8").splitlines()]
+
+
+def test_batches_go_to_key_with_most_headroom_and_usage_is_per_key(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("TD_KEY_A", "secret-a")
+    monkeypatch.setenv("TD_KEY_B", "secret-b")
+    used_keys: list[str | None] = []
+
+    def _fake(symbols, api_key=None, cfg=None, live_fallback_limit=None):
+        used_keys.append(api_key)
+        return [{"symbol": symbol, "price": 1.0, "status": "ok", "provider": "twelvedata"} for symbol in symbols]
+
+    monkeypatch.setattr(batch_quotes, "get_quotes_with_fallback", _fake)
+    cfg = _cfg(
+        tmp_path,
+        [
+            {"name": "a", "env": "TD_KEY_A", "minute_limit_soft": 2, "minute_limit_hard": 2},
+            {"name": "b", "env": "TD_KEY_B", "minute_limit_soft": 3, "minute_limit_hard": 3},
+        ],
+    )
+
+    rows = batch_quotes.fetch_quotes_for_instruments(_instruments(6), cfg, api_key="unused-default")
+
+    assert used_keys == ["secret-b", "secret-a", "secret-b", "secret-a", "secret-b", None]
+    assert [row["quote"]["status"] for row in rows] == ["ok"] * 6
+    events = [row for row in _usage(tmp_path) if row["kind"] == "quote_batch"]
+    assert [row["key"] for row in events] == ["b", "a", "b", "a", "b", None]
+    assert events[-1]["mode"] == "blocked"
+    assert all("secret" not in json.dumps(row) for row in events)
+    state = load_governor_state(cfg)
+    assert state["used_in_current_minute"] == 5
+    assert {name: entry["used_in_current_minute"] for name, entry in state["keys"].items()} == {"a": 2, "b": 3}
+    assert status_snapshot(cfg)["minute_limit_hard"] == 5
+
+
+def test_rate_limited_key_is_put_on_cooldown(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("TD_KEY_A", "secret-a")
+    monkeypatch.setenv("TD_KEY_B", "secret-b")
+    used_keys: list[str | None] = []
+
+    def _fake(symbols, api_key=None, cfg=None, live_fallback_limit=None):
+        used_keys.append(api_key)
+        if api_key == "secret-a":
+            return [{"symbol": symbol, "status": "error", "provider": "none", "primary_error": "http_429:limit"} for symbol in symbols]
+        return [{"symbol": symbol, "price": 1.0, "status": "ok", "provider": "twelvedata"} for symbol in symbols]
+
+    monkeypatch.setattr(batch_quotes, "get_quotes_with_fallback", _fake)
+    cfg = _cfg(tmp_path, [{"name": "a", "env": "TD_KEY_A", "minute_limit_hard": 10}, {"name": "b", "env": "TD_KEY_B", "minute_limit_hard": 5}])
+    cfg["api_governor"]["key_failure_threshold"] = 1
+
+    batch_quotes.fetch_quotes_for_instruments(_instruments(1), cfg)
+    batch_quotes.fetch_quotes_for_instruments(_instruments(2), cfg)
+
+    assert used_keys == ["secret-a", "secret-b", "secret-b"]
+    assert load_governor_state(cfg)["keys"]["a"]["cooldown_until"]
+    assert status_snapshot(cfg)["keys"]["a"]["cooldown_until"]
+
+
+def test_single_run_key_forms_default_pool(monkeypatch, tmp_path) -> None:
+    def _fake(symbols, api_key=None, cfg=None, live_fallback_limit=None):
+        return [{"symbol": symbol, "price": 1.0, "status": "ok", "provider": "twelvedata"} for symbol in symbols]
+
+    monkeypatch.setattr(batch_quotes, "get_quotes_with_fallback", _fake)
+    cfg = _cfg(tmp_path)
+
+    batch_quotes.fetch_quotes_for_instruments(_instruments(2), cfg, api_key="token")
+
+    assert [row["key"] for row in _usage(tmp_path)] == ["default", "default"]
+    assert status_snapshot(cfg)["minute_limit_hard"] == 50
+
+
+def test_body_level_quota_error_puts_key_on_cooldown(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("TD_KEY_A", "secret-a")
+    monkeypatch.setenv("TD_KEY_B", "secret-b")
+    used_keys: list[str] = []
+
+    def _fake_request(symbols, api_key, timeout_sec=10, api_url=None):
+        used_keys.append(api_key)
+        if api_key == "secret-a":
+            return {"status": "error", "code": 429, "message": "You have run out of API credits for the current minute."}
+        return {symbol: {"symbol": symbol, "close": "1.0", "datetime": "2026-03-10"} for symbol in symbols}
+
+    monkeypatch.setattr(provider_twelvedata, "_request_quotes", _fake_request)
+    cfg = _cfg(tmp_path, [{"name": "a", "env": "TD_KEY_A", "minute_limit_hard": 10}, {"name": "b", "env": "TD_KEY_B", "minute_limit_hard": 5}])
+    cfg["v2"]["marketdata"].update({"batch_size": 2, "max_live_fallback_symbols": 0})
+    cfg["api_governor"]["key_failure_threshold"] = 1
+
+    rows = provider_twelvedata.get_quotes_batch(["SAP.DE"], "secret-a", cfg=cfg, context="manual")
+    assert rows[0]["error"].startswith("http_429:")
+
+    used_keys.clear()
+    batch_quotes.fetch_quotes_for_instruments(_instruments(2), cfg)
+    batch_quotes.fetch_quotes_for_instruments(_instruments(2), cfg)
+
+    assert used_keys == ["secret-a", "secret-b"]
+    assert load_governor_state(cfg)["keys"]["a"]["cooldown_until"]
+
+
+def test_pool_limits_count_only_resolved_keys(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("TD_KEY_A", "secret-a")
+    monkeypatch.delenv("TD_KEY_B", raising=False)
+    cfg = _cfg(tmp_path, [{"name": "a", "env": "TD_KEY_A", "minute_limit_hard": 10}, {"name": "b", "env": "TD_KEY_B", "minute_limit_hard": 5}])
+
+    assert pool_limits(cfg) == (40, 10)
+    assert status_snapshot(cfg)["minute_limit_hard"] == 10
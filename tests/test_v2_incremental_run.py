@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from modules.common.utils import write_json
+from modules.organism import monthly_evaluation as me
+from modules.v2 import main as v2_main
+from modules.v2.telegram.help import load_latest_recommendations
+
+
+def _cfg(tmp_path: Path, persist: str) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path), "timezone": "Europe/Berlin"},
+        "notify": {"telegram": {"enabled": False}},
+        "v2": {
+            "data_dir": "data/v2",
+            "symbol_map_path": "config/symbol_map_v2.json",
+            "scanner_universe_path": "config/scanner_universe_v2.json",
+            "watchlist_path": "data/watchlist/watchlist.json",
+            "marketdata": {"batch_size": 4, "max_live_fallback_symbols": 0},
+            "incremental": {"enabled": True, "persist": persist},
+        },
+    }
+
+
+def _seed(tmp_path: Path) -> None:
+    write_json(
+        tmp_path / "config" / "scanner_universe_v2.json",
+        {"items": [{"symbol": "BAS.DE", "name": "BASF SE"}, {"symbol": "SAP.DE", "name": "SAP SE"}]},
+    )
+    write_json(tmp_path / "data" / "briefings" / "morning_20260309.json", {"regime": {"regime": "neutral"}})
+
+
+def _patch(monkeypatch, prices: dict[str, float], rendered: list[str]) -> None:
+    def _quotes(instruments, cfg, api_key=None):
+        return [
+            {
+                "symbol": row["symbol"],
+                "isin": row.get("isin"),
+                "name": row.get("name"),
+                "group": row.get("group"),
+                "quote": {"symbol": row["symbol"], "price": prices[row["symbol"]], "percent_change": 0.1, "status": "ok", "provider": "twelvedata"},
+            }
+            for row in instruments
+        ]
+
+    original = v2_main.render_recommendation
+
+    def _render(candidate, classification, scores, cfg=None):
+        rendered.append(candidate["symbol"])
+        return original(candidate, classification, scores, cfg=cfg)
+
+    monkeypatch.setattr(v2_main, "fetch_quotes_for_instruments", _quotes)
+    monkeypatch.setattr(v2_main, "render_recommendation", _render)
+    monkeypatch.setattr(v2_main, "send_action", lambda *args: True)
+    monkeypatch.setattr(v2_main, "send_watch_bundle", lambda *args: True)
+    monkeypatch.setattr(v2_main, "send_defense", lambda *args: True)
+
+
+def test_unchanged_instruments_reuse_previous_score_and_render(tmp_path, monkeypatch) -> None:
+    _seed(tmp_path)
+    rendered: list[str] = []
+    prices = {"BAS.DE": 50.0, "SAP.DE": 180.0}
+    _patch(monkeypatch, prices, rendered)
+    cfg = _cfg(tmp_path, persist="full")
+
+    first = v2_main.run(cfg)
+    second = v2_main.run(cfg)
+    prices["SAP.DE"] = 181.0
+    third = v2_main.run(cfg)
+
+    assert rendered == ["BAS.DE", "SAP.DE", "SAP.DE"]
+    assert second["recommendations"] == first["recommendations"]
+    assert [row["quote"]["price"] for row in third["recommendations"]] == [50.0, 181.0]
+    manifest = json.loads(Path(third["persisted"]["manifest_path"]).read_text(encoding="utf-8"))
+    assert manifest["changed_count"] == 1
+    assert manifest["instruments"]["SAP.DE"]["changed"] is True
+    assert Path(third["persisted"]["recommendations_path"]).exists()
+
+
+def test_delta_persistence_writes_only_changed_rows(tmp_path, monkeypatch) -> None:
+    _seed(tmp_path)
+    rendered: list[str] = []
+    prices = {"BAS.DE": 50.0, "SAP.DE": 180.0}
+    _patch(monkeypatch, prices, rendered)
+    cfg = _cfg(tmp_path, persist="delta")
+
+    v2_main.run(cfg)
+    prices["BAS.DE"] = 51.0
+    result = v2_main.run(cfg)
+
+    delta = json.loads(Path(result["persisted"]["delta_path"]).read_text(encoding="utf-8"))
+    assert delta["changed"] == ["BAS.DE"]
+    assert [row["symbol"] for row in delta["recommendations"]] == ["BAS.DE"]
+    assert not list((tmp_path / "data" / "v2").glob("recommendations_*.json"))
+    latest = load_latest_recommendations(cfg)
+    assert [row["symbol"] for row in latest] == ["BAS.DE", "SAP.DE"]
+    assert latest[0]["quote"]["price"] == 51.0
+
+
+def test_history_run_id_matches_snapshot_stamp_across_minute_rollover(tmp_path, monkeypatch) -> None:
+    _seed(tmp_path)
+    _patch(monkeypatch, {"BAS.DE": 50.0, "SAP.DE": 180.0}, [])
+    cfg = _cfg(tmp_path, persist="full")
+    ticks = iter(range(10_000))
+
+    class _Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            # Every clock read moves 20 seconds, so two reads in the persist stage straddle a minute.
+            return datetime(2026, 3, 10, 9, 59, 50) + timedelta(seconds=20 * next(ticks))
+
+    monkeypatch.setattr(v2_main, "datetime", _Clock)
+    result = v2_main.run(cfg)
+
+    stamp = Path(result["persisted"]["recommendations_path"]).stem[len("recommendations_") :]
+    assert result["persisted"]["run_id"] == stamp
+    now = datetime.now()
+    metrics = me._activity_metrics(cfg, now - timedelta(days=1), now + timedelta(days=1))
+    assert metrics["scanner_runs"] == 1
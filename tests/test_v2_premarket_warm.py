@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from modules.common.utils import read_json, write_json
+from modules.v2 import premarket_warm
+from modules.v2.premarket_de import load_latest_recommendations
+
+
+def _cfg(tmp_path: Path) -> dict:
+    return {"app": {"root_dir": str(tmp_path)}, "v2": {"data_dir": "data/v2"}}
+
+
+def _seed(tmp_path: Path) -> None:
+    write_json(
+        tmp_path / "data" / "v2" / "recommendations_20260310_0830.json",
+        {
+            "recommendations": [
+                {"name": "SAP SE", "symbol": "SAP.DE", "isin": "DE0007164600", "country": "DE", "classification": "ACTION", "regime": "neutral"},
+                {"name": "Bayer AG", "symbol": "BAYN.DE", "isin": "DE000BAY0017", "country": "DE", "classification": "HALTEN"},
+                {"name": "AMD", "symbol": "AMD", "isin": "US0079031078", "country": "US", "classification": "ACTION"},
+            ]
+        },
+    )
+    write_json(tmp_path / "data" / "briefings" / "morning_20260310.json", {"regime": {"regime": "risk_on"}})
+
+
+def test_warm_stores_render_rows_without_fetching_quotes(tmp_path: Path, monkeypatch) -> None:
+    _seed(tmp_path)
+    cfg = _cfg(tmp_path)
+    monkeypatch.setattr("modules.v2.marketdata.batch_quotes.fetch_quotes_for_instruments", lambda *args, **kwargs: pytest.fail("premarket warm must not fetch quotes"))
+    now = datetime(2026, 3, 10, 8, 35)
+
+    result = premarket_warm.warm_premarket(cfg, "de", now_dt=now)
+
+    assert (result["rows"], result["regime"]) == (1, "risk_on")
+    payload = read_json(result["path"])
+    assert payload["recommendations"][0]["regime"] == "risk_on"
+    rows = premarket_warm.load_warm_rows(cfg, "de", now_dt=now + timedelta(minutes=10))
+    assert [row["symbol"] for row in rows] == ["SAP.DE"]
+
+
+def test_premarket_send_falls_back_when_warm_payload_is_stale(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    cfg = _cfg(tmp_path)
+    now = datetime.now()
+    write_json(
+        premarket_warm.warm_path(cfg, "de", now),
+        {"generated_at": (now - timedelta(hours=2)).isoformat(timespec="seconds"), "recommendations": []},
+    )
+
+    assert premarket_warm.load_warm_rows(cfg, "de", now_dt=now) is None
+    assert len(load_latest_recommendations(cfg)) == 3
+
+
+def test_warm_payload_is_dropped_once_a_newer_v2_run_exists(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    cfg = _cfg(tmp_path)
+    now = datetime(2026, 3, 10, 8, 35)
+    premarket_warm.warm_premarket(cfg, "de", now_dt=now)
+    assert premarket_warm.load_warm_rows(cfg, "de", now_dt=now + timedelta(minutes=5)) is not None
+
+    write_json(
+        tmp_path / "data" / "v2" / "recommendations_20260310_0845.json",
+        {"recommendations": [{"name": "Siemens AG", "symbol": "SIE.DE", "isin": "DE0007236101", "country": "DE", "classification": "ACTION"}]},
+    )
+
+    assert premarket_warm.load_warm_rows(cfg, "de", now_dt=now + timedelta(minutes=15)) is None
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from modules.common.latest_quotes import update_marketdata_view
+from modules.telegram_commands import poller
+from modules.v2.marketdata import batch_quotes, fallback_router
+from modules.v2.marketdata.quote_cache import cached_quotes, fresh_quote_map, store_quotes
+from modules.virus_bridge.execution_performance import _latest_quote_map
+
+
+def _cfg(tmp_path, consumers: dict | None = None) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path)},
+        "v2": {
+            "marketdata": {"batch_size": 8, "max_live_fallback_symbols": 0},
+            "quote_cache": {"ttl_sec": 900, "consumers": consumers or {}},
+        },
+    }
+
+
+def _quote(symbol: str, provider: str = "twelvedata", price: float = 10.0) -> dict:
+    return {"symbol": symbol, "price": price, "percent_change": 1.0, "status": "ok", "provider": provider}
+
+
+def test_cache_honours_ttl_and_consumer_policy(tmp_path) -> None:
+    cfg = _cfg(tmp_path, consumers={"bridge": {"max_age_sec": 60}})
+    now = datetime(2026, 3, 10, 10, 0)
+    store_quotes([_quote("BAS.DE"), _quote("SAP.DE", provider="fallback")], cfg, isin_by_symbol={"BAS.DE": "DE000BASF111"}, now_dt=now)
+
+    scanner = cached_quotes(["BAS.DE", "SAP.DE"], cfg, consumer="scanner", now_dt=now + timedelta(minutes=5))
+    telegram = cached_quotes(["DE000BASF111", "SAP.DE"], cfg, consumer="telegram", now_dt=now + timedelta(minutes=5))
+    bridge = cached_quotes(["BAS.DE"], cfg, consumer="bridge", now_dt=now + timedelta(minutes=5))
+    expired = cached_quotes(["BAS.DE"], cfg, consumer="telegram", now_dt=now + timedelta(minutes=16))
+
+    assert set(scanner) == {"BAS.DE"}
+    assert set(telegram) == {"DE000BASF111", "SAP.DE"}
+    assert telegram["DE000BASF111"]["cache_age_sec"] == 300
+    assert bridge == {}
+    assert expired == {}
+
+
+def test_scanner_run_skips_provider_for_cached_symbols(monkeypatch, tmp_path) -> None:
+    cfg = _cfg(tmp_path)
+    store_quotes([_quote("ENR.DE", price=99.0)], cfg)
+    calls: list[list[str]] = []
+
+    def _fake(symbols, api_key=None, cfg=None, live_fallback_limit=None):
+        calls.append(list(symbols))
+        return [_quote(symbol) for symbol in symbols]
+
+    monkeypatch.setattr(batch_quotes, "get_quotes_with_fallback", _fake)
+
+    rows = batch_quotes.fetch_quotes_for_instruments(
+        [
+            {"symbol": "ENR.DE", "isin": "DE000ENER6Y0", "group": "holding", "weight_pct": 20.0},
+            {"symbol": "DEZ.DE", "isin": "DE0006305006", "group": "holding", "weight_pct": 5.0},
+        ],
+        cfg,
+        api_key="token",
+    )
+
+    assert calls == [["DEZ.DE"]]
+    assert rows[0]["quote"]["price"] == 99.0
+    assert cfg["_api_governor_runtime"]["cache_hits"] == 1
+    assert set(fresh_quote_map(cfg, consumer="bridge")) >= {"ENR.DE", "DEZ.DE", "DE0006305006"}
+
+
+def test_manual_lookup_reuses_cache_and_bridge_prefers_it(monkeypatch, tmp_path) -> None:
+    cfg = _cfg(tmp_path)
+    calls: list[list[str]] = []
+
+    def _fake_batch(symbols, api_key, cfg=None, context="scanner"):
+        calls.append(list(symbols))
+        return [_quote(symbol, price=42.0) for symbol in symbols]
+
+    monkeypatch.setattr(fallback_router, "get_quotes_batch", _fake_batch)
+
+    first = fallback_router.get_quote_with_fallback("NVDA.US", api_key="token", cfg=cfg, context="telegram")
+    second = fallback_router.get_quote_with_fallback("NVDA.US", api_key="token", cfg=cfg, context="telegram")
+
+    assert calls == [["NVDA.US"]]
+    assert first["price"] == second["price"] == 42.0
+    assert _latest_quote_map(cfg)["NVDA.US"]["price"] == 42.0
+
+
+def test_file_cache_fallback_rows_are_not_stored_as_fresh(tmp_path) -> None:
+    cfg = _cfg(tmp_path)
+    quotes_dir = tmp_path / "data" / "marketdata"
+    update_marketdata_view(
+        quotes_dir,
+        [{"symbol": "bas.de", "status": "ok", "open": 50.0, "close": 51.0, "date": "2026-03-01", "time": "10:00"}],
+        quotes_dir / "quotes_20260301.jsonl",
+    )
+
+    rows = fallback_router.get_quotes_with_fallback(["BAS.DE"], cfg=cfg, live_fallback_limit=0, context="telegram")
+
+    assert (rows[0]["status"], rows[0]["price"]) == ("ok", 51.0)
+    assert fresh_quote_map(cfg, consumer="bridge") == {}
+    assert cached_quotes(["BAS.DE"], cfg, consumer="telegram") == {}
+
+
+def test_telegram_commands_read_quotes_with_the_telegram_policy(monkeypatch, tmp_path) -> None:
+    cfg = _cfg(tmp_path, consumers={"telegram": {"accept_quality": ["live"]}})
+    store_quotes([_quote("NVDA.US"), _quote("SAP.DE", provider="fallback")], cfg)
+    seen: list[dict] = []
+
+    def _fake_summary(active_cfg: dict) -> str:
+        seen.append(_latest_quote_map(active_cfg))
+        return "ok"
+
+    monkeypatch.setattr(poller, "render_execution_summary", _fake_summary)
+    poller.handle_command({"normalized_text": "/execution", "chat_id": "123"}, cfg)
+
+    assert set(seen[0]) == {"NVDA.US"}
+    assert set(_latest_quote_map(cfg)) == {"NVDA.US", "SAP.DE"}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date
+
+from modules.v2 import main as v2_main
+from modules.v2.recommendation_diff import diff_recommendations, load_delta_state, notification_rows, save_delta_state
+from modules.v2.telegram import notifier
+
+
+def _row(isin: str, classification: str) -> dict:
+    return {"isin": isin, "symbol": isin[-3:], "classification": classification, "telegram_text": f"{classification} {isin}"}
+
+
+def test_diff_reports_structured_changes_between_runs() -> None:
+    previous = {"A": "WATCH", "B": "ACTION", "C": "WATCH", "D": "IGNORE"}
+    current = [_row("A", "ACTION"), _row("B", "WATCH"), _row("C", "WATCH"), _row("E", "DEFENSE")]
+
+    diff = diff_recommendations(previous, current)
+
+    assert diff["by_key"] == {"A": "upgraded", "B": "downgraded", "C": "unchanged", "E": "new"}
+    assert diff["removed"] == ["D"]
+    assert diff["counts"] == {"new": 1, "upgraded": 1, "downgraded": 1, "removed": 1, "unchanged": 1}
+    assert [row["isin"] for row in notification_rows(diff, current)] == ["A", "B", "C", "E"]
+
+    steady = diff_recommendations({"A": "ACTION", "C": "WATCH"}, [_row("A", "ACTION"), _row("C", "WATCH")])
+    assert notification_rows(steady, [_row("A", "ACTION"), _row("C", "WATCH")]) == []
+
+
+def test_any_move_into_action_is_notified() -> None:
+    current = [_row("A", "ACTION"), _row("B", "IGNORE")]
+
+    diff = diff_recommendations({"A": "DEFENSE", "B": "DEFENSE"}, current)
+
+    assert diff["by_key"] == {"A": "downgraded", "B": "downgraded"}
+    assert [row["isin"] for row in notification_rows(diff, current)] == ["A"]
+
+
+def test_unsent_deltas_stay_pending_and_state_resets_daily(tmp_path) -> None:
+    cfg = {"app": {"root_dir": str(tmp_path)}}
+    today = date(2026, 3, 10)
+    save_delta_state(cfg, [_row("A", "ACTION"), _row("B", "WATCH")], previous={"B": "IGNORE"}, hold_back={"A", "B"}, today=today)
+
+    state = load_delta_state(cfg, today)
+    assert state["entries"] == {"B": "IGNORE"}
+    assert diff_recommendations(state["entries"], [_row("A", "ACTION")])["by_key"] == {"A": "new"}
+    assert load_delta_state(cfg, date(2026, 3, 11))["entries"] == {}
+
+
+def test_notifier_dedupes_through_hashed_index(tmp_path, monkeypatch) -> None:
+    cfg = {"app": {"root_dir": str(tmp_path)}, "v2": {"data_dir": "data/v2", "telegram": {"action_max_per_day": 3}}}
+    sent: list[str] = []
+    monkeypatch.setattr(notifier, "send_performance_text", lambda text, cfg: sent.append(text) or True)
+
+    assert notifier.send_action(_row("A", "ACTION"), "first", cfg) is True
+    assert notifier.send_action(_row("A", "ACTION"), "again", cfg) is False
+
+    assert sent == ["first"]
+    state = notifier._load_state(cfg)
+    assert len(state["sent"]) == 1
+    assert all(len(key) == 16 for key in state["sent"])
+
+
+def test_only_failed_sends_are_held_back(tmp_path, monkeypatch) -> None:
+    cfg = {"app": {"root_dir": str(tmp_path)}, "v2": {"data_dir": "data/v2", "telegram": {"action_max_per_day": 1, "defense_max_per_day": 5}}}
+    monkeypatch.setattr(notifier, "send_performance_text", lambda text, cfg: not text.startswith("DEFENSE"))
+    assert notifier._send("action", "A", "ACTION A", cfg) == notifier.SENT
+
+    assert notifier._send("action", "A", "ACTION A", cfg) == notifier.DUPLICATE
+    assert notifier._send("action", "C", "ACTION C", cfg) == notifier.DAILY_LIMIT
+    assert notifier._send("defense", "D", "DEFENSE D", cfg) == notifier.FAILED
+
+    rows = [_row("xxA", "ACTION"), _row("xxC", "ACTION"), _row("xxD", "DEFENSE")]
+    assert [row["isin"] for row in v2_main._notify(cfg, rows)] == ["xxD"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+from modules.common.utils import write_json
+from modules.organism import monthly_evaluation as me
+from modules.v2.recommendation_history import (
+    append_run,
+    latest_per_isin,
+    recommendations_by_classification,
+)
+from modules.v2.telegram.help import load_latest_recommendations
+
+
+def _cfg(tmp_path: Path) -> dict:
+    return {"app": {"root_dir": str(tmp_path)}}
+
+
+def _rec(isin: str, classification: str, price: float, score: float = 5.0) -> dict:
+    return {"isin": isin, "symbol": isin[-4:], "classification": classification, "opportunity_score": {"total": score}, "quote": {"price": price}}
+
+
+def test_unchanged_payloads_are_stored_by_reference(tmp_path: Path) -> None:
+    cfg = _cfg(tmp_path)
+    first = append_run(cfg, "20260310_1000", [], [_rec("DE000BASF111", "WATCH", 40.0), _rec("US0079031078", "ACTION", 100.0)], "2026-03-10T10:00:00")
+    second = append_run(cfg, "20260310_1015", [], [_rec("DE000BASF111", "WATCH", 41.0), _rec("US0079031078", "ACTION", 101.0, score=7.0)], "2026-03-10T10:15:00")
+
+    assert (first["history_stored"], first["history_referenced"]) == (2, 0)
+    assert (second["history_stored"], second["history_referenced"]) == (1, 1)
+    payload_lines = (tmp_path / "data" / "v2" / "history" / "payloads_202603.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(payload_lines) == 3
+
+    latest = latest_per_isin(cfg)
+    assert latest["US0079031078"]["quote"]["price"] == 101.0
+    assert latest["DE000BASF111"]["quote"]["price"] == 40.0
+    actions = recommendations_by_classification(cfg, "202603", "ACTION")
+    assert [row["quote"]["price"] for row in actions["US0079031078"]] == [100.0, 101.0]
+
+
+def test_consumers_read_history_before_snapshot_files(tmp_path: Path) -> None:
+    cfg = _cfg(tmp_path)
+    old = tmp_path / "data" / "v2" / "recommendations_20260301_0900.json"
+    write_json(old, {"recommendations": [{"name": "Alt", "classification": "HALTEN"}]})
+    ts = datetime(2026, 3, 1, 9, 0).timestamp()
+    os.utime(old, (ts, ts))
+    append_run(cfg, "20260310_1000", [], [_rec("US0079031078", "ACTION", 100.0)], "2026-03-10T10:00:00")
+    append_run(cfg, "20260311_1000", [], [_rec("US0079031078", "ACTION", 100.0), _rec("DE000BASF111", "WATCH", 40.0)], "2026-03-11T10:00:00")
+
+    assert [row["isin"] for row in load_latest_recommendations(cfg)] == ["US0079031078", "DE000BASF111"]
+    metrics = me._activity_metrics(cfg, datetime(2026, 3, 1), datetime(2026, 4, 1))
+    assert metrics["scanner_runs"] == 3
+    assert metrics["recommendations_total"] == 4
+    assert metrics["kaufen_pruefen_total"] == 2
+    assert metrics["halten_total"] == 2
+
+
+def test_every_row_is_indexed_under_the_month_of_its_run(tmp_path: Path) -> None:
+    cfg = _cfg(tmp_path)
+    append_run(cfg, "20260331_1000", [{"isin": "DE000BASF111", "quote": {"price": 40.0}}], [_rec("DE000BASF111", "WATCH", 40.0)], "2026-03-31T10:00:00")
+    second = append_run(cfg, "20260401_1000", [{"isin": "DE000BASF111", "quote": {"price": 39.5}}], [_rec("DE000BASF111", "WATCH", 39.5)], "2026-04-01T10:00:00")
+
+    assert (second["history_stored"], second["history_referenced"]) == (0, 1)
+    april = recommendations_by_classification(cfg, "202604", "WATCH")
+    assert [row["quote"]["price"] for row in april["DE000BASF111"]] == [40.0]
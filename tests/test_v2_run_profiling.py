@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import pstats
+from pathlib import Path
+
+from modules.common.utils import write_json
+from modules.v2 import main as v2_main
+from modules.v2.profiling import load_run_profiles, percentile, summarize_profiles
+
+
+def _cfg(tmp_path: Path) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path), "timezone": "Europe/Berlin"},
+        "notify": {"telegram": {"enabled": False}},
+        "v2": {
+            "data_dir": "data/v2",
+            "symbol_map_path": "config/symbol_map_v2.json",
+            "scanner_universe_path": "config/scanner_universe_v2.json",
+            "watchlist_path": "data/watchlist/watchlist.json",
+            "marketdata": {"batch_size": 4, "max_live_fallback_symbols": 0},
+        },
+    }
+
+
+def _patch(monkeypatch) -> None:
+    def _quotes(instruments, cfg, api_key=None):
+        return [
+            {
+                "symbol": row["symbol"],
+                "name": row.get("name"),
+                "group": row.get("group"),
+                "quote": {"symbol": row["symbol"], "price": 10.0, "percent_change": 0.2, "status": "ok", "provider": "twelvedata"},
+            }
+            for row in instruments
+        ]
+
+    monkeypatch.setattr(v2_main, "fetch_quotes_for_instruments", _quotes)
+    monkeypatch.setattr(v2_main, "send_watch_bundle", lambda *args: True)
+    monkeypatch.setattr(v2_main, "send_action", lambda *args: True)
+    monkeypatch.setattr(v2_main, "send_defense", lambda *args: True)
+
+
+def test_run_appends_stage_profile_and_optional_pstats(tmp_path, monkeypatch) -> None:
+    write_json(
+        tmp_path / "config" / "scanner_universe_v2.json",
+        {"items": [{"symbol": "BAS.DE", "name": "BASF SE"}, {"symbol": "SAP.DE", "name": "SAP SE"}]},
+    )
+    _patch(monkeypatch)
+    cfg = _cfg(tmp_path)
+
+    v2_main.run(cfg)
+    result = v2_main.run(cfg, profile=True)
+
+    lines = Path(result["profile"]["profile_path"]).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    row = json.loads(lines[-1])
+    stages = {stage["stage"]: stage for stage in row["stages"]}
+    assert list(stages) == [
+        "universe",
+        "select_assets",
+        "fetch_quotes",
+        "scanner",
+        "scoring",
+        "bridge_export",
+        "update_baseline",
+        "persist",
+        "notify",
+    ]
+    assert stages["fetch_quotes"]["rows_in"] == 2
+    assert stages["scoring"]["rows_out"] == 2
+    assert all(stage["wall_sec"] >= 0 and stage["cpu_sec"] >= 0 for stage in stages.values())
+    assert row["total"]["wall_sec"] >= sum(stage["wall_sec"] for stage in stages.values()) - 0.01
+    assert row["pstats_path"] == result["profile"]["pstats_path"]
+    assert pstats.Stats(result["profile"]["pstats_path"]).total_calls > 0
+
+    summary = summarize_profiles(load_run_profiles(cfg, days=1))
+    assert summary["runs"] == 2
+    assert summary["stages"]["scoring"]["runs"] == 2
+    assert set(summary["stages"]["total"]["wall_sec"]) == {"p50", "p90", "p99", "max"}
+
+
+def test_profiling_can_be_disabled(tmp_path, monkeypatch) -> None:
+    _patch(monkeypatch)
+    cfg = _cfg(tmp_path)
+    cfg["v2"]["profiling"] = {"enabled": False}
+
+    result = v2_main.run(cfg)
+
+    assert result["profile"] == {}
+    assert not (tmp_path / "data" / "v2" / "profiles").exists()
+
+
+def test_percentile_interpolates_between_ranks() -> None:
+    values = [1.0, 2.0, 3.0, 4.0]
+
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert percentile([], 90) is None
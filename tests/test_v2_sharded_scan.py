@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+from modules.v2.marketdata.api_governor import load_governor_state, save_governor_state
+from modules.v2.marketdata.batch_quotes import fetch_quotes_for_instruments
+from modules.v2.scanner.orchestrator import run_scanner
+from modules.v2.sharding import balance_tails, partition, run_sharded_scan
+
+
+def _start_fake_twelvedata() -> tuple[ThreadingHTTPServer, list[str]]:
+    requests: list[str] = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            query = parse.parse_qs(parse.urlparse(self.path).query)
+            symbols = query.get("symbol", [""])[0].split(",")
+            requests.append(",".join(symbols))
+            payload = {
+                symbol: {"symbol": symbol, "close": "10.5", "percent_change": str(int(symbol[1:]) * 0.5 - 2), "volume": "1000", "datetime": "2026-03-10"}
+                for symbol in symbols
+            }
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests
+
+
+def _cfg(root, server: ThreadingHTTPServer, per_run_budget: int = 20) -> dict:
+    return {
+        "app": {"root_dir": str(root)},
+        "v2": {
+            "marketdata": {
+                "batch_size": 2,
+                "timeout_sec": 5,
+                "max_live_fallback_symbols": 0,
+                "quote_url": f"http://127.0.0.1:{server.server_address[1]}/quote",
+            },
+            "sharding": {"enabled": True, "workers": 3},
+        },
+        "api_governor": {"enabled": True, "minute_limit_soft": 45, "minute_limit_hard": 55, "per_run_budget": per_run_budget},
+    }
+
+
+def _universe(count: int) -> list[dict]:
+    return [{"symbol": f"S{idx:02d}", "name": f"Stock {idx}", "group": "holding" if idx < 2 else "scanner", "weight_pct": 0} for idx in range(count)]
+
+
+def test_sharded_scan_matches_single_process_scan(tmp_path) -> None:
+    server, _ = _start_fake_twelvedata()
+    try:
+        single_cfg = _cfg(tmp_path / "single", server)
+        quotes = fetch_quotes_for_instruments(_universe(12), single_cfg, api_key="token")
+        expected = run_scanner(single_cfg, holdings=[], scanner=_universe(12), quotes=quotes, news_items=[])
+        sharded_cfg = _cfg(tmp_path / "sharded", server)
+        _, candidates = run_sharded_scan(sharded_cfg, _universe(12), api_key="token")
+    finally:
+        server.shutdown()
+
+    assert [row["symbol"] for row in candidates] == [f"S{idx:02d}" for idx in range(12)]
+    assert [row["scores"] for row in candidates] == [row["scores"] for row in expected]
+    assert sharded_cfg["_api_governor_runtime"]["api_cost"] == 6
+    state = json.loads((tmp_path / "sharded" / "data" / "api_governor" / "state.json").read_text(encoding="utf-8"))
+    assert state["used_in_current_minute"] == 6
+    cache = json.loads((tmp_path / "sharded" / "data" / "v2" / "quote_cache.json").read_text(encoding="utf-8"))
+    assert len(cache["entries"]) == 12
+
+
+def test_partition_is_stable_and_avoids_single_symbol_tails() -> None:
+    first = partition(_universe(12), 3)
+    assert [len(part) for part in first] == [4, 5, 3]
+
+    balanced = balance_tails(first, 2)
+
+    assert all(len(part) % 2 == 0 for part in balanced)
+    assert sorted(row["symbol"] for part in balanced for row in part) == [f"S{idx:02d}" for idx in range(12)]
+
+
+def test_shards_share_the_run_budget(tmp_path) -> None:
+    server, requests = _start_fake_twelvedata()
+    try:
+        cfg = _cfg(tmp_path, server, per_run_budget=2)
+        _, candidates = run_sharded_scan(cfg, _universe(12), api_key="token")
+    finally:
+        server.shutdown()
+
+    assert len(requests) <= 2
+    assert cfg["_api_governor_runtime"]["api_cost"] == len(requests)
+    assert sum(1 for row in candidates if row["status"] == "ok") == sum(len(batch.split(",")) for batch in requests)
+
+
+def test_sharded_run_tunes_batch_size_once_and_trims_merged_samples(tmp_path) -> None:
+    server, requests = _start_fake_twelvedata()
+    cfg = _cfg(tmp_path, server)
+    cfg["v2"]["marketdata"]["adaptive_batch"] = {"enabled": True, "min_size": 2, "max_size": 8, "step": 2, "min_samples": 2, "target_latency_ms": 5000, "history_size": 3}
+    cfg["v2"]["quote_cache"] = {"enabled": False}
+    sample = {"size": 2, "symbols": 2, "errors": 0, "rate_limited": False, "latency_ms": 10.0}
+    save_governor_state({"batch_tuning": {"size": 2, "samples": [sample, sample]}}, cfg)
+    try:
+        run_sharded_scan(cfg, _universe(12), api_key="token")
+    finally:
+        server.shutdown()
+
+    usage = [json.loads(line) for path in (tmp_path / "data" / "api_governor").glob("usage_*.jsonl") for line in path.read_text(encoding="utf-8").splitlines()]
+    adjustments = [row for row in usage if row.get("kind") == "batch_size_adjust"]
+    assert [(row["from_size"], row["to_size"]) for row in adjustments] == [(2, 4)]
+    assert all(len(batch.split(",")) <= 4 for batch in requests)
+    tuning = load_governor_state(cfg)["batch_tuning"]
+    assert tuning["size"] == 4
+    assert len(tuning["samples"]) == 3
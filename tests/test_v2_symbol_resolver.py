@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from modules.common.utils import write_json
+from modules.v2.symbol_resolver import build_symbol_index, normalize_name, propose_mappings, search, wkn_from_isin
+
+
+def _cfg(tmp_path) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path)},
+        "v2": {"symbol_map_path": "config/symbol_map_v2.json", "scanner_universe_path": "config/scanner_universe_v2.json"},
+    }
+
+
+def _seed(tmp_path) -> None:
+    write_json(
+        tmp_path / "config" / "symbol_map_v2.json",
+        {
+            "DE0006305006": {"symbol": "DEZ.DE", "name": "DEUTZ AG", "sector": "industrials"},
+            "DE000VK7S5D5": {"symbol": None, "name": "Vonovia", "status": "missing"},
+        },
+    )
+    write_json(
+        tmp_path / "config" / "universe_tr_verified.json",
+        {"US0079031078": {"symbol": "AMD", "name": "Advanced Micro Devices", "market": "NASDAQ"}},
+    )
+    write_json(
+        tmp_path / "config" / "scanner_universe_v2.json",
+        {
+            "items": [
+                {"symbol": "VNA.DE", "name": "Vonovia SE", "sector": "real_estate"},
+                {"symbol": "SIE.DE", "name": "Siemens AG"},
+                {"symbol": "ENR.DE", "name": "Siemens Energy AG"},
+            ]
+        },
+    )
+    write_json(tmp_path / "config" / "isin_to_symbol.json", {"US0079031078": "amd.us"})
+    write_json(
+        tmp_path / "data" / "snapshots" / "portfolio_20260310.json",
+        {
+            "positions": [
+                {"isin": "DE000VK7S5D5", "name": "VONOVIA SE NA O.N."},
+                {"isin": "DE000ENER6Y0", "name": "Siemens Energy AG Namens-Aktien"},
+                {"isin": "DE0006305006", "name": "Deutz AG"},
+                {"isin": "XS0000000001", "name": "Unbekannte Anleihe"},
+            ]
+        },
+    )
+
+
+def test_index_merges_sources_and_answers_exact_lookups(tmp_path) -> None:
+    _seed(tmp_path)
+    index = build_symbol_index(_cfg(tmp_path))
+
+    assert wkn_from_isin("DE0006305006") == "630500"
+    assert normalize_name("Siemens Energy AG Namens-Aktien") == "siemens energy aktien"
+    amd = search(index, "US0079031078", limit=1)[0]
+    assert (amd["symbol"], amd["match"], amd["sources"]) == ("AMD", "isin", ["tr_universe", "isin_to_symbol"])
+    assert search(index, "630500", limit=1)[0]["symbol"] == "DEZ.DE"
+    assert search(index, "sie", limit=1)[0]["symbol"] == "SIE.DE"
+
+
+def test_name_search_ranks_closest_match_first(tmp_path) -> None:
+    _seed(tmp_path)
+    index = build_symbol_index(_cfg(tmp_path))
+
+    ranked = search(index, "Siemens Energy", limit=2)
+
+    assert [row["symbol"] for row in ranked] == ["ENR.DE", "SIE.DE"]
+    assert ranked[0]["score"] > ranked[1]["score"]
+    assert search(index, "", limit=3) == []
+
+
+def test_propose_mappings_covers_all_missing_isins_in_one_pass(tmp_path) -> None:
+    _seed(tmp_path)
+    cfg = _cfg(tmp_path)
+    items = [
+        {"isin": "DE000VK7S5D5", "name": "VONOVIA SE NA O.N."},
+        {"isin": "DE000ENER6Y0", "name": "Siemens Energy AG Namens-Aktien"},
+        {"isin": "DE0006305006", "name": "Deutz AG"},
+        {"isin": "XS0000000001", "name": "Unbekannte Anleihe"},
+    ]
+
+    report = propose_mappings(cfg, items)
+
+    assert {row["isin"]: row["proposed"]["symbol"] for row in report["proposals"]} == {
+        "DE000VK7S5D5": "VNA.DE",
+        "DE000ENER6Y0": "ENR.DE",
+    }
+    assert [row["isin"] for row in report["unresolved"]] == ["XS0000000001"]
+
+
+def test_propose_mappings_skips_name_matches_with_a_different_isin(tmp_path) -> None:
+    _seed(tmp_path)
+
+    report = propose_mappings(_cfg(tmp_path), [{"isin": "DE000A0XYZ00", "name": "Advanced Micro Devices"}])
+
+    assert report["proposals"] == []
+    assert report["unresolved"] == [{"isin": "DE000A0XYZ00", "name": "Advanced Micro Devices", "best": None}]
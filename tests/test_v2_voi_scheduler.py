@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from modules.common.latest_quotes import update_v2_view
+from modules.v2.universe.scheduling import select_assets_for_run
+from modules.v2.universe.value_of_information import select_by_information_value
+
+
+def _cfg(tmp_path, per_run_budget: int = 20) -> dict:
+    return {
+        "app": {"root_dir": str(tmp_path)},
+        "v2": {"data_dir": "data/v2", "marketdata": {"batch_size": 2}},
+        "api_governor": {
+            "enabled": True,
+            "minute_limit_soft": 45,
+            "minute_limit_hard": 55,
+            "per_run_budget": per_run_budget,
+            "max_universe_per_run": 3,
+            "scheduler": "voi",
+        },
+    }
+
+
+def _context(view: dict | None = None, news: list[dict] | None = None, cached: dict | None = None) -> dict:
+    return {"view": view or {"symbols": {}, "isins": {}}, "news": news or [], "baseline": {}, "cached": cached or {}}
+
+
+def test_active_names_beat_dormant_ones(tmp_path) -> None:
+    cfg = _cfg(tmp_path)
+    now = datetime(2026, 3, 10, 10, 0)
+    view = {
+        "symbols": {
+            "MOVE.DE": {"symbol": "MOVE.DE", "quote": {"percent_change": 3.8}},
+            "CALM.DE": {"symbol": "CALM.DE", "quote": {"percent_change": 0.1}},
+        },
+        "isins": {},
+    }
+    news = [{"title": "Newsco raises guidance", "summary": ""}]
+    state = {"voi_last_selected": {"MOVE.DE": "2026-03-10T09:55:00", "CALM.DE": "2026-03-10T09:55:00", "NEWS.DE": "2026-03-10T09:55:00"}}
+    pool = [
+        {"symbol": "CALM.DE", "name": "Calm AG", "group": "scanner"},
+        {"symbol": "MOVE.DE", "name": "Move AG", "group": "scanner"},
+        {"symbol": "NEWS.DE", "name": "Newsco AG", "group": "scanner"},
+    ]
+
+    selected = select_by_information_value(pool, 2, state, cfg, now_dt=now, context=_context(view, news))
+
+    assert [row["symbol"] for row in selected] == ["MOVE.DE", "NEWS.DE"]
+    assert state["voi_last_selected"]["MOVE.DE"] == "2026-03-10T10:00:00"
+    usage_file = next((tmp_path / "data" / "api_governor").glob("usage_*.jsonl"))
+    event = json.loads(usage_file.read_text(encoding="utf-8").splitlines()[-1])
+    assert event["kind"] == "voi_selection"
+    assert event["selected"][0]["reasons"]["threshold"] > 0.9
+
+
+def test_paid_symbols_respect_credit_budget_but_cached_ones_are_free(tmp_path) -> None:
+    cfg = _cfg(tmp_path, per_run_budget=1)
+    pool = [{"symbol": f"S{idx}", "group": "scanner"} for idx in range(4)]
+
+    selected = select_by_information_value(
+        pool,
+        4,
+        {},
+        cfg,
+        holdings_count=0,
+        now_dt=datetime(2026, 3, 10, 10, 0),
+        context=_context(cached={"S3": {"price": 1.0}}),
+    )
+
+    assert [row["symbol"] for row in selected] == ["S3", "S0", "S1"]
+
+
+def test_scheduler_option_routes_selection_through_voi(tmp_path) -> None:
+    cfg = _cfg(tmp_path)
+    update_v2_view(
+        tmp_path / "data" / "v2",
+        [{"symbol": "S2", "quote": {"price": 10.0, "percent_change": 4.2}}],
+        tmp_path / "data" / "v2" / "candidates_20260310_1000.json",
+    )
+    universe = [
+        {"symbol": "H1", "group": "holding", "weight_pct": 10.0},
+        {"symbol": "S1", "group": "scanner", "priority": "high"},
+        {"symbol": "S2", "group": "scanner", "priority": "high"},
+    ]
+    state = {"current_minute": "2026-03-10T10:00", "used_in_current_minute": 0, "last_chunk_index": 0}
+
+    selected = select_assets_for_run(universe, state, cfg)
+
+    assert [row["symbol"] for row in selected] == ["H1", "S2", "S1"]
+    assert set(state["voi_last_selected"]) == {"S1", "S2"}